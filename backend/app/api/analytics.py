@@ -1,40 +1,97 @@
 # backend/app/api/analytics.py
 from datetime import date
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.auth.deps import get_current_user
-from app.infra.db import get_db
-from app.infra.models import TaskORM, UserORM
+from app.auth.cache import CurrentUser
+from app.auth.deps import get_current_identity
+from app.api.etag import make_etag, not_modified, set_etag
+from app.infra.db import get_db, get_read_db
+from app.repo.analytics import summary as task_summary
+from app.repo.changes import current_version
+from app.repo.recurrence import due_load
+from app.repo.timeseries import ANALYTICS_MAX_DAYS, burndown as task_burndown, lead_time as task_lead_time, throughput as task_throughput
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
 @router.get("/summary")
-def summary(db: Session = Depends(get_db), user: UserORM = Depends(get_current_user)):
-    today = date.today()
-
-    # overdue: просроченные и не done
-    overdue_q = select(func.count()).select_from(TaskORM).where(
-        TaskORM.user_id == user.id,
-        TaskORM.status != "done",
-        TaskORM.due_date.is_not(None),
-        TaskORM.due_date < today,
-    )
-    overdue = db.scalar(overdue_q)
-
-    # done: завершённые
-    done_q = select(func.count()).select_from(TaskORM).where(
-        TaskORM.user_id == user.id,
-        TaskORM.status == "done",
-    )
-    done = db.scalar(done_q)
-
-    # active: todo|in_progress, НО не просроченные
-    active_q = select(func.count()).select_from(TaskORM).where(
-        TaskORM.user_id == user.id,
-        TaskORM.status.in_(["todo", "in_progress"]),
-        or_(TaskORM.due_date.is_(None), TaskORM.due_date >= today),  # исключаем просрочку
-    )
-    active = db.scalar(active_q)
-
-    return {"active": int(active or 0), "done": int(done or 0), "overdue": int(overdue or 0)}
+def summary(
+    request: Request,
+    response: Response,
+    read_db: Session = Depends(get_read_db),
+    db: Session = Depends(get_db),  # only used (and locked) when the counters need a write
+    user: CurrentUser = Depends(get_current_identity),
+    include_archived: bool = Query(False),
+):
+    # active: todo|in_progress, не просроченные; done; overdue: просроченные и не done
+    today = date.today()  # overdue меняется в полночь и без записей
+    etag = make_etag(request, user.id, current_version(read_db, user.id), today)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    set_etag(response, etag)
+    return task_summary(db, user.id, today, read_db=read_db, include_archived=include_archived)
+
+
+def _series(request: Request, response: Response, db: Session, user: CurrentUser, date_from: date, date_to: date, fn):
+    # daily rollups (app/repo/timeseries.py): cost depends on the range, not on the number of tasks
+    if date_to < date_from or (date_to - date_from).days >= ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail="invalid_range")
+    etag = make_etag(request, user.id, current_version(db, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    set_etag(response, etag)
+    return {"from": date_from, "to": date_to, **fn(db, user.id, date_from, date_to)}
+
+
+@router.get("/throughput")
+def throughput(
+    request: Request,
+    response: Response,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # created / completed per UTC day
+    return _series(request, response, db, user, date_from, date_to,
+                   lambda *args: {"days": task_throughput(*args)})
+
+
+@router.get("/lead-time")
+def lead_time(
+    request: Request,
+    response: Response,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # created -> done, hours, for tasks completed in the range: {count, p50, p90, p95}
+    return _series(request, response, db, user, date_from, date_to, task_lead_time)
+
+
+@router.get("/burndown")
+def burndown(
+    request: Request,
+    response: Response,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # open (todo + in_progress) tasks at the end of each UTC day
+    return _series(request, response, db, user, date_from, date_to,
+                   lambda *args: {"days": task_burndown(*args)})
+
+
+@router.get("/due")
+def due(
+    request: Request,
+    response: Response,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # open / done tasks per due day, recurring tasks expanded (recurring: open occurrences not yet rows)
+    return _series(request, response, db, user, date_from, date_to,
+                   lambda *args: {"days": due_load(*args)})
@@ -0,0 +1,33 @@
+# Async variant of app/api/analytics.py (ASYNC_DB=1)
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.cache import CurrentUser
+from app.auth.deps import get_current_identity_async
+from app.api.etag import make_etag, not_modified, set_etag
+from app.infra.db import get_async_db, get_async_read_db
+from app.repo.analytics import summary as task_summary
+from app.repo.changes import current_version
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+@router.get("/summary")
+async def summary(
+    request: Request,
+    response: Response,
+    read_db: AsyncSession = Depends(get_async_read_db),
+    db: AsyncSession = Depends(get_async_db),  # only used (and locked) when the counters need a write
+    user: CurrentUser = Depends(get_current_identity_async),
+    include_archived: bool = Query(False),
+):
+    today = date.today()
+    etag = make_etag(request, user.id, await read_db.run_sync(current_version, user.id), today)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    set_etag(response, etag)
+    out = await read_db.run_sync(
+        lambda s: task_summary(None, user.id, today, read_db=s, include_archived=include_archived)
+    )
+    if out is None:
+        out = await db.run_sync(task_summary, user.id, today, include_archived=include_archived)
+    return out
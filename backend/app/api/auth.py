@@ -6,8 +6,9 @@ from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy.orm import Session
 
-from app.auth.security import create_access_token, create_refresh_token, hash_password, verify_password
-from app.infra.db import get_db
+from app.auth.hashing import hash_password_pooled, verify_password_pooled
+from app.auth.security import TokenError, create_access_token, create_refresh_token, decode_token
+from app.infra.db import get_db, get_read_db
 from app.infra.models import UserORM
 from app.auth.deps import get_current_user
 
@@ -39,10 +40,12 @@ def register(body: RegisterBody, db: Annotated[Session, Depends(get_db)]):
     if existing:
         # Follow API contract: 400 with specific detail code
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="email_taken")
+    # end the read transaction: the pooled connection is not held while the password hashes
+    db.rollback()
 
     user = UserORM(
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=hash_password_pooled(body.password),
         full_name=body.full_name,
         created_at=datetime.now(timezone.utc),
     )
@@ -55,9 +58,10 @@ def register(body: RegisterBody, db: Annotated[Session, Depends(get_db)]):
 
 
 @router.post("/login", response_model=TokenPair)
-def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Annotated[Session, Depends(get_db)]):
-    user = db.query(UserORM).filter(UserORM.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Annotated[Session, Depends(get_read_db)]):
+    user = db.query(UserORM.email, UserORM.password_hash).filter(UserORM.email == form_data.username).first()
+    db.rollback()  # release the connection before the (slow) verify
+    if not user or not verify_password_pooled(form_data.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid credentials")
 
     claims = {"sub": user.email}
@@ -75,15 +79,11 @@ class AccessToken(BaseModel):
 @router.post("/refresh", response_model=AccessToken)
 def refresh_token(body: RefreshBody):
     # Validate refresh token by decoding; just re-issue access token for same subject
-    from jose import jwt
-    from app.auth.security import ALGORITHM, JWT_SECRET
-
     try:
-        payload = jwt.decode(body.refresh, JWT_SECRET, algorithms=[ALGORITHM])
-        subject = payload.get("sub")
-        if subject is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except Exception:
+        subject = decode_token(body.refresh).get("sub")
+    except TokenError:
+        subject = None
+    if subject is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     return AccessToken(access=create_access_token({"sub": subject}))
@@ -0,0 +1,65 @@
+# Async variant of app/api/auth.py (ASYNC_DB=1)
+from datetime import datetime, timezone
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import AccessToken, RefreshBody, RegisterBody, TokenPair, UserResponse, refresh_token as refresh_sync
+from app.auth.deps import get_current_user_async
+from app.auth.hashing import hash_password_async, verify_password_async
+from app.auth.security import create_access_token, create_refresh_token
+from app.infra.db import get_async_db, get_async_read_db
+from app.infra.models import UserORM
+
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/register", response_model=TokenPair, status_code=status.HTTP_201_CREATED)
+async def register(body: RegisterBody, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    existing = (await db.execute(select(UserORM.id).where(UserORM.email == body.email))).first()
+    if existing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="email_taken")
+    await db.rollback()  # do not hold a pooled connection while the password hashes
+
+    # pbkdf2 is CPU-bound: runs in the hashing pool, off the event loop
+    user = UserORM(
+        email=body.email,
+        password_hash=await hash_password_async(body.password),
+        full_name=body.full_name,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(user)
+    await db.commit()
+
+    claims = {"sub": user.email}
+    return TokenPair(access=create_access_token(claims), refresh=create_refresh_token(claims))
+
+
+@router.post("/login", response_model=TokenPair)
+async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Annotated[AsyncSession, Depends(get_async_read_db)]):
+    row = (await db.execute(select(UserORM.email, UserORM.password_hash).where(UserORM.email == form_data.username))).first()
+    await db.rollback()
+    if not row or not await verify_password_async(form_data.password, row.password_hash):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid credentials")
+
+    claims = {"sub": row.email}
+    return TokenPair(access=create_access_token(claims), refresh=create_refresh_token(claims))
+
+
+@router.post("/refresh", response_model=AccessToken)
+async def refresh_token(body: RefreshBody):
+    return refresh_sync(body)
+
+
+@router.get("/me", response_model=UserResponse)
+async def me(current_user: Annotated[UserORM, Depends(get_current_user_async)]):
+    return UserResponse(
+        id=current_user.id,
+        email=current_user.email,
+        full_name=current_user.full_name,
+        created_at=current_user.created_at,
+    )
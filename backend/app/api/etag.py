@@ -0,0 +1,38 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Conditional GET: the ETag is derived from the user's change version (app/repo/changes.py)
+# and the request (path + query), so a matching If-None-Match is answered with 304 before
+# the tasks table is queried or anything is serialized.
+
+CACHE_CONTROL = "private, no-cache"  # always revalidate, never shared
+
+
+def make_etag(request: Request, user_id: int, version: int, *extra) -> str:
+    query = sorted(request.query_params.multi_items())
+    raw = repr((user_id, version, request.url.path, query, extra)).encode()
+    return f'W/"{hashlib.sha1(raw).hexdigest()[:20]}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # weak comparison: W/"x" and "x" are the same tag
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    if _matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,39 @@
+from typing import Any, Iterable, List, Optional, Sequence
+
+from fastapi import Response
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic-core does the same job a bit slower
+    orjson = None
+
+# Hot read endpoints return FastJSONResponse directly: FastAPI then skips the response_model
+# validation and jsonable_encoder, and rows go to JSON bytes in one call. The output matches
+# what the pydantic models would produce (ISO dates, "Z" for UTC).
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return to_json(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows(items: Sequence, only: Optional[Iterable[str]] = None) -> List[dict]:
+    # Row tuples (select of plain columns) -> dicts keyed by column name, optionally just `only`.
+    # Keys are read once: Row._asdict()/_fields per row cost ~10x the zip.
+    if not items:
+        return []
+    keys = items[0]._fields
+    if only is None:
+        return [dict(zip(keys, row)) for row in items]
+    only = set(only)
+    picked = [(i, k) for i, k in enumerate(keys) if k in only]
+    return [{k: row[i] for i, k in picked} for row in items]
@@ -1,66 +1,355 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from app.infra.db import get_db
-from app.auth.deps import get_current_user
-from app.infra.models import TaskORM, UserORM
-from app.schemas.tasks import TaskCreate, TaskUpdate, TaskRead, TaskList
-from app.repo.tasks import create_task, get_task, list_tasks, update_task, delete_task
+from app.infra.db import ReadSessionLocal, get_db, get_read_db
+from app.infra import transfer
+from app.auth.cache import CurrentUser
+from app.auth.deps import get_current_identity, get_stream_identity
+from app.infra import events
+from app.api.etag import make_etag, not_modified, set_etag
+from app.api.responses import FastJSONResponse, rows
+from app.infra.models import TaskORM
+from app.schemas.tasks import (
+    TaskCreate, TaskUpdate, TaskRead, TaskList, BulkCreate, BulkStatus, BulkDelete, BulkItemResult, BulkResult,
+    ImportReport, TaskChanges, TaskCalendar, RecurrenceIn, RecurrenceRead, TaskOccurrences, error_message,
+)
+from app.repo.tasks import (
+    InvalidCursor, InvalidFields, parse_fields, create_task, encode_cursor, get_task, list_tasks, update_task, delete_task,
+    bulk_create_tasks, bulk_update_status, bulk_delete_tasks, iter_tasks, EXPORT_COLUMNS,
+    import_tasks, calendar_tasks, CALENDAR_MAX_DAYS, CALENDAR_PER_DAY,
+    occurrence_list, update_occurrence, skip_occurrence,
+)
+from app.repo.changes import InvalidToken, current_version, list_changes
+from app.repo import recurrence
+from app.domain.recurrence import WEEKDAYS, InvalidRule, Rule, parse_rrule
 
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create(data: TaskCreate, db: Session = Depends(get_db), user: UserORM = Depends(get_current_user)):
+def create(data: TaskCreate, db: Session = Depends(get_db), user: CurrentUser = Depends(get_current_identity)):
     return create_task(db, user.id, data)
 
 
+class ListParams:
+    # query of GET /api/tasks/, shared with the async handler (app/api/tasks_async.py)
+    def __init__(
+        self,
+        status: Optional[str] = Query(None),
+        priority: Optional[str] = Query(None),
+        q: Optional[str] = Query(None),
+        due_from: Optional[date] = Query(None),
+        due_to: Optional[date] = Query(None),
+        sort: Optional[str] = Query(None),
+        page: int = Query(1, ge=1),
+        page_size: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None),
+        with_total: str = Query("exact", pattern="^(none|exact|estimate)$"),
+        fields: Optional[str] = Query(None, description="comma-separated TaskRead fields, e.g. id,title,status,priority (id is always included)"),
+        include_archived: bool = Query(False, description="also list done tasks moved to the archive"),
+    ):
+        try:
+            self.only = parse_fields(fields)
+        except InvalidFields as e:
+            raise HTTPException(status_code=400, detail=f"invalid_fields: {e}")
+        # searches are ranked best match first unless a sort is asked for explicitly
+        self.sort = sort or ("relevance" if q else "created_at")
+        self.page, self.page_size = page, page_size
+        # cursor (next_cursor of the previous page) takes precedence over page
+        self.filters = dict(
+            status=status, priority=priority, q=q, due_from=due_from, due_to=due_to, sort=self.sort,
+            page=page, page_size=page_size, cursor=cursor, with_total=with_total, fields=self.only,
+            include_archived=include_archived,
+        )
+
+    def response(self, items, total: Optional[int], has_more: bool, etag: str) -> FastJSONResponse:
+        next_cursor = encode_cursor(self.sort, items[-1]) if has_more and self.sort != "relevance" else None
+        # fast path: rows -> JSON bytes, no TaskRead/TaskList validation (response_model is for the docs)
+        fast = FastJSONResponse({
+            "items": rows(items, {*self.only, "id"} if self.only else None), "total": total,
+            "page": self.page, "page_size": self.page_size, "next_cursor": next_cursor, "has_more": has_more,
+        })
+        set_etag(fast, etag)
+        return fast
+
+
 @router.get("/", response_model=TaskList)
 def list_endpoint(
+    params: ListParams = Depends(),
+    *,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    etag = make_etag(request, user.id, current_version(db, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    try:
+        items, total, has_more = list_tasks(db, user.id, **params.filters)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+    return params.response(items, total, has_more, etag)
+
+
+@router.get("/calendar", response_model=TaskCalendar)
+def calendar(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    per_day: int = Query(CALENDAR_PER_DAY, ge=1, le=100),
+    include_done: bool = Query(True),
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # month view: bounded range, bounded rows per day -> same cost whatever the backlog size
+    if date_to < date_from or (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail="invalid_range")
+    etag = make_etag(request, user.id, current_version(db, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    days = calendar_tasks(db, user.id, date_from, date_to, per_day=per_day, include_done=include_done)
+    set_etag(response, etag)
+    return TaskCalendar(from_=date_from, to=date_to, days=days)
+
+
+@router.get("/occurrences", response_model=TaskOccurrences)
+def occurrences(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    include_done: bool = Query(True),
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # tasks due in the range with recurring tasks expanded; virtual occurrences have id null
+    if date_to < date_from or (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail="invalid_range")
+    etag = make_etag(request, user.id, current_version(db, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    items = occurrence_list(db, user.id, date_from, date_to, include_done=include_done)
+    set_etag(response, etag)
+    return TaskOccurrences(from_=date_from, to=date_to, items=items)
+
+
+@router.get("/changes", response_model=TaskChanges)
+def changes(
+    since: Optional[str] = Query(None),
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    # no since: everything (initial sync); then keep passing next_token back
+    try:
+        items, deleted, next_token, has_more = list_changes(db, user.id, since, limit)
+    except InvalidToken:
+        raise HTTPException(status_code=400, detail="invalid_token")
+    return TaskChanges(items=items, deleted=deleted, next_token=next_token, has_more=has_more)
+
+
+@router.get("/events")
+async def event_stream(request: Request, user: CurrentUser = Depends(get_stream_identity)):
+    # Server-Sent Events: created/updated/deleted as they are committed by this worker.
+    # "resync" means events were lost (slow reader, import): re-read /changes.
+    sub = events.bus.subscribe(user.id)
+
+    async def body():
+        try:
+            yield "retry: 3000\n\n"
+            while not sub.closed:
+                event = await sub.get(timeout=events.EVENTS_HEARTBEAT)
+                if event is not None:
+                    yield events.sse_format(event)
+                elif not sub.closed:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export")
+def export(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
     status: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     q: Optional[str] = Query(None),
     due_from: Optional[date] = Query(None),
     due_to: Optional[date] = Query(None),
-    sort: Optional[str] = Query("created_at"),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
+    sort: Optional[str] = Query(None),
+    include_archived: bool = Query(False),
+    user: CurrentUser = Depends(get_current_identity),
+):
+    filters = dict(status=status, priority=priority, q=q, due_from=due_from, due_to=due_to, include_archived=include_archived)
+    sort = sort or ("relevance" if q else "created_at")
+
+    def body():
+        # own session: it has to live as long as the stream, not as long as the endpoint call
+        with ReadSessionLocal() as db:
+            rows = iter_tasks(db, user.id, sort=sort, **filters)
+            yield from transfer.encode(format, [c.key for c in EXPORT_COLUMNS], rows)
+
+    return StreamingResponse(
+        body(),
+        media_type=transfer.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+@router.post("/import", response_model=ImportReport)
+def import_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
     db: Session = Depends(get_db),
-    user: UserORM = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_identity),
 ):
-    items, total = list_tasks(
-        db,
-        user.id,
-        status=status,
-        priority=priority,
-        q=q,
-        due_from=due_from,
-        due_to=due_to,
-        sort=sort,
-        page=page,
-        page_size=page_size,
+    # the upload is spooled to disk by Starlette and parsed line by line from there
+    fmt = format or transfer.detect_format(file.filename or "")
+    return import_tasks(db, user.id, transfer.parse(fmt, file.file))
+
+
+def _bulk_result(results) -> BulkResult:
+    ok = sum(1 for r in results if r.ok)
+    return BulkResult(results=results, succeeded=ok, failed=len(results) - ok)
+
+
+@router.post("/bulk/create", response_model=BulkResult)
+def bulk_create(data: BulkCreate, db: Session = Depends(get_db), user: CurrentUser = Depends(get_current_identity)):
+    valid, results = [], []
+    for index, item in enumerate(data.items):
+        try:
+            valid.append((index, TaskCreate.model_validate(item)))
+        except ValidationError as e:
+            results.append(BulkItemResult(index=index, ok=False, error=error_message(e)))
+    tasks = bulk_create_tasks(db, user.id, [item for _, item in valid])
+    results += [BulkItemResult(index=i, id=t.id, ok=True, task=t) for (i, _), t in zip(valid, tasks)]
+    return _bulk_result(sorted(results, key=lambda r: r.index))
+
+
+def _id_results(ids: List[int], done: Dict[int, Any]) -> BulkResult:
+    # one result per requested id: `done` maps the ids the operation applied to (to the task, if
+    # any); a repeated id is applied once, its repeats are reported as "duplicate"
+    seen, results = set(), []
+    for i, task_id in enumerate(ids):
+        if task_id in seen:
+            results.append(BulkItemResult(index=i, id=task_id, ok=False, error="duplicate"))
+        elif task_id in done:
+            results.append(BulkItemResult(index=i, id=task_id, ok=True, task=done[task_id]))
+        else:
+            results.append(BulkItemResult(index=i, id=task_id, ok=False, error="not_found"))
+        seen.add(task_id)
+    return _bulk_result(results)
+
+
+@router.post("/bulk/status", response_model=BulkResult)
+def bulk_status(data: BulkStatus, db: Session = Depends(get_db), user: CurrentUser = Depends(get_current_identity)):
+    return _id_results(data.ids, bulk_update_status(db, user.id, data.ids, data.status))
+
+
+@router.post("/bulk/delete", response_model=BulkResult)
+def bulk_delete(data: BulkDelete, db: Session = Depends(get_db), user: CurrentUser = Depends(get_current_identity)):
+    return _id_results(data.ids, dict.fromkeys(bulk_delete_tasks(db, user.id, data.ids)))
+
+
+def _rule(data: RecurrenceIn) -> Rule:
+    try:
+        if data.rrule and data.freq:
+            raise InvalidRule("either rrule or freq")
+        if data.rrule:
+            return parse_rrule(data.rrule)
+        if not data.freq:
+            raise InvalidRule("rrule or freq required")
+        return Rule(
+            freq=data.freq, interval=data.interval, byweekday=tuple(sorted({WEEKDAYS.index(d) for d in data.byweekday or ()})),
+            bymonthday=data.bymonthday, count=data.count, until=data.until,
+        )
+    except InvalidRule as e:
+        raise HTTPException(status_code=400, detail=f"invalid_rule: {e}")
+
+
+def _rule_read(rec) -> RecurrenceRead:
+    return RecurrenceRead(
+        task_id=rec.task_id, rrule=rec.rrule, dtstart=rec.dtstart, ends_on=rec.ends_on,
+        exdates=sorted(recurrence.exdates(rec.exdates)),
     )
-    return TaskList(items=items, total=total, page=page, page_size=page_size)
+
+
+@router.put("/{task_id}/recurrence", response_model=RecurrenceRead)
+def put_recurrence(task_id: int, data: RecurrenceIn, db: Session=Depends(get_db), user: CurrentUser=Depends(get_current_identity)):
+    rule = _rule(data)
+    try:
+        rec = recurrence.set_rule(db, user.id, task_id, rule)
+    except recurrence.NoDueDate:
+        raise HTTPException(status_code=400, detail="due_date_required")
+    except InvalidRule as e:
+        raise HTTPException(status_code=400, detail=f"invalid_rule: {e}")
+    if rec is None: raise HTTPException(status_code=404, detail="Task not found")
+    return _rule_read(rec)
+
+
+@router.get("/{task_id}/recurrence", response_model=RecurrenceRead)
+def get_recurrence(task_id: int, db: Session=Depends(get_read_db), user: CurrentUser=Depends(get_current_identity)):
+    rec = recurrence.get_rule(db, user.id, task_id)
+    if rec is None: raise HTTPException(status_code=404, detail="Recurrence not found")
+    return _rule_read(rec)
+
+
+@router.delete("/{task_id}/recurrence", status_code=204)
+def delete_recurrence(task_id: int, db: Session=Depends(get_db), user: CurrentUser=Depends(get_current_identity)):
+    if not recurrence.delete_rule(db, user.id, task_id): raise HTTPException(status_code=404, detail="Recurrence not found")
+    return None
+
+
+@router.patch("/{task_id}/occurrences/{on}", response_model=TaskRead)
+def patch_occurrence(task_id: int, on: date, data: TaskUpdate, db: Session=Depends(get_db), user: CurrentUser=Depends(get_current_identity)):
+    # first change of a virtual occurrence turns it into a task (returned, with its own id)
+    try:
+        task = update_occurrence(db, user.id, task_id, on, data)
+    except recurrence.NotAnOccurrence:
+        task = None
+    if not task: raise HTTPException(status_code=404, detail="Occurrence not found")
+    return task
+
+
+@router.delete("/{task_id}/occurrences/{on}", status_code=204)
+def delete_occurrence(task_id: int, on: date, db: Session=Depends(get_db), user: CurrentUser=Depends(get_current_identity)):
+    if not skip_occurrence(db, user.id, task_id, on): raise HTTPException(status_code=404, detail="Occurrence not found")
+    return None
 
 
 @router.get("/{task_id}", response_model=TaskRead)
-def get_one(task_id: int, db: Session=Depends(get_db), user: UserORM=Depends(get_current_user)):
+def get_one(task_id: int, request: Request, response: Response, db: Session=Depends(get_read_db), user: CurrentUser=Depends(get_current_identity)):
+    etag = make_etag(request, user.id, current_version(db, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
     task = get_task(db, user.id, task_id)
     if not task: raise HTTPException(status_code=404, detail="Task not found")
+    set_etag(response, etag)
     return task
 
 
 @router.patch("/{task_id}", response_model=TaskRead)
-def patch(task_id: int, data: TaskUpdate, db: Session=Depends(get_db), user: UserORM=Depends(get_current_user)):
+def patch(task_id: int, data: TaskUpdate, db: Session=Depends(get_db), user: CurrentUser=Depends(get_current_identity)):
     task = update_task(db, user.id, task_id, data)
     if not task: raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
 @router.delete("/{task_id}", status_code=204)
-def remove(task_id: int, db: Session=Depends(get_db), user: UserORM=Depends(get_current_user)):
+def remove(task_id: int, db: Session=Depends(get_db), user: CurrentUser=Depends(get_current_identity)):
     ok = delete_task(db, user.id, task_id)
     if not ok: raise HTTPException(status_code=404, detail="Task not found")
     return None
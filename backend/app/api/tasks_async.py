@@ -0,0 +1,65 @@
+# Async variants of the core app/api/tasks.py routes (ASYNC_DB=1): mounted first, the sync router
+# stays mounted after them for everything else (see include_routers in app/main.py)
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infra.db import get_async_db, get_async_read_db
+from app.auth.cache import CurrentUser
+from app.auth.deps import get_current_identity_async
+from app.api.etag import make_etag, not_modified, set_etag
+from app.api.tasks import ListParams
+from app.repo.changes import current_version
+from app.schemas.tasks import TaskCreate, TaskUpdate, TaskRead, TaskList
+from app.repo.tasks import InvalidCursor
+from app.repo.tasks_async import create_task, get_task, list_tasks, update_task, delete_task
+
+
+router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+
+
+@router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
+async def create(data: TaskCreate, db: AsyncSession = Depends(get_async_db), user: CurrentUser = Depends(get_current_identity_async)):
+    return await create_task(db, user.id, data)
+
+
+@router.get("/", response_model=TaskList)
+async def list_endpoint(
+    params: ListParams = Depends(),
+    *,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    user: CurrentUser = Depends(get_current_identity_async),
+):
+    etag = make_etag(request, user.id, await db.run_sync(current_version, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    try:
+        items, total, has_more = await list_tasks(db, user.id, **params.filters)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+    return params.response(items, total, has_more, etag)
+
+
+# :int so that static paths of the sync router (mounted after this one) still resolve
+@router.get("/{task_id:int}", response_model=TaskRead)
+async def get_one(task_id: int, request: Request, response: Response, db: AsyncSession=Depends(get_async_read_db), user: CurrentUser=Depends(get_current_identity_async)):
+    etag = make_etag(request, user.id, await db.run_sync(current_version, user.id))
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    task = await get_task(db, user.id, task_id)
+    if not task: raise HTTPException(status_code=404, detail="Task not found")
+    set_etag(response, etag)
+    return task
+
+
+@router.patch("/{task_id:int}", response_model=TaskRead)
+async def patch(task_id: int, data: TaskUpdate, db: AsyncSession=Depends(get_async_db), user: CurrentUser=Depends(get_current_identity_async)):
+    task = await update_task(db, user.id, task_id, data)
+    if not task: raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.delete("/{task_id:int}", status_code=204)
+async def remove(task_id: int, db: AsyncSession=Depends(get_async_db), user: CurrentUser=Depends(get_current_identity_async)):
+    ok = await delete_task(db, user.id, task_id)
+    if not ok: raise HTTPException(status_code=404, detail="Task not found")
+    return None
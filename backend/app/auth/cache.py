@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+from sqlalchemy import event, inspect
+
+from app.infra.models import UserORM
+
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))     # seconds, 0 disables
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    # LRU bounded by maxsize, entries expire after ttl seconds; thread-safe (sync endpoints run in a threadpool)
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    # what task/analytics endpoints need from the caller, without an ORM row
+    id: int
+    email: str
+
+
+user_cache: TTLCache[str, CurrentUser] = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+@event.listens_for(UserORM, "after_update")
+@event.listens_for(UserORM, "after_delete")
+def _invalidate_user(mapper, connection, target: UserORM) -> None:
+    # drop both the current and the previous email (email change)
+    user_cache.pop(target.email)
+    for old in inspect(target).attrs.email.history.deleted or ():
+        user_cache.pop(old)
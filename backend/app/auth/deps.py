@@ -1,33 +1,103 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth.security import ALGORITHM, JWT_SECRET
-from app.infra.db import get_db
+from app.auth.cache import CurrentUser, user_cache
+from app.auth.security import TokenError, decode_token
+from app.infra.db import get_async_read_db, get_read_db
 from app.infra.models import UserORM
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+oauth2_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 
-def get_current_user(
-    db: Annotated[Session, Depends(get_db)],
-    token: Annotated[str, Depends(oauth2_scheme)],
-) -> UserORM:
+def _token_subject(token: str) -> str:
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
-        subject = payload.get("sub")
-        if subject is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
+        subject = decode_token(token).get("sub")
+    except TokenError:
+        subject = None
+    if subject is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return subject
+
 
+def get_current_user(
+    db: Annotated[Session, Depends(get_read_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> UserORM:
+    subject = _token_subject(token)
     user: UserORM | None = db.query(UserORM).filter(UserORM.email == subject).first()
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user_cache.set(subject, CurrentUser(id=user.id, email=user.email))
     return user
 
 
+def get_current_identity(
+    db: Annotated[Session, Depends(get_read_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> CurrentUser:
+    # same checks as get_current_user, but served from the user cache: no query on a hit
+    return _identity(db, _token_subject(token))
+
+
+def get_stream_identity(
+    db: Annotated[Session, Depends(get_read_db)],
+    header_token: Annotated[str | None, Depends(oauth2_optional)],
+    token: Annotated[str | None, Query()] = None,
+) -> CurrentUser:
+    # EventSource cannot send headers: the same JWT may come as ?token=
+    token = header_token or token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _identity(db, _token_subject(token))
+
+
+def _identity(db: Session, subject: str) -> CurrentUser:
+    identity = user_cache.get(subject)
+    if identity is not None:
+        return identity
+    row = db.execute(select(UserORM.id, UserORM.email).where(UserORM.email == subject)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    identity = CurrentUser(id=row.id, email=row.email)
+    user_cache.set(subject, identity)
+    return identity
+
+
+# --- async mode (see app/infra/db.py: ASYNC_DB) ---
+
+async def get_current_user_async(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> UserORM:
+    subject = _token_subject(token)
+    user = (await db.execute(select(UserORM).where(UserORM.email == subject))).scalars().first()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user_cache.set(subject, CurrentUser(id=user.id, email=user.email))
+    return user
+
+
+async def get_current_identity_async(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> CurrentUser:
+    subject = _token_subject(token)
+    identity = user_cache.get(subject)
+    if identity is not None:
+        return identity
+    row = (await db.execute(select(UserORM.id, UserORM.email).where(UserORM.email == subject))).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    identity = CurrentUser(id=row.id, email=row.email)
+    user_cache.set(subject, identity)
+    return identity
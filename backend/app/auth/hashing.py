@@ -0,0 +1,71 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.auth.security import hash_password, verify_password
+from app.infra import metrics
+
+
+# Dedicated pool for pbkdf2: hashlib releases the GIL, so threads hash in parallel while a
+# burst of logins can occupy at most HASH_POOL_SIZE cores. Past HASH_QUEUE_LIMIT jobs
+# (queued + running) new requests fail fast with 503 instead of piling up.
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(max(1, (os.cpu_count() or 2) // 2))))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "64"))
+
+hash_latency = metrics.histogram("password_hash_seconds", "Time spent hashing/verifying a password")
+hash_queue_wait = metrics.histogram("password_hash_queue_wait_seconds", "Time a hash job waited for a pool thread")
+hash_rejected = metrics.counter("password_hash_rejected_total", "Hash jobs rejected because the pool queue was full")
+
+_executor = ThreadPoolExecutor(max_workers=HASH_POOL_SIZE, thread_name_prefix="pwhash")
+_inflight = 0
+_lock = threading.Lock()
+
+
+def _release(_: Future) -> None:
+    global _inflight
+    with _lock:
+        _inflight -= 1
+
+
+def _submit(fn, *args) -> Future:
+    global _inflight
+    with _lock:
+        if _inflight >= HASH_QUEUE_LIMIT:
+            hash_rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="auth_busy", headers={"Retry-After": "1"}
+            )
+        _inflight += 1
+    submitted = time.perf_counter()
+
+    def job():
+        started = time.perf_counter()
+        hash_queue_wait.observe(started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            hash_latency.observe(time.perf_counter() - started)
+
+    future = _executor.submit(job)
+    future.add_done_callback(_release)
+    return future
+
+
+def hash_password_pooled(pwd: str) -> str:
+    return _submit(hash_password, pwd).result()
+
+
+def verify_password_pooled(pwd: str, hashed: str) -> bool:
+    return _submit(verify_password, pwd, hashed).result()
+
+
+async def hash_password_async(pwd: str) -> str:
+    return await asyncio.wrap_future(_submit(hash_password, pwd))
+
+
+async def verify_password_async(pwd: str, hashed: str) -> bool:
+    return await asyncio.wrap_future(_submit(verify_password, pwd, hashed))
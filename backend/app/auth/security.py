@@ -1,8 +1,15 @@
+import base64
+import hashlib
+import hmac
+import json
 import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
-from jose import jwt
+from jose import JWTError, jwt
+
+from app.auth.cache import TTLCache
 
 # было:
 # from passlib.context import CryptContext
@@ -10,12 +17,31 @@ from jose import jwt
 
 # стало:
 from passlib.context import CryptContext
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+# rounds for new hashes (passlib default: 29000); existing hashes verify with their own rounds
+PBKDF2_ROUNDS = int(os.getenv("PBKDF2_ROUNDS", "29000"))
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"], deprecated="auto", pbkdf2_sha256__default_rounds=PBKDF2_ROUNDS
+)
 
 
 ALGORITHM = "HS256"
 JWT_SECRET = os.getenv("JWT_SECRET", "dev_secret_change_me")
 
+# Verifying a token: jose (default), pyjwt (if installed; jose otherwise) or native (HS256 on
+# hashlib/hmac, no library in the way). Verified claims are cached until the token's exp,
+# keyed by a hash of the token: a client repeating one access token pays the HMAC once.
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 disables
+
+
+class TokenError(Exception):
+    pass
+
+
+# the entry's ttl is exp - now, so a cached token stops being accepted when it expires
+token_cache: TTLCache[bytes, Dict[str, Any]] = TTLCache(TOKEN_CACHE_SIZE, 0)
+
 
 def hash_password(pwd: str) -> str:
     return pwd_context.hash(pwd)
@@ -40,3 +66,82 @@ def create_refresh_token(data: Dict[str, Any], expires_minutes: int = 60 * 24 *
     return _create_token(data, expires_minutes)
 
 
+def _decode_jose(token: str) -> Dict[str, Any]:
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
+    except JWTError as e:
+        raise TokenError(str(e))
+
+
+def _pyjwt_decoder() -> Callable[[str], Dict[str, Any]]:
+    import jwt as pyjwt
+
+    def decode(token: str) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
+        except pyjwt.PyJWTError as e:
+            raise TokenError(str(e))
+
+    return decode
+
+
+def _b64decode(part: str) -> bytes:
+    return base64.urlsafe_b64decode(part + "=" * (-len(part) % 4))
+
+
+def _decode_native(token: str) -> Dict[str, Any]:
+    # HS256 only: header alg pinned, constant-time signature check, exp/nbf like jose (no leeway)
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+    except ValueError:
+        raise TokenError("malformed token")
+    if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+        raise TokenError("unexpected alg")
+    expected = hmac.new(JWT_SECRET.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise TokenError("bad signature")
+    try:
+        claims = json.loads(_b64decode(payload_b64))
+    except ValueError:
+        raise TokenError("malformed payload")
+    if not isinstance(claims, dict):
+        raise TokenError("malformed payload")
+    now = time.time()
+    for name, bad in (("exp", lambda v: v < now), ("nbf", lambda v: v > now)):
+        if name in claims:
+            value = claims[name]
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise TokenError(f"invalid {name}")
+            if bad(value):
+                raise TokenError("expired" if name == "exp" else "not yet valid")
+    return claims
+
+
+def _backend(name: str) -> Callable[[str], Dict[str, Any]]:
+    if name == "native":
+        return _decode_native
+    if name == "pyjwt":
+        try:
+            return _pyjwt_decoder()
+        except ImportError:
+            pass
+    return _decode_jose
+
+
+_decode = _backend(JWT_BACKEND)
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Verified claims of `token`; raises TokenError. Don't mutate the result (it is cached)."""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+    claims = _decode(token)
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, claims, ttl=exp - time.time())
+    return claims
+
@@ -0,0 +1,92 @@
+"""Admin commands.
+
+    python -m app.cli import-tasks --email demo@example.com tasks.ndjson
+    python -m app.cli rebuild-stats [--email demo@example.com]
+    python -m app.cli archive-tasks [--older-than-days 90] [--batch-size 1000] [--email demo@example.com]
+"""
+import argparse
+import json
+import sys
+
+from sqlalchemy import select
+
+from app.infra import transfer
+from app.infra.db import SessionLocal
+from app.infra.models import UserORM
+from app.repo.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_done_tasks
+from app.repo.tasks import IMPORT_BATCH_SIZE, import_tasks
+from app.repo.timeseries import rebuild_daily_stats
+
+
+def cmd_import_tasks(args) -> int:
+    fmt = args.format or transfer.detect_format(args.path)
+    with SessionLocal() as db:
+        user_id = db.scalar(select(UserORM.id).where(UserORM.email == args.email))
+        if user_id is None:
+            print(f"unknown user: {args.email}", file=sys.stderr)
+            return 1
+        with open(args.path, "rb") as f:
+            report = import_tasks(db, user_id, transfer.parse(fmt, f), batch_size=args.batch_size)
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    return 0
+
+
+def cmd_rebuild_stats(args) -> int:
+    # backfill / repair of the daily analytics rollups, one user per transaction
+    with SessionLocal() as db:
+        query = select(UserORM.id, UserORM.email).order_by(UserORM.id)
+        if args.email:
+            query = query.where(UserORM.email == args.email)
+        users = db.execute(query).all()
+        if args.email and not users:
+            print(f"unknown user: {args.email}", file=sys.stderr)
+            return 1
+        for user_id, email in users:
+            n = rebuild_daily_stats(db, user_id)
+            db.commit()
+            print(f"{email}: {n} tasks")
+    return 0
+
+
+def cmd_archive_tasks(args) -> int:
+    # cron / scheduler job: done tasks older than --older-than-days go to tasks_archive
+    with SessionLocal() as db:
+        user_id = None
+        if args.email:
+            user_id = db.scalar(select(UserORM.id).where(UserORM.email == args.email))
+            if user_id is None:
+                print(f"unknown user: {args.email}", file=sys.stderr)
+                return 1
+        moved = archive_done_tasks(db, older_than_days=args.older_than_days, batch_size=args.batch_size, user_id=user_id)
+    print(f"archived {sum(moved.values())} tasks of {len(moved)} users")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import-tasks", help="import tasks from an NDJSON/CSV file")
+    p.add_argument("path")
+    p.add_argument("--email", required=True, help="owner of the imported tasks")
+    p.add_argument("--format", choices=["ndjson", "csv"], help="default: from the file extension")
+    p.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    p.set_defaults(func=cmd_import_tasks)
+
+    p = sub.add_parser("rebuild-stats", help="recompute the daily analytics rollups from tasks")
+    p.add_argument("--email", help="only this user (default: everyone)")
+    p.set_defaults(func=cmd_rebuild_stats)
+
+    p = sub.add_parser("archive-tasks", help="move old done tasks to tasks_archive")
+    p.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS)
+    p.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    p.add_argument("--email", help="only this user (default: everyone)")
+    p.set_defaults(func=cmd_archive_tasks)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
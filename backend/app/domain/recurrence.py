@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import calendar
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator, Optional, Tuple
+
+
+# Recurrence rules: the daily/weekly/monthly subset of RFC 5545 RRULE that a task list needs.
+#   FREQ=DAILY|WEEKLY|MONTHLY  INTERVAL=n  BYDAY=MO,WE (plain weekdays, no ordinals)
+#   BYMONTHDAY=d (one day, 1..31 or -1 = last day)  COUNT=n | UNTIL=YYYYMMDD
+# DTSTART (the task's due date) is always the first occurrence. Weeks start on Monday; months
+# without the asked day are skipped (RFC behaviour), BYMONTHDAY=-1 is "last day of the month".
+# Expansion jumps straight to the queried range: cost is the number of dates in the range, not
+# the age of the rule.
+
+FREQS = ("daily", "weekly", "monthly")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+MAX_COUNT = 1000
+# hard stop for expansion: periods in a row without a date (a valid rule misses at most 6 days or
+# 95 months in a row); rules that never match are refused by check_start, this bounds stored ones
+MAX_MISSES = 1000
+
+
+class InvalidRule(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Rule:
+    freq: str
+    interval: int = 1
+    byweekday: Tuple[int, ...] = ()     # 0 = Monday
+    bymonthday: Optional[int] = None
+    count: Optional[int] = None
+    until: Optional[date] = None
+
+    def __post_init__(self) -> None:
+        if self.freq not in FREQS:
+            raise InvalidRule(f"unsupported FREQ {self.freq!r}")
+        if not 1 <= self.interval <= 366:
+            raise InvalidRule("INTERVAL must be 1..366")
+        if any(not 0 <= d <= 6 for d in self.byweekday):
+            raise InvalidRule("bad BYDAY")
+        if self.bymonthday is not None and (self.bymonthday == 0 or not -1 <= self.bymonthday <= 31):
+            raise InvalidRule("BYMONTHDAY must be 1..31 or -1")
+        if self.bymonthday is not None and self.freq != "monthly":
+            raise InvalidRule("BYMONTHDAY needs FREQ=MONTHLY")
+        if self.byweekday and self.freq == "monthly":
+            raise InvalidRule("BYDAY is not supported with FREQ=MONTHLY")
+        if self.count is not None and self.until is not None:
+            raise InvalidRule("COUNT and UNTIL are exclusive")
+        if self.count is not None and not 1 <= self.count <= MAX_COUNT:
+            raise InvalidRule(f"COUNT must be 1..{MAX_COUNT}")
+
+
+def parse_rrule(text: str) -> Rule:
+    parts = {}
+    for part in text.strip().removeprefix("RRULE:").split(";"):
+        if not part:
+            continue
+        name, sep, value = part.partition("=")
+        if not sep or not value:
+            raise InvalidRule(f"bad part {part!r}")
+        parts[name.upper()] = value.upper()
+    unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "COUNT", "UNTIL", "WKST"}
+    if unknown:
+        raise InvalidRule(f"unsupported {', '.join(sorted(unknown))}")
+    if parts.get("WKST", "MO") != "MO":
+        raise InvalidRule("only WKST=MO")
+    try:
+        byweekday = tuple(sorted({WEEKDAYS.index(d) for d in parts["BYDAY"].split(",")})) if "BYDAY" in parts else ()
+    except ValueError:
+        raise InvalidRule(f"bad BYDAY {parts['BYDAY']!r}")
+    try:
+        until = None
+        if "UNTIL" in parts:
+            raw = parts["UNTIL"][:8]
+            until = date(int(raw[:4]), int(raw[4:6]), int(raw[6:8]))
+        return Rule(
+            freq=parts.get("FREQ", "").lower(),
+            interval=int(parts.get("INTERVAL", "1")),
+            byweekday=byweekday,
+            bymonthday=int(parts["BYMONTHDAY"]) if "BYMONTHDAY" in parts else None,
+            count=int(parts["COUNT"]) if "COUNT" in parts else None,
+            until=until,
+        )
+    except ValueError as e:
+        raise InvalidRule(str(e))
+
+
+def to_rrule(rule: Rule) -> str:
+    parts = [f"FREQ={rule.freq.upper()}"]
+    if rule.interval != 1:
+        parts.append(f"INTERVAL={rule.interval}")
+    if rule.byweekday:
+        parts.append("BYDAY=" + ",".join(WEEKDAYS[d] for d in rule.byweekday))
+    if rule.bymonthday is not None:
+        parts.append(f"BYMONTHDAY={rule.bymonthday}")
+    if rule.count is not None:
+        parts.append(f"COUNT={rule.count}")
+    if rule.until is not None:
+        parts.append(f"UNTIL={rule.until:%Y%m%d}")
+    return ";".join(parts)
+
+
+def _add_months(year: int, month: int, n: int) -> Tuple[int, int]:
+    m = month - 1 + n
+    return year + m // 12, m % 12 + 1
+
+
+def _cycle(rule: Rule) -> int:
+    # periods after which the pattern of matching dates repeats: lcm(INTERVAL, 7 days) / INTERVAL
+    # for daily, lcm(INTERVAL, 12 months) / INTERVAL for monthly, x8 so that a BYMONTHDAY=29 that
+    # only lands in February still meets a leap year (8 years apart around 2100)
+    if rule.freq == "daily":
+        return 7 // math.gcd(rule.interval, 7)
+    if rule.freq == "weekly":
+        return 1
+    return 12 // math.gcd(rule.interval, 12) * 8
+
+
+def _candidates(rule: Rule, dtstart: date, start: date, max_misses: int = MAX_MISSES) -> Iterator[date]:
+    # dates matching the rule, ascending, from the period containing `start` (never before dtstart's);
+    # stops after max_misses periods in a row without a date, or at the end of the date range
+    misses = 0
+    try:
+        if rule.freq == "daily":
+            k = max(0, -(-(start - dtstart).days // rule.interval))
+            d = dtstart + timedelta(days=k * rule.interval)
+            step = timedelta(days=rule.interval)
+            while misses <= max_misses:
+                if not rule.byweekday or d.weekday() in rule.byweekday:
+                    misses = 0
+                    yield d
+                else:
+                    misses += 1
+                d += step
+        elif rule.freq == "weekly":
+            days = rule.byweekday or (dtstart.weekday(),)
+            week0 = dtstart - timedelta(days=dtstart.weekday())
+            k = max(0, (start - week0).days // 7 // rule.interval)
+            week = week0 + timedelta(weeks=k * rule.interval)
+            while True:
+                for wd in days:
+                    yield week + timedelta(days=wd)
+                week += timedelta(weeks=rule.interval)
+        else:
+            months = (start.year - dtstart.year) * 12 + start.month - dtstart.month
+            k = max(0, months // rule.interval)
+            year, month = _add_months(dtstart.year, dtstart.month, k * rule.interval)
+            want = rule.bymonthday or dtstart.day
+            while misses <= max_misses:
+                last = calendar.monthrange(year, month)[1]
+                day = last if want == -1 else want
+                if day <= last:
+                    misses = 0
+                    yield date(year, month, day)
+                else:
+                    misses += 1
+                year, month = _add_months(year, month, rule.interval)
+    except (OverflowError, ValueError):
+        # past date.max (calendar.monthrange and date() raise ValueError for year 10000)
+        return
+
+
+def check_start(rule: Rule, dtstart: date) -> None:
+    """InvalidRule unless the rule has a date after dtstart within one cycle.
+
+    FREQ=DAILY;INTERVAL=7;BYDAY=TU from a Monday, or FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=31 from
+    February, never match: refused when the rule is saved.
+    """
+    if next((d for d in _candidates(rule, dtstart, dtstart, _cycle(rule)) if d > dtstart), None) is None:
+        raise InvalidRule(f"no date matches the rule after {dtstart.isoformat()}")
+
+
+def last_occurrence(rule: Rule, dtstart: date) -> Optional[date]:
+    # date of the COUNT-th occurrence (or UNTIL); None = endless. Computed once when the rule is saved.
+    if rule.count is None:
+        return rule.until
+    n, last = 1, dtstart
+    for d in _candidates(rule, dtstart, dtstart):
+        if n >= rule.count:
+            break
+        if d > dtstart:
+            n, last = n + 1, d
+    return last
+
+
+def occurrences(rule: Rule, dtstart: date, start: date, end: date, ends_on: Optional[date] = None) -> Iterator[date]:
+    """Occurrence dates in [start, end], dtstart included when in range.
+
+    ends_on: last_occurrence(rule, dtstart), precomputed (COUNT rules would otherwise be walked
+    from dtstart on every call).
+    """
+    if ends_on is None and rule.count is not None:
+        ends_on = last_occurrence(rule, dtstart)
+    if ends_on is not None:
+        end = min(end, ends_on)
+    if start <= dtstart <= end:
+        yield dtstart
+    for d in _candidates(rule, dtstart, max(start, dtstart)):
+        if d > end:
+            return
+        if d > dtstart and d >= start:
+            yield d
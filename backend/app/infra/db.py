@@ -1,12 +1,80 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import and_, create_engine, event, update
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.infra.instrumentation import instrument_engine
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./tm.sqlite3")
+# GET endpoints read through their own pool (a replica on Postgres, the same file on SQLite)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", DATABASE_URL)
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, echo=False, future=True, connect_args=connect_args)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "10"))
+
+# SQLite profile: "tuned" (WAL etc., below) or "default" (driver defaults: rollback journal, synchronous=FULL)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned")
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",                                           # readers don't block the writer and vice versa
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),       # fsync on checkpoint, not on every commit
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 2**20))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024))),  # negative = KiB -> 64 MiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),   # wait for the lock instead of "database is locked"
+    "temp_store": "MEMORY",
+}
+
+
+def _is_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def configure_sqlite(engine, *, read_only: bool = False) -> None:
+    # pragmas on every new connection; transactions are started by us, not by the driver:
+    # the write pool takes the write lock up front (BEGIN IMMEDIATE) so a read-then-write
+    # transaction never fails on the lock upgrade, the read pool uses a plain deferred BEGIN
+    # (one snapshot per request) and query_only.
+    if engine.dialect.name != "sqlite" or SQLITE_PROFILE != "tuned":
+        return
+    memory = _is_memory(engine.url)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        dbapi_conn.isolation_level = None
+        cur = dbapi_conn.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            if not (memory and name in ("journal_mode", "mmap_size")):
+                cur.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN" if read_only or memory else "BEGIN IMMEDIATE")
+
+
+def _engine_kwargs(url, pool_size: int) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        if _is_memory(url):
+            return {"connect_args": connect_args}
+        return {"connect_args": connect_args, "pool_size": pool_size, "max_overflow": DB_MAX_OVERFLOW}
+    return {"pool_size": pool_size, "max_overflow": DB_MAX_OVERFLOW}
+
+
+engine = create_engine(DATABASE_URL, echo=False, future=True, **_engine_kwargs(DATABASE_URL, DB_POOL_SIZE))
+configure_sqlite(engine)
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+if _is_memory(make_url(DATABASE_READ_URL)):
+    read_engine = engine  # a second in-memory engine would be a different (empty) database
+else:
+    read_engine = create_engine(DATABASE_READ_URL, echo=False, future=True, **_engine_kwargs(DATABASE_READ_URL, DB_READ_POOL_SIZE))
+    configure_sqlite(read_engine, read_only=True)
+    instrument_engine(read_engine)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
 # ВАЖНО: без @contextmanager — простая зависимость FastAPI на генераторе
@@ -16,3 +84,97 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upsert_insert(db):
+    # dialect insert() with on_conflict_do_update (SQLite, Postgres); None elsewhere
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+
+def upsert_add(db, model, keys, rows) -> None:
+    # counters: add each row's non-key columns onto the row with the same keys, or insert it
+    if not rows:
+        return
+    cols = [c for c in rows[0] if c not in keys]
+    insert = upsert_insert(db)
+    if insert is not None:
+        stmt = insert(model)
+        set_ = {c: getattr(model, c) + getattr(stmt.excluded, c) for c in cols}
+        db.execute(stmt.on_conflict_do_update(index_elements=keys, set_=set_), rows)
+        return
+    for row in rows:
+        key = and_(*(getattr(model, k) == row[k] for k in keys))
+        res = db.execute(update(model).where(key).values({c: getattr(model, c) + row[c] for c in cols}))
+        if not res.rowcount:
+            db.add(model(**row))
+            db.flush()
+
+
+# read-only session for GET endpoints: never waits behind writers (WAL), never writes
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# --- async mode (ASYNC_DB=1): async routes on AsyncSession, aiosqlite / asyncpg drivers ---
+ASYNC_DB = os.getenv("ASYNC_DB", "0") == "1"
+
+_async_sessionmaker = None
+_async_read_sessionmaker = None
+
+
+def async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme.startswith("postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+def _async_maker(url: str, read_only: bool = False):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_url(url), echo=False)
+    configure_sqlite(async_engine.sync_engine, read_only=read_only)
+    instrument_engine(async_engine.sync_engine)
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def get_async_sessionmaker():
+    # created on first use so the sync-only setup does not need the async drivers installed
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = _async_maker(DATABASE_URL)
+    return _async_sessionmaker
+
+
+def get_async_read_sessionmaker():
+    # like ReadSessionLocal: deferred BEGIN and query_only, GETs never queue for the write lock
+    global _async_read_sessionmaker
+    if _async_read_sessionmaker is None:
+        if _is_memory(make_url(DATABASE_READ_URL)):
+            _async_read_sessionmaker = get_async_sessionmaker()
+        else:
+            _async_read_sessionmaker = _async_maker(DATABASE_READ_URL, read_only=True)
+    return _async_read_sessionmaker
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with get_async_read_sessionmaker()() as db:
+        yield db
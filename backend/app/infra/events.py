@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Set
+
+from app.infra import metrics
+
+# In-process pub/sub for task events (one bus per worker process). Publishers are the repo
+# functions, usually on a threadpool thread; subscribers are SSE connections on the event loop.
+# Every subscriber has a bounded queue; what happens when it is full is its policy:
+#   resync      - drop the backlog and queue one {"type": "resync"} (client re-reads /changes)
+#   drop_oldest - drop the oldest queued event
+#   disconnect  - close the subscription
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_POLICY = os.getenv("EVENTS_POLICY", "resync")
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))  # seconds between ": ping" comments
+
+POLICIES = ("resync", "drop_oldest", "disconnect")
+
+published = metrics.counter("task_events_published_total", "Task events published to the in-process bus")
+dropped = metrics.counter("task_events_dropped_total", "Task events dropped because a subscriber queue was full")
+subscribers_gauge = metrics.gauge("task_event_subscribers", "Open task event subscriptions")
+
+RESYNC = {"type": "resync"}
+
+
+class Subscription:
+    def __init__(self, bus: "EventBus", user_id: int, maxsize: int, policy: str):
+        self.bus = bus
+        self.user_id = user_id
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+
+    def _offer(self, event: Dict[str, Any]) -> None:
+        # always runs on the subscriber's loop
+        if self.closed:
+            return
+        if self.policy == "resync" and self._queue and self._queue[-1] is RESYNC:
+            return  # a resync is pending: the client re-reads everything anyway
+        if len(self._queue) >= self.maxsize:
+            if self.policy == "drop_oldest":
+                dropped.inc()
+                self._queue.popleft()
+            else:
+                dropped.inc(len(self._queue) + 1)
+                self._queue.clear()
+                if self.policy == "disconnect":
+                    self.close()
+                    return
+                event = RESYNC
+        self._queue.append(event)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        # next event; None on timeout or when closed.
+        # A bare future + call_later: asyncio.wait_for costs an extra task per wait, which adds
+        # up with thousands of idle connections waking for every fan-out.
+        if not self._queue:
+            if self.closed:
+                return None
+            self._waiter = self._loop.create_future()
+            timer = self._loop.call_later(timeout, self._wake) if timeout is not None else None
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+                if timer is not None:
+                    timer.cancel()
+            if not self._queue:
+                return None
+        return self._queue.popleft()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.bus._remove(self)
+            self._wake()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class EventBus:
+    def __init__(self):
+        self._subs: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int, maxsize: int = EVENTS_QUEUE_SIZE, policy: str = EVENTS_POLICY) -> Subscription:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}")
+        sub = Subscription(self, user_id, maxsize, policy)
+        with self._lock:
+            self._subs.setdefault(user_id, set()).add(sub)
+        subscribers_gauge.inc()
+        return sub
+
+    def _remove(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.user_id)
+            if subs and sub in subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.user_id]
+                subscribers_gauge.dec()
+
+    def has_subscribers(self, user_id: int) -> bool:
+        return user_id in self._subs
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> int:
+        # callable from any thread; returns the number of subscribers it was handed to
+        with self._lock:
+            subs = list(self._subs.get(user_id, ()))
+        if not subs:
+            return 0
+        published.inc()
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        # one wake-up per event loop, not per subscriber
+        by_loop: Dict[asyncio.AbstractEventLoop, list] = {}
+        for sub in subs:
+            by_loop.setdefault(sub._loop, []).append(sub)
+        for loop, group in by_loop.items():
+            if loop is current:
+                _deliver(group, event)
+                continue
+            try:
+                loop.call_soon_threadsafe(_deliver, group, event)
+            except RuntimeError:  # loop already closed
+                for sub in group:
+                    sub.close()
+        return len(subs)
+
+
+_last_frame: tuple = (None, "")
+
+
+def sse_format(event: Dict[str, Any]) -> str:
+    # a fan-out hands the same dict to every subscriber: encode it once
+    global _last_frame
+    if _last_frame[0] is event:
+        return _last_frame[1]
+    lines = [f"event: {event['type']}"]
+    if event.get("seq") is not None:
+        lines.append(f"id: {event['seq']}")
+    lines.append("data: " + json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+    frame = "\n".join(lines) + "\n\n"
+    _last_frame = (event, frame)
+    return frame
+
+
+def _deliver(subs, event: Dict[str, Any]) -> None:
+    for sub in subs:
+        sub._offer(event)
+
+
+bus = EventBus()
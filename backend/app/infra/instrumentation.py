@@ -0,0 +1,134 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from app.infra import metrics
+
+# Per-request instrumentation: latency per route, SQL statements per request (count + time,
+# from the engine's cursor events) and a slow query log; everything lands in app.infra.metrics
+# and is served by GET /metrics.
+
+# statements slower than this are logged with their SQL (no parameters), 0 disables
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# off | log | raise: compare each request's statement count with QUERY_BUDGETS; tests use raise
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "off")
+
+# statements per request with warm caches (user cache, claims cache); BEGIN is not counted
+QUERY_BUDGETS: Dict[str, int] = {
+    "GET /api/auth/me": 1,
+    "GET /api/tasks/": 3,                # version (ETag), count, page
+    "GET /api/tasks/{task_id}": 2,       # version, row
+    "GET /api/tasks/calendar": 4,        # version, days, recurrence rules + materialized slots (if any)
+    "GET /api/tasks/changes": 2,
+    "POST /api/tasks/": 5,               # version, insert, counters (+ due counter), daily stats
+    "PATCH /api/tasks/{task_id}": 8,     # + before-image, due counters and lead time on status changes
+    "DELETE /api/tasks/{task_id}": 7,    # + the task's recurrence rule, if it was a template
+    "GET /api/analytics/summary": 2,
+    "GET /api/analytics/throughput": 2,
+    "GET /api/analytics/lead-time": 2,
+    "GET /api/analytics/burndown": 3,
+}
+
+log = logging.getLogger("app.sql")
+
+request_latency = metrics.histogram_family(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route")
+)
+request_queries = metrics.histogram_family(
+    "http_request_db_queries", "SQL statements per request by route", ("method", "route"),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55),
+)
+request_db_time = metrics.histogram_family(
+    "http_request_db_seconds", "Time in SQL statements per request by route", ("method", "route")
+)
+responses = metrics.counter_family("http_responses_total", "Responses by route and status", ("method", "route", "status"))
+query_latency = metrics.histogram("db_query_seconds", "SQL statement latency")
+slow_queries = metrics.counter("db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine) -> None:
+    # sync endpoints run in a worker thread with a copy of the request's context, so the
+    # RequestStats object set by the middleware is the one the cursor events see
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        query_latency.observe(elapsed)
+        stats = _stats.get()
+        if stats is not None and not statement.startswith("BEGIN"):
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+            slow_queries.inc()
+            log.warning("slow query %.1fms: %s", elapsed * 1000, statement)
+
+
+def _route(scope) -> str:
+    # the path template, not the path: one series per endpoint whatever the ids
+    # (path_format drops converters, so sync and async routes share "/api/tasks/{task_id}")
+    return getattr(scope.get("route"), "path_format", None) or "unmatched"
+
+
+def _check_budget(key: str, queries: int) -> None:
+    budget = QUERY_BUDGETS.get(key)
+    if budget is None or queries <= budget:
+        return
+    message = f"{key}: {queries} SQL statements, budget {budget}"
+    if QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    log.warning("query budget exceeded: %s", message)
+
+
+class InstrumentationMiddleware:
+    # plain ASGI (not BaseHTTPMiddleware): no extra task per request, streaming bodies untouched
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = RequestStats()
+        token = _stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # the endpoint has run by now; a budget error here reaches the test client
+                if QUERY_BUDGET_MODE != "off" and status < 400:
+                    _check_budget(f"{scope['method']} {_route(scope)}", stats.queries)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _stats.reset(token)
+            labels = (scope["method"], _route(scope))
+            request_latency.labels(*labels).observe(time.perf_counter() - start)
+            request_queries.labels(*labels).observe(stats.queries)
+            request_db_time.labels(*labels).observe(stats.db_seconds)
+            responses.labels(*labels, str(status)).inc()
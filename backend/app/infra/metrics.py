@@ -0,0 +1,176 @@
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+# Minimal in-process metrics (no external client library): counters and cumulative
+# histograms that render in the Prometheus text exposition format.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self) -> List[Tuple[str, float]]:
+        return [(self.name, self._value)]
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self) -> List[Tuple[str, float]]:
+        return [(self.name, self._value)]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot: +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def quantile(self, q: float) -> float:
+        # upper bound of the bucket holding the q-th observation (inf if past the last bucket)
+        with self._lock:
+            rank, seen = q * self._count, 0
+            for bound, n in zip(self.buckets + (float("inf"),), self._counts):
+                seen += n
+                if seen >= rank and seen:
+                    return bound
+        return 0.0
+
+    def samples(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            out, cumulative = [], 0
+            for bound, n in zip(self.buckets, self._counts):
+                cumulative += n
+                out.append((f'{self.name}_bucket{{le="{bound}"}}', cumulative))
+            out.append((f'{self.name}_bucket{{le="+Inf"}}', self._count))
+            out.append((f"{self.name}_sum", self._sum))
+            out.append((f"{self.name}_count", self._count))
+        return out
+
+
+class Family:
+    # one metric per combination of label values, created on first use: route="/api/tasks/{task_id}"
+    def __init__(self, metric: Callable[[], Any], name: str, help: str, labelnames: Sequence[str]):
+        self._metric = metric
+        self.kind = metric().kind
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._metric())
+        return child
+
+    def samples(self) -> List[Tuple[str, float]]:
+        out = []
+        for values, child in sorted(self._children.items()):
+            labels = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, values))
+            for name, value in child.samples():
+                name = name.replace("{", "{" + labels + ",", 1) if "{" in name else f"{name}{{{labels}}}"
+                out.append((name, value))
+        return out
+
+
+REGISTRY: Dict[str, object] = {}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def counter(name: str, help: str) -> Counter:
+    return REGISTRY.setdefault(name, Counter(name, help))  # type: ignore[return-value]
+
+
+def gauge(name: str, help: str) -> Gauge:
+    return REGISTRY.setdefault(name, Gauge(name, help))  # type: ignore[return-value]
+
+
+def histogram(name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.setdefault(name, Histogram(name, help, buckets))  # type: ignore[return-value]
+
+
+def counter_family(name: str, help: str, labelnames: Sequence[str]) -> Family:
+    return REGISTRY.setdefault(name, Family(lambda: Counter(name, help), name, help, labelnames))  # type: ignore[return-value]
+
+
+def histogram_family(name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS) -> Family:
+    return REGISTRY.setdefault(  # type: ignore[return-value]
+        name, Family(lambda: Histogram(name, help, buckets), name, help, labelnames)
+    )
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY.values():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(f"{name} {_fmt(value)}" for name, value in metric.samples())
+    return "\n".join(lines) + "\n"
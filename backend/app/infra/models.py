@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, Date, Enum, ForeignKey, Index, func
+from sqlalchemy import Column, Integer, String, DateTime, Text, Date, Enum, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from app.infra.db import Base
 
@@ -16,6 +16,8 @@ class UserORM(Base):
     full_name = Column(String(200), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     tasks = relationship("TaskORM", back_populates="user", cascade="all,delete-orphan")
+    archived_tasks = relationship("TaskArchiveORM", cascade="all,delete-orphan")
+    recurrences = relationship("TaskRecurrenceORM", cascade="all,delete-orphan")
 
 
 class TaskORM(Base):
@@ -30,11 +32,149 @@ class TaskORM(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # user's change version (task_versions) of the last write to this row; drives /api/tasks/changes
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    # materialized occurrence of a recurring task (app/repo/recurrence.py): rule and the slot it fills
+    recurrence_id = Column(Integer, nullable=True)
+    occurrence_date = Column(Date, nullable=True)
 
     user = relationship("UserORM", back_populates="tasks")
 
+    # SQLite: AUTOINCREMENT, an id is never handed out twice (archived tasks and tombstones keep theirs)
+    __table_args__ = {"sqlite_autoincrement": True}
+
 
 Index("ix_tasks_status", TaskORM.status)
 Index("ix_tasks_due_date", TaskORM.due_date)
+# Per-user composites matching list_tasks/analytics: user_id first, then the sort/filter column.
+# id is the keyset tie-breaker, so ORDER BY ..., id is served straight from the index.
+Index("ix_tasks_user_created", TaskORM.user_id, TaskORM.created_at.desc(), TaskORM.id.desc())
+Index("ix_tasks_user_due", TaskORM.user_id, TaskORM.due_date, TaskORM.id)
+Index("ix_tasks_user_status_due", TaskORM.user_id, TaskORM.status, TaskORM.due_date)
+Index("ix_tasks_user_change_seq", TaskORM.user_id, TaskORM.change_seq, TaskORM.id)
+Index("ux_tasks_recurrence_occurrence", TaskORM.recurrence_id, TaskORM.occurrence_date, unique=True)
+
+
+# Cold tier (app/repo/archive.py): done tasks older than ARCHIVE_AFTER_DAYS, moved out of `tasks`
+# with their ids. Same columns; status/priority are plain strings, the rows were validated in `tasks`.
+class TaskArchiveORM(Base):
+    __tablename__ = "tasks_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String(200), nullable=False)
+    description = Column(Text, nullable=True)
+    due_date = Column(Date, nullable=True)
+    priority = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    recurrence_id = Column(Integer, nullable=True)
+    occurrence_date = Column(Date, nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+
+Index("ix_tasks_archive_user_created", TaskArchiveORM.user_id, TaskArchiveORM.created_at, TaskArchiveORM.id)
+Index("ix_tasks_archive_recurrence", TaskArchiveORM.recurrence_id, TaskArchiveORM.occurrence_date)
+
+
+# Recurrence rule attached to a task, the template (app/repo/recurrence.py). Occurrences are not
+# rows: they are expanded per queried range, a row appears only once an occurrence is changed.
+class TaskRecurrenceORM(Base):
+    __tablename__ = "task_recurrences"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), unique=True, nullable=False)
+    rrule = Column(String(200), nullable=False)         # FREQ=WEEKLY;BYDAY=MO,WE (app/domain/recurrence.py)
+    dtstart = Column(Date, nullable=False)              # template's due_date when the rule was set
+    ends_on = Column(Date, nullable=True)               # last occurrence (COUNT/UNTIL), None = endless
+    exdates = Column(Text, nullable=True)               # JSON list of skipped/deleted occurrence dates
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# Materialized per-user summary (see app/repo/analytics.py): open/done totals and overdue as of `as_of`
+class TaskCounterORM(Base):
+    __tablename__ = "task_counters"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    open = Column(Integer, nullable=False, default=0)       # todo + in_progress
+    done = Column(Integer, nullable=False, default=0)
+    overdue = Column(Integer, nullable=False, default=0)    # open with due_date < as_of
+    archived = Column(Integer, nullable=False, default=0, server_default="0")  # done, moved to tasks_archive
+    as_of = Column(Date, nullable=False)
+
+
+# Open tasks per (user, due_date): lets overdue roll forward past midnight without a recount
+class TaskDueCounterORM(Base):
+    __tablename__ = "task_due_counters"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    due_date = Column(Date, primary_key=True)
+    open = Column(Integer, nullable=False, default=0)
+
+
+# Per-user change version of the task list, bumped by every write (see app/repo/changes.py)
+class TaskVersionORM(Base):
+    __tablename__ = "task_versions"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Deleted tasks, so that a change feed can report them (app/repo/changes.py)
+class TaskTombstoneORM(Base):
+    __tablename__ = "task_tombstones"
+    # per user: one user's delete never replaces another's tombstone for the same id
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    task_id = Column(Integer, primary_key=True)
+    change_seq = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
+
+
+Index("ix_task_tombstones_user_change_seq", TaskTombstoneORM.user_id, TaskTombstoneORM.change_seq, TaskTombstoneORM.task_id)
+
+
+# Daily rollup per user (app/repo/timeseries.py): updated with every task write, UTC days
+class TaskDailyStatORM(Base):
+    __tablename__ = "task_daily_stats"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    open_delta = Column(Integer, nullable=False, default=0)  # net change of open tasks: burndown = running sum
+
+
+# Lead time (created -> done) histogram per completion day, log-scale buckets
+class TaskLeadTimeORM(Base):
+    __tablename__ = "task_lead_times"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    n = Column(Integer, nullable=False, default=0)
+
+
+# Leader lease of a background job (app/infra/scheduler.py): one row per job, the worker whose
+# lease has not expired runs it; fired_until is the job's progress, picked up by the next holder
+class SchedulerLeaseORM(Base):
+    __tablename__ = "scheduler_leases"
+    name = Column(String(50), primary_key=True)
+    owner = Column(String(100), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    fired_until = Column(DateTime(timezone=True), nullable=True)
+
+
+# Reminders written by the outbox sink, for a consumer to deliver (delivered_at IS NULL = pending).
+# One row per (task, kind, due date): a group fired twice (failover, retry) is not delivered twice.
+class ReminderOutboxORM(Base):
+    __tablename__ = "reminder_outbox"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    task_id = Column(Integer, nullable=False)
+    kind = Column(String(20), nullable=False)
+    due_date = Column(Date, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (UniqueConstraint("task_id", "kind", "due_date", name="ux_reminder_outbox_task_kind_due"),)
 
 
+Index("ix_reminder_outbox_pending", ReminderOutboxORM.delivered_at, ReminderOutboxORM.id)
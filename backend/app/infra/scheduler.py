@@ -0,0 +1,267 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import socket
+import urllib.request
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.infra import metrics
+from app.infra.db import ReadSessionLocal, SessionLocal
+from app.repo import reminders
+
+# In-process reminder scheduler, started from the app lifespan (app/main.py).
+# Reminder kinds fire at a fixed offset from the start (00:00 UTC) of a task's due date:
+# REMINDER_KINDS="due_soon:-15,overdue:24" = 09:00 UTC the day before, and midnight after it.
+# The heap holds the next fire time of every kind; when one comes up, the open tasks due on that
+# date are read in batches of SCHEDULER_BATCH_SIZE (a range of ix_tasks_due_date) and handed to the
+# sinks. Between fire times nothing touches the database but the lease renewal; a fire time costs
+# the tasks due that day, never a scan of the table.
+# Several uvicorn workers: only the holder of the "reminders" lease row runs; fired_until on the row
+# is its progress, so a worker taking over continues where the last one stopped. Delivery is at
+# least once (a group interrupted midway is fired again); the outbox sink drops the duplicates.
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_SINKS = os.getenv("SCHEDULER_SINKS", "log")               # comma-separated: log, webhook, outbox
+SCHEDULER_WEBHOOK_URL = os.getenv("SCHEDULER_WEBHOOK_URL", "http://127.0.0.1:8787/reminders")
+SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "1000"))
+SCHEDULER_LEASE_SECONDS = float(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+SCHEDULER_RETRY_SECONDS = float(os.getenv("SCHEDULER_RETRY_SECONDS", "30"))
+# how far back a fresh start (or a lease found stale for long) fires missed reminders
+SCHEDULER_MAX_CATCHUP_HOURS = float(os.getenv("SCHEDULER_MAX_CATCHUP_HOURS", "24"))
+REMINDER_KINDS = os.getenv("REMINDER_KINDS", "due_soon:-15,overdue:24")
+
+LEASE_NAME = "reminders"
+
+log = logging.getLogger("app.scheduler")
+
+fired = metrics.counter_family("scheduler_reminders_total", "Reminders handed to the sinks", ["kind"])
+batches = metrics.counter("scheduler_batches_total", "Task batches read by the reminder scheduler")
+sink_errors = metrics.counter_family("scheduler_sink_errors_total", "Reminder batches a sink failed on", ["sink"])
+leader = metrics.gauge("scheduler_leader", "1 while this worker holds the reminder scheduler lease")
+
+
+def parse_kinds(spec: str) -> Dict[str, timedelta]:
+    kinds = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, hours = part.partition(":")
+        kinds[name] = timedelta(hours=float(hours))
+    return kinds
+
+
+def fire_time(due: date, offset: timedelta) -> datetime:
+    return datetime.combine(due, time(), tzinfo=timezone.utc) + offset
+
+
+def first_due_after(moment: datetime, offset: timedelta) -> date:
+    # earliest due date whose fire time for `offset` is strictly after `moment`
+    return (moment - offset).date() + timedelta(days=1)
+
+
+# --- sinks: async emit(reminders) -> None, raise to have the group retried ---
+
+class LogSink:
+    name = "log"
+
+    async def emit(self, items: List[Dict]) -> None:
+        for r in items:
+            log.info("reminder %s task=%s user=%s due=%s", r["kind"], r["task_id"], r["user_id"], r["due_date"])
+
+
+class WebhookSink:
+    # POSTs {"reminders": [...]} per batch; the default URL is a local receiver standing in for a
+    # real notification service
+    name = "webhook"
+
+    def __init__(self, url: str = SCHEDULER_WEBHOOK_URL, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, body: bytes) -> None:
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+    async def emit(self, items: List[Dict]) -> None:
+        await asyncio.to_thread(self._post, json.dumps({"reminders": items}, ensure_ascii=False).encode())
+
+
+class OutboxSink:
+    # rows in reminder_outbox, for a consumer to deliver; a re-fired group is not written twice
+    name = "outbox"
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+
+    def _write(self, items: List[Dict]) -> None:
+        with self.session_factory() as db:
+            reminders.write_outbox(db, items, datetime.now(timezone.utc))
+
+    async def emit(self, items: List[Dict]) -> None:
+        await asyncio.to_thread(self._write, items)
+
+
+SINKS = {"log": LogSink, "webhook": WebhookSink, "outbox": OutboxSink}
+
+
+def make_sinks(spec: str = SCHEDULER_SINKS) -> List:
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SINKS]
+    if unknown:
+        raise ValueError(f"unknown scheduler sinks: {', '.join(unknown)}")
+    return [SINKS[n]() for n in names]
+
+
+class Scheduler:
+    def __init__(
+        self,
+        sinks: Sequence,
+        *,
+        kinds: Optional[Dict[str, timedelta]] = None,
+        owner: Optional[str] = None,
+        lease_name: str = LEASE_NAME,
+        batch_size: int = SCHEDULER_BATCH_SIZE,
+        lease_seconds: float = SCHEDULER_LEASE_SECONDS,
+        session_factory: Callable = SessionLocal,
+        read_session_factory: Callable = ReadSessionLocal,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.sinks = list(sinks)
+        self.kinds = kinds if kinds is not None else parse_kinds(REMINDER_KINDS)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_name = lease_name
+        self.batch_size = batch_size
+        self.lease = timedelta(seconds=lease_seconds)
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.clock = clock
+        self._heap: List[Tuple[datetime, str, date]] = []   # (fire_at, kind, due_date)
+        self._renewed: Optional[datetime] = None
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # --- lease ---
+
+    def _acquire(self, now: datetime):
+        with self.session_factory() as db:
+            row = reminders.acquire_lease(db, self.lease_name, self.owner, self.lease, now)
+            return None if row is None else (row.fired_until,)
+
+    async def _hold_lease(self, now: datetime) -> bool:
+        if self._renewed is not None and now - self._renewed < self.lease / 3:
+            return True
+        held = await asyncio.to_thread(self._acquire, now)
+        if held is None:
+            if self._renewed is not None:
+                log.info("scheduler lease lost to another worker")
+            self._renewed = None
+            self._heap.clear()
+            leader.set(0)
+            return False
+        if self._renewed is None:
+            # (re)gained the lease: continue from the stored progress, at most MAX_CATCHUP back
+            (fired_until,) = held
+            floor = now - timedelta(hours=SCHEDULER_MAX_CATCHUP_HOURS)
+            start = max(fired_until.replace(tzinfo=timezone.utc) if fired_until else now, floor)
+            self._heap = [(fire_time(d, off), kind, d) for kind, off in self.kinds.items()
+                          for d in [first_due_after(start, off)]]
+            heapq.heapify(self._heap)
+            leader.set(1)
+            log.info("scheduler lease taken by %s, reminders from %s", self.owner, start.isoformat())
+        self._renewed = now
+        return True
+
+    def _save(self, fired_until: datetime) -> bool:
+        with self.session_factory() as db:
+            return reminders.save_progress(db, self.lease_name, self.owner, fired_until)
+
+    # --- firing ---
+
+    def _batch(self, due: date, after_id: int):
+        with self.read_session_factory() as db:
+            return reminders.open_tasks_due(db, due, after_id, self.batch_size)
+
+    def _sweep(self, user_ids) -> None:
+        with self.session_factory() as db:
+            # the UTC day of the scheduler's clock, like the fire times (not the host's local date)
+            reminders.roll_counters(db, user_ids, self.clock().astimezone(timezone.utc).date())
+
+    async def _fire(self, fire_at: datetime, kind: str, due: date) -> bool:
+        # all open tasks due on `due`, batch by batch; False: stopped (lease lost or a sink failed)
+        after_id = 0
+        while True:
+            rows = await asyncio.to_thread(self._batch, due, after_id)
+            if not rows:
+                return True
+            batches.inc()
+            items = [
+                {"kind": kind, "task_id": r.id, "user_id": r.user_id, "title": r.title,
+                 "due_date": r.due_date.isoformat(), "fire_at": fire_at.isoformat()}
+                for r in rows
+            ]
+            for sink in self.sinks:
+                try:
+                    await sink.emit(items)
+                except Exception:
+                    sink_errors.labels(sink.name).inc()
+                    log.exception("reminder sink %s failed, %s for %s retried in %ss", sink.name, kind, due, SCHEDULER_RETRY_SECONDS)
+                    return False
+            fired.labels(kind).inc(len(items))
+            if kind == "overdue":
+                await asyncio.to_thread(self._sweep, {r.user_id for r in rows})
+            after_id = rows[-1].id
+            if len(rows) < self.batch_size:
+                return True
+            if not await self._hold_lease(self.clock()):
+                return False
+
+    async def run_once(self, now: Optional[datetime] = None) -> float:
+        """Fire everything due by `now`; returns the seconds until there is something to do."""
+        now = now or self.clock()
+        if not await self._hold_lease(now):
+            return self.lease.total_seconds() / 2
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, kind, due = self._heap[0]
+            if not await self._fire(fire_at, kind, due):
+                return SCHEDULER_RETRY_SECONDS if self._renewed is not None else self.lease.total_seconds() / 2
+            heapq.heapreplace(self._heap, (fire_time(due + timedelta(days=1), self.kinds[kind]), kind, due + timedelta(days=1)))
+            if not await asyncio.to_thread(self._save, fire_at):
+                self._renewed = None
+                self._heap.clear()
+                leader.set(0)
+                return self.lease.total_seconds() / 2
+        until_next = (self._heap[0][0] - now).total_seconds() if self._heap else float("inf")
+        return max(0.0, min(until_next, self.lease.total_seconds() / 3))
+
+    async def run(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                try:
+                    delay = await self.run_once()
+                except Exception:
+                    log.exception("reminder scheduler tick failed")
+                    delay = SCHEDULER_RETRY_SECONDS
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._renewed is not None:
+                await asyncio.to_thread(self._release)
+
+    def _release(self) -> None:
+        with self.session_factory() as db:
+            reminders.release_lease(db, self.lease_name, self.owner)
+        self._renewed = None
+        leader.set(0)
+
+    def start(self) -> asyncio.Task:
+        self._task = asyncio.get_running_loop().create_task(self.run(), name="reminder-scheduler")
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
@@ -0,0 +1,137 @@
+import os
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import DDL, event, func, literal_column, or_, select, table, column, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Join
+
+from app.infra.models import TaskORM
+
+# like | fts; "fts" = FTS5 on SQLite, tsvector/GIN on Postgres (falls back to like if not installed)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "fts")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_tokens(q: str) -> list[str]:
+    return _TOKEN_RE.findall(q.lower())
+
+
+class LikeSearch:
+    name = "like"
+
+    def apply(self, stmt: Select, q: str, model=TaskORM) -> Tuple[Select, Optional[ColumnElement]]:
+        # model: TaskORM or an alias of the same shape (tasks + archive, see app/repo/archive.py)
+        qv = f"%{q.lower()}%"
+        stmt = stmt.where(
+            or_(
+                func.lower(model.title).like(qv),
+                func.lower(model.description).like(qv),
+            )
+        )
+        return stmt, None
+
+
+class _CrossJoin(Join):
+    # SQLite never reorders the tables of a CROSS JOIN: read the FTS hits first, then fetch
+    # tasks by primary key. A plain JOIN lets the planner walk every task of the user and
+    # probe the FTS index per row, which is slower than LIKE for big backlogs.
+    inherit_cache = True
+
+
+@compiles(_CrossJoin, "sqlite")
+def _compile_cross_join(join, compiler, asfrom=False, **kw):
+    return (
+        compiler.process(join.left, asfrom=True, **kw)
+        + " CROSS JOIN "
+        + compiler.process(join.right, asfrom=True, **kw)
+        + " ON "
+        + compiler.process(join.onclause, **kw)
+    )
+
+
+class Fts5Search:
+    # external-content FTS5 table over tasks(title, description), synced by triggers
+    name = "fts5"
+    fts = table("tasks_fts", column("rowid"))
+
+    def apply(self, stmt: Select, q: str) -> Tuple[Select, Optional[ColumnElement]]:
+        tokens = search_tokens(q)
+        if not tokens:
+            return LikeSearch().apply(stmt, q)
+        # every token as a quoted prefix term: no FTS syntax from user input, "rep" finds "report"
+        match = " ".join(f'"{tok}"*' for tok in tokens)
+        hits = (
+            select(self.fts.c.rowid.label("id"), func.bm25(literal_column("tasks_fts")).label("rank"))
+            .where(literal_column("tasks_fts").op("MATCH")(match))
+            .subquery("fts_hits")
+        )
+        # bm25: lower is better
+        return stmt.select_from(_CrossJoin(hits, TaskORM.__table__, hits.c.id == TaskORM.id)), hits.c.rank
+
+
+class TsvectorSearch:
+    # generated tsvector column tasks.search_vector + GIN index (Postgres)
+    name = "tsvector"
+
+    def apply(self, stmt: Select, q: str) -> Tuple[Select, Optional[ColumnElement]]:
+        tokens = search_tokens(q)
+        if not tokens:
+            return LikeSearch().apply(stmt, q)
+        query = func.to_tsquery("simple", " & ".join(f"{tok}:*" for tok in tokens))
+        vector = literal_column("tasks.search_vector")
+        return stmt.where(vector.op("@@")(query)), -func.ts_rank(vector, query)
+
+
+FTS5_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+TSVECTOR_DDL = [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+# create_all (tests, fresh dev DBs) gets the index too; existing DBs get it from the Alembic revision
+for _stmt in FTS5_DDL:
+    event.listen(TaskORM.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in TSVECTOR_DDL:
+    event.listen(TaskORM.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+
+
+_installed: dict = {}
+
+
+def _fts_installed(db: Session) -> bool:
+    bind = db.get_bind()
+    key = (bind.url.render_as_string(), bind.dialect.name)
+    if key not in _installed:
+        if bind.dialect.name == "sqlite":
+            probe = "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'"
+        else:
+            probe = (
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'tasks' AND column_name = 'search_vector'"
+            )
+        _installed[key] = db.execute(text(probe)).first() is not None
+    return _installed[key]
+
+
+def get_search_backend(db: Session):
+    if SEARCH_BACKEND == "fts" and _fts_installed(db):
+        return Fts5Search() if db.get_bind().dialect.name == "sqlite" else TsvectorSearch()
+    return LikeSearch()
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import IO, Any, Dict, Iterable, Iterator, Sequence, Tuple, Union
+
+# NDJSON / CSV encoding of task rows for export (and parsing for import)
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# rows per yielded chunk: one write per chunk instead of one per row
+CHUNK_ROWS = 500
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    buf = []
+    for row in rows:
+        buf.append(json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False))
+        if len(buf) >= CHUNK_ROWS:
+            yield ("\n".join(buf) + "\n").encode()
+            buf.clear()
+    if buf:
+        yield ("\n".join(buf) + "\n").encode()
+
+
+def encode_csv(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    n = 0
+    for row in rows:
+        writer.writerow(["" if v is None else _plain(v) for v in row])
+        n += 1
+        if n % CHUNK_ROWS == 0:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue().encode()
+
+
+def encode(fmt: str, columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    return encode_csv(columns, rows) if fmt == "csv" else encode_ndjson(columns, rows)
+
+
+# --- import: (line number, parsed record or error message) per input row, read lazily ---
+
+Parsed = Tuple[int, Union[Dict[str, Any], str]]
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Parsed]:
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"invalid json: {e.msg}"
+            continue
+        yield line_no, record if isinstance(record, dict) else "expected a json object"
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Parsed]:
+    reader = csv.DictReader(lines)
+    for record in reader:
+        # line of the record's last physical line (quoted values may span several)
+        if None in record:
+            yield reader.line_num, "too many fields"
+            continue
+        # empty cell = field not given (CSV has no null)
+        yield reader.line_num, {k: v for k, v in record.items() if v not in ("", None)}
+
+
+def parse(fmt: str, stream: IO[bytes]) -> Iterator[Parsed]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    return parse_csv(text) if fmt == "csv" else parse_ndjson(text)
+
+
+def detect_format(filename: str) -> str:
+    return "csv" if filename.lower().endswith(".csv") else "ndjson"
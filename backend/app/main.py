@@ -1,11 +1,31 @@
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.auth import router as auth_router
 from app.api.tasks import router as tasks_router
 from app.api.analytics import router as analytics_router
+from app.infra import metrics
+from app.infra.db import ASYNC_DB
+from app.infra.instrumentation import InstrumentationMiddleware
+from app.infra import scheduler
 
-app = FastAPI(title="Task Manager API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # reminder scheduler: runs in every worker, only the holder of the lease row does the work
+    job = scheduler.Scheduler(scheduler.make_sinks()) if scheduler.SCHEDULER_ENABLED else None
+    if job is not None:
+        job.start()
+    try:
+        yield
+    finally:
+        if job is not None:
+            await job.stop()
+
+
+app = FastAPI(title="Task Manager API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,11 +38,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# outermost: times the whole request, CORS included
+app.add_middleware(InstrumentationMiddleware)
 
 @app.get("/healthz")
 def healthz():
     return {"status": "ok", "time": datetime.now(timezone.utc).isoformat()}
 
-app.include_router(auth_router, prefix="/api")
-app.include_router(tasks_router)  # у нас уже prefix="/api/tasks"
-app.include_router(analytics_router)
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def include_routers(app: FastAPI, async_mode: bool = False) -> None:
+    if async_mode:
+        # async routes go first; anything they do not cover falls through to the sync routers
+        from app.api.auth_async import router as auth_async_router
+        from app.api.tasks_async import router as tasks_async_router
+        from app.api.analytics_async import router as analytics_async_router
+
+        app.include_router(auth_async_router, prefix="/api")
+        app.include_router(tasks_async_router)
+        app.include_router(analytics_async_router)
+    app.include_router(auth_router, prefix="/api")
+    app.include_router(tasks_router)  # у нас уже prefix="/api/tasks"
+    app.include_router(analytics_router)
+
+
+include_routers(app, async_mode=ASYNC_DB)
@@ -0,0 +1,191 @@
+import os
+from datetime import date
+from typing import Counter as TypingCounter, Dict, Iterable, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, select, update
+from app.infra.db import upsert_add
+from app.infra.models import TaskCounterORM, TaskDueCounterORM, TaskORM
+from app.repo.archive import archived_count
+
+# Serve /api/analytics/summary from the materialized counters instead of scanning tasks
+TASK_COUNTERS = os.getenv("TASK_COUNTERS", "1") == "1"
+
+# above this many distinct due dates in one change set the overdue delta is computed in Python
+CASE_MAX_DATES = 16
+
+TaskState = Tuple[str, Optional[date]]  # (status, due_date)
+
+
+def summary_counts(db: Session, user_id: int, today: date) -> Dict[str, int]:
+    # one pass over the user's rows (covered by ix_tasks_user_status_due)
+    overdue = and_(TaskORM.status != "done", TaskORM.due_date.is_not(None), TaskORM.due_date < today)
+    total, done, overdue = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((TaskORM.status == "done", 1), else_=0)), 0),
+            func.coalesce(func.sum(case((overdue, 1), else_=0)), 0),
+        ).where(TaskORM.user_id == user_id)
+    ).one()
+    return {"active": int(total - done - overdue), "done": int(done), "overdue": int(overdue)}
+
+
+def rebuild_counters(db: Session, user_id: int, today: date) -> TaskCounterORM:
+    db.execute(delete(TaskDueCounterORM).where(TaskDueCounterORM.user_id == user_id))
+    rows = db.execute(
+        select(TaskORM.due_date, func.count())
+        .where(TaskORM.user_id == user_id, TaskORM.status != "done", TaskORM.due_date.is_not(None))
+        .group_by(TaskORM.due_date)
+    ).all()
+    db.add_all(TaskDueCounterORM(user_id=user_id, due_date=d, open=n) for d, n in rows)
+
+    counts = summary_counts(db, user_id, today)
+    counter = db.get(TaskCounterORM, user_id) or TaskCounterORM(user_id=user_id)
+    counter.open = counts["active"] + counts["overdue"]
+    counter.done = counts["done"]
+    counter.overdue = counts["overdue"]
+    counter.archived = archived_count(db, user_id)
+    counter.as_of = today
+    db.add(counter)
+    db.flush()
+    return counter
+
+
+# Shift the user's counters from `before` to `after` (None = no task) inside the caller's transaction
+def apply_task_change(db: Session, user_id: int, before: Optional[TaskState], after: Optional[TaskState]) -> None:
+    apply_task_changes(db, user_id, [(before, after)])
+
+
+def apply_task_changes(db: Session, user_id: int, changes: Iterable[Tuple[Optional[TaskState], Optional[TaskState]]]) -> None:
+    # net deltas of a whole batch -> one UPDATE of the counter row + one upsert of the due-date rows
+    if not TASK_COUNTERS:
+        return
+    d_open = d_done = 0
+    d_due: TypingCounter[date] = TypingCounter()
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            status, due = state
+            if status == "done":
+                d_done += sign
+            else:
+                d_open += sign
+                if due is not None:
+                    d_due[due] += sign
+    d_due = TypingCounter({due: n for due, n in d_due.items() if n})
+    if not (d_open or d_done or d_due):
+        return
+
+    values = {}
+    if d_open:
+        values["open"] = TaskCounterORM.open + d_open
+    if d_done:
+        values["done"] = TaskCounterORM.done + d_done
+    if len(d_due) > CASE_MAX_DATES:
+        # big batches (imports): lock the row, split overdue in Python instead of a huge CASE
+        as_of = db.scalar(select(TaskCounterORM.as_of).where(TaskCounterORM.user_id == user_id).with_for_update())
+        if as_of is None:
+            return
+        values["overdue"] = TaskCounterORM.overdue + sum(n for due, n in d_due.items() if due < as_of)
+    elif d_due:
+        # overdue moves by the open tasks due before the row's own as_of: a step function of as_of,
+        # one CASE branch per touched date (latest first, each with the sum of it and all earlier dates)
+        steps, remaining = [], sum(d_due.values())
+        for due in sorted(d_due, reverse=True):
+            steps.append((TaskCounterORM.as_of > due, remaining))
+            remaining -= d_due[due]
+        values["overdue"] = TaskCounterORM.overdue + case(*steps, else_=0)
+    res = db.execute(update(TaskCounterORM).where(TaskCounterORM.user_id == user_id).values(**values))
+    # no counter row yet: it will be built from tasks on the next summary read
+    if res.rowcount and d_due:
+        _bump_due(db, user_id, d_due)
+
+
+def _bump_due(db: Session, user_id: int, d_due: Dict[date, int]) -> None:
+    # one upsert (executemany) for all touched due dates, then drop the rows that reached zero
+    rows = [{"user_id": user_id, "due_date": due, "open": n} for due, n in d_due.items()]
+    upsert_add(db, TaskDueCounterORM, ["user_id", "due_date"], rows)
+    dropped = [due for due, n in d_due.items() if n < 0]
+    if dropped:
+        db.execute(
+            delete(TaskDueCounterORM).where(
+                TaskDueCounterORM.user_id == user_id,
+                TaskDueCounterORM.due_date.in_(dropped),
+                TaskDueCounterORM.open <= 0,
+            )
+        )
+
+
+def counter_summary(db: Session, user_id: int, today: date) -> Dict[str, int]:
+    counter = db.get(TaskCounterORM, user_id)
+    if counter is None:
+        counter = rebuild_counters(db, user_id, today)
+        db.commit()
+    elif counter.as_of != today:
+        # roll overdue forward (or back) by the open tasks due in between -- no task scan
+        lo, hi, sign = (counter.as_of, today, 1) if counter.as_of < today else (today, counter.as_of, -1)
+        shifted = db.scalar(
+            select(func.coalesce(func.sum(TaskDueCounterORM.open), 0)).where(
+                TaskDueCounterORM.user_id == user_id,
+                TaskDueCounterORM.due_date >= lo,
+                TaskDueCounterORM.due_date < hi,
+            )
+        )
+        db.execute(
+            update(TaskCounterORM)
+            .where(TaskCounterORM.user_id == user_id, TaskCounterORM.as_of == counter.as_of)
+            .values(overdue=TaskCounterORM.overdue + sign * shifted, as_of=today)
+        )
+        db.commit()
+        db.refresh(counter)
+    return {"active": counter.open - counter.overdue, "done": counter.done, "overdue": counter.overdue}
+
+
+def estimate_total(db: Session, user_id: int, status: Optional[str] = None) -> Optional[int]:
+    # list total from the counter row, no task scan; todo/in_progress are only counted together,
+    # so either of them gets the open total (an upper bound). None when there is no counter row.
+    if not TASK_COUNTERS:
+        return None
+    row = db.execute(select(TaskCounterORM.open, TaskCounterORM.done).where(TaskCounterORM.user_id == user_id)).first()
+    if row is None:
+        return None
+    if status == "done":
+        return row.done
+    if status:
+        return row.open
+    return row.open + row.done
+
+
+def fresh_counter_summary(db: Session, user_id: int, today: date) -> Optional[Dict[str, int]]:
+    # read-only fast path: the counter row if it exists and is already rolled to today
+    row = db.execute(
+        select(TaskCounterORM.open, TaskCounterORM.done, TaskCounterORM.overdue)
+        .where(TaskCounterORM.user_id == user_id, TaskCounterORM.as_of == today)
+    ).first()
+    if row is None:
+        return None
+    return {"active": row.open - row.overdue, "done": row.done, "overdue": row.overdue}
+
+
+def summary(db: Optional[Session], user_id: int, today: date, read_db: Optional[Session] = None,
+            include_archived: bool = False) -> Optional[Dict[str, int]]:
+    # read_db: served from there when no counter write (build / rollover) is needed;
+    # db None (read_db only): None when it is, for the caller to retry with a write session;
+    # include_archived: done counts tasks_archive too, reported separately as "archived"
+    if TASK_COUNTERS:
+        if read_db is not None and (fresh := fresh_counter_summary(read_db, user_id, today)) is not None:
+            out = fresh
+        elif db is None:
+            return None
+        else:
+            out = counter_summary(db, user_id, today)
+    else:
+        out = summary_counts(read_db or db, user_id, today)
+    if include_archived:
+        reader = read_db or db
+        archived = (
+            reader.scalar(select(TaskCounterORM.archived).where(TaskCounterORM.user_id == user_id))
+            if TASK_COUNTERS else archived_count(reader, user_id)
+        ) or 0
+        out = {**out, "done": out["done"] + archived, "archived": archived}
+    return out
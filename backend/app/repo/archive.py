@@ -0,0 +1,96 @@
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, exists, func, insert, literal, select, union_all, update
+from sqlalchemy.orm import Session, aliased
+
+from app.infra.events import bus
+from app.infra.models import TaskArchiveORM, TaskCounterORM, TaskORM, TaskRecurrenceORM
+from app.repo.changes import bump_version, record_deletes
+
+# Archive tier: done tasks completed more than ARCHIVE_AFTER_DAYS ago move from `tasks` to
+# `tasks_archive` in batches (python -m app.cli archive-tasks), so the hot table and its indexes
+# only hold what the board, calendar and counters actually read. Archived tasks keep their ids
+# (tasks.id is AUTOINCREMENT on SQLite, so a new task never gets one of them);
+# list/export/summary see them with include_archived. The daily rollups are history already and
+# are not touched; the counters move the tasks from `done` to `archived`. Templates of recurring
+# tasks stay: their rule expands from them.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+TASK_COLUMNS = [c.key for c in TaskORM.__table__.columns]
+
+
+def all_tasks():
+    # TaskORM-shaped alias over tasks UNION ALL tasks_archive (user_id filters are pushed into both)
+    hot = select(*(TaskORM.__table__.c[k] for k in TASK_COLUMNS))
+    cold = select(*(TaskArchiveORM.__table__.c[k] for k in TASK_COLUMNS))
+    return aliased(TaskORM, union_all(hot, cold).subquery("tasks_all"), name="tasks_all")
+
+
+def archived_count(db: Session, user_id: int) -> int:
+    return db.scalar(select(func.count()).select_from(TaskArchiveORM).where(TaskArchiveORM.user_id == user_id)) or 0
+
+
+def _move(db: Session, ids: List[int], now: datetime) -> None:
+    cols = [TaskORM.__table__.c[k] for k in TASK_COLUMNS]
+    db.execute(
+        insert(TaskArchiveORM).from_select(
+            TASK_COLUMNS + ["archived_at"], select(*cols, literal(now, TaskArchiveORM.archived_at.type)).where(TaskORM.id.in_(ids))
+        )
+    )
+    db.execute(delete(TaskORM).where(TaskORM.id.in_(ids)))
+
+
+def archive_done_tasks(
+    db: Session,
+    *,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    user_id: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Dict[int, int]:
+    """Move done tasks completed before now - older_than_days to tasks_archive.
+
+    One pass over tasks in id order, one transaction per batch (the write lock is held for one
+    batch at a time). Each affected user gets a version bump and tombstones for the moved ids, so
+    ETags change and change-feed clients drop them. Returns {user_id: tasks archived}.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=older_than_days)
+    moved: Dict[int, int] = defaultdict(int)
+    last_id = 0
+    while True:
+        stmt = (
+            select(TaskORM.id, TaskORM.user_id)
+            .where(TaskORM.id > last_id, TaskORM.status == "done", TaskORM.completed_at < cutoff)
+            .where(~exists().where(TaskRecurrenceORM.task_id == TaskORM.id))
+            .order_by(TaskORM.id)
+            .limit(batch_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(TaskORM.user_id == user_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            db.rollback()
+            break
+        last_id = rows[-1].id
+        by_user: Dict[int, List[int]] = defaultdict(list)
+        for task_id, owner in rows:
+            by_user[owner].append(task_id)
+        _move(db, [r.id for r in rows], now)
+        for owner, ids in by_user.items():
+            db.execute(
+                update(TaskCounterORM).where(TaskCounterORM.user_id == owner)
+                .values(done=TaskCounterORM.done - len(ids), archived=TaskCounterORM.archived + len(ids))
+            )
+            record_deletes(db, owner, ids, bump_version(db, owner))
+            moved[owner] += len(ids)
+        db.commit()
+        for owner in by_user:
+            bus.publish(owner, {"type": "resync"})
+        if len(rows) < batch_size:
+            break
+    return dict(moved)
@@ -0,0 +1,116 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.orm import Session
+from app.infra.db import upsert_insert
+from app.infra.models import TaskORM, TaskTombstoneORM, TaskVersionORM
+
+
+# Per-user change version: bumped in the same transaction as every task write, so a reader
+# can tell "nothing changed since version N" from one primary-key lookup (ETag / 304).
+# The written rows carry the new version in tasks.change_seq (deletes: task_tombstones), which
+# makes the version a monotonic per-user sequence for the change feed: the bump locks the
+# user's version row until commit, so versions commit in order.
+
+class InvalidToken(ValueError):
+    pass
+
+
+def bump_version(db: Session, user_id: int) -> int:
+    insert = upsert_insert(db)
+    if insert is not None:
+        stmt = insert(TaskVersionORM).values(user_id=user_id, version=1)
+        return db.scalar(
+            stmt.on_conflict_do_update(index_elements=["user_id"], set_={"version": TaskVersionORM.version + 1})
+            .returning(TaskVersionORM.version)
+        )
+    res = db.execute(
+        update(TaskVersionORM).where(TaskVersionORM.user_id == user_id).values(version=TaskVersionORM.version + 1)
+    )
+    if not res.rowcount:
+        db.add(TaskVersionORM(user_id=user_id, version=1))
+        db.flush()
+    return current_version(db, user_id)
+
+
+def current_version(db: Session, user_id: int) -> int:
+    return db.scalar(select(TaskVersionORM.version).where(TaskVersionORM.user_id == user_id)) or 0
+
+
+def record_deletes(db: Session, user_id: int, task_ids: Iterable[int], seq: int) -> None:
+    now = datetime.now(timezone.utc)
+    rows = [{"task_id": task_id, "user_id": user_id, "change_seq": seq, "deleted_at": now} for task_id in task_ids]
+    if not rows:
+        return
+    insert = upsert_insert(db)
+    if insert is None:
+        for row in rows:
+            db.merge(TaskTombstoneORM(**row))
+        db.flush()
+        return
+    # the same id deleted again by its user (an archived task, an id from before AUTOINCREMENT):
+    # the tombstone moves to the new version
+    stmt = insert(TaskTombstoneORM)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "task_id"],
+            set_={"change_seq": stmt.excluded.change_seq, "deleted_at": stmt.excluded.deleted_at},
+        ),
+        rows,
+    )
+
+
+# sync token: opaque base64url of (change_seq, id) of the last change handed out
+def encode_token(seq: int, last_id: int) -> str:
+    raw = json.dumps([seq, last_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: Optional[str]) -> Tuple[int, int]:
+    if not token:
+        return 0, 0
+    try:
+        seq, last_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if not (isinstance(seq, int) and isinstance(last_id, int)):
+            raise InvalidToken(token)
+    except InvalidToken:
+        raise
+    except Exception:
+        raise InvalidToken(token)
+    return seq, last_id
+
+
+def list_changes(db: Session, user_id: int, since: Optional[str], limit: int = 500):
+    # tasks written and tasks deleted after `since`, in (change_seq, id) order; both sides are
+    # keyset scans of a (user_id, change_seq, id) index
+    seq, last_id = decode_token(since)
+    changed = db.scalars(
+        select(TaskORM)
+        .where(TaskORM.user_id == user_id, tuple_(TaskORM.change_seq, TaskORM.id) > (seq, last_id))
+        .order_by(TaskORM.change_seq, TaskORM.id)
+        .limit(limit + 1)
+    ).all()
+    deleted = db.execute(
+        select(TaskTombstoneORM.change_seq, TaskTombstoneORM.task_id)
+        .where(
+            TaskTombstoneORM.user_id == user_id,
+            tuple_(TaskTombstoneORM.change_seq, TaskTombstoneORM.task_id) > (seq, last_id),
+        )
+        .order_by(TaskTombstoneORM.change_seq, TaskTombstoneORM.task_id)
+        .limit(limit + 1)
+    ).all()
+
+    merged: List[Tuple[int, int, object]] = sorted(
+        [(t.change_seq, t.id, t) for t in changed] + [(s, i, None) for s, i in deleted],
+        key=lambda c: (c[0], c[1]),
+    )
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+    if merged:
+        seq, last_id = merged[-1][0], merged[-1][1]
+    items = [task for _, _, task in merged if task is not None]
+    deleted_ids = [task_id for _, task_id, task in merged if task is None]
+    return items, deleted_ids, encode_token(seq, last_id), has_more
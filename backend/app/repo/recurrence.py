@@ -0,0 +1,197 @@
+import json
+from collections import Counter
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, delete, func, or_, select, union_all, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.domain.recurrence import Rule, check_start, last_occurrence, occurrences, parse_rrule, to_rrule
+from app.infra.events import bus
+from app.infra.models import TaskArchiveORM, TaskORM, TaskRecurrenceORM
+from app.repo.changes import bump_version
+
+# Recurring tasks. A rule (task_recurrences) hangs off a task with a due date, the template; the
+# template is the first occurrence. The other occurrences are not stored: a range query (calendar,
+# /api/tasks/occurrences, /api/analytics/due) expands the user's rules for that range only, and an
+# occurrence becomes a `tasks` row (recurrence_id, occurrence_date) the first time it is changed
+# (app/repo/tasks.py: update_occurrence). Deleted or skipped occurrences go to the rule's exdates.
+# The series is anchored at dtstart, the template's due date when the rule was set: moving the
+# template later does not move the series (PUT the rule again for that).
+# Rule changes bump the user's version (ETags) and send "resync" to the event streams.
+
+
+class NoDueDate(ValueError):
+    pass
+
+
+class NotAnOccurrence(ValueError):
+    pass
+
+
+# stored rules are short immutable strings, parsed once per process
+cached_rule = lru_cache(maxsize=4096)(parse_rrule)
+
+
+def exdates(raw: Optional[str]) -> Set[date]:
+    return {date.fromisoformat(d) for d in json.loads(raw)} if raw else set()
+
+
+def get_rule(db: Session, user_id: int, task_id: int) -> Optional[TaskRecurrenceORM]:
+    return db.scalar(
+        select(TaskRecurrenceORM).where(TaskRecurrenceORM.task_id == task_id, TaskRecurrenceORM.user_id == user_id)
+    )
+
+
+def _changed(db: Session, user_id: int) -> None:
+    bump_version(db, user_id)
+    db.commit()
+    bus.publish(user_id, {"type": "resync"})
+
+
+def set_rule(db: Session, user_id: int, task_id: int, rule: Rule) -> Optional[TaskRecurrenceORM]:
+    # None: no such task; NoDueDate: the template needs a due date to anchor the series;
+    # InvalidRule: no date after the due date matches the rule
+    task = db.execute(select(TaskORM.due_date).where(TaskORM.id == task_id, TaskORM.user_id == user_id)).first()
+    if task is None:
+        return None
+    if task.due_date is None:
+        raise NoDueDate(task_id)
+    check_start(rule, task.due_date)
+    rec = get_rule(db, user_id, task_id)
+    if rec is None:
+        rec = TaskRecurrenceORM(user_id=user_id, task_id=task_id)
+        db.add(rec)
+    rec.rrule = to_rrule(rule)
+    rec.dtstart = task.due_date
+    rec.ends_on = last_occurrence(rule, task.due_date)
+    _changed(db, user_id)
+    return rec
+
+
+def _detach(db: Session, rule_ids: List[int]) -> None:
+    # materialized occurrences of deleted rules stay, as ordinary tasks. The rule id may be given
+    # to a new rule: left behind, the links would hide its dates (materialized) and point its
+    # occurrence updates at these rows
+    if not rule_ids:
+        return
+    for T in (TaskORM, TaskArchiveORM):
+        db.execute(update(T).where(T.recurrence_id.in_(rule_ids)).values(recurrence_id=None, occurrence_date=None))
+
+
+def delete_rule(db: Session, user_id: int, task_id: int) -> bool:
+    deleted = db.execute(
+        delete(TaskRecurrenceORM)
+        .where(TaskRecurrenceORM.task_id == task_id, TaskRecurrenceORM.user_id == user_id)
+        .returning(TaskRecurrenceORM.id)
+    ).first()
+    if deleted is None:
+        return False
+    _detach(db, [deleted.id])
+    _changed(db, user_id)
+    return True
+
+
+def is_occurrence(rec: TaskRecurrenceORM, on: date) -> bool:
+    if on in exdates(rec.exdates):
+        return False
+    return any(True for _ in occurrences(cached_rule(rec.rrule), rec.dtstart, on, on, rec.ends_on))
+
+
+def add_exdates(db: Session, slots: Iterable[Tuple[int, date]]) -> None:
+    # (recurrence_id, date): occurrences that must not be generated again (no commit)
+    by_rule: Dict[int, Set[date]] = {}
+    for recurrence_id, on in slots:
+        by_rule.setdefault(recurrence_id, set()).add(on)
+    if not by_rule:
+        return
+    rows = db.execute(
+        select(TaskRecurrenceORM.id, TaskRecurrenceORM.exdates).where(TaskRecurrenceORM.id.in_(by_rule))
+    ).all()
+    for rid, raw in rows:
+        dates = exdates(raw) | by_rule[rid]
+        db.execute(
+            update(TaskRecurrenceORM).where(TaskRecurrenceORM.id == rid)
+            .values(exdates=json.dumps(sorted(d.isoformat() for d in dates)))
+        )
+
+
+def delete_rules_of(db: Session, task_ids: Iterable[int]) -> None:
+    # the template is gone (no commit). No FK enforcement on SQLite: the rule must not stay behind
+    deleted = db.scalars(
+        delete(TaskRecurrenceORM).where(TaskRecurrenceORM.task_id.in_(list(task_ids))).returning(TaskRecurrenceORM.id)
+    ).all()
+    _detach(db, list(deleted))
+
+
+def materialized(db: Session, rule_ids: List[int], date_from: date, date_to: date) -> Set[Tuple[int, date]]:
+    # occurrence slots in the range that are rows already, hot or archived (ux_tasks_recurrence_occurrence)
+    if not rule_ids:
+        return set()
+    stmts = [
+        select(T.recurrence_id, T.occurrence_date).where(
+            T.recurrence_id.in_(rule_ids), T.occurrence_date >= date_from, T.occurrence_date <= date_to
+        )
+        for T in (TaskORM, TaskArchiveORM)
+    ]
+    return {(rid, on) for rid, on in db.execute(union_all(*stmts)).all()}
+
+
+def series(db: Session, user_id: int, date_from: date, date_to: date) -> List[Tuple[Row, List[date]]]:
+    # (rule joined to its template, virtual occurrence dates in the range) per rule alive in the range
+    R = TaskRecurrenceORM
+    rules = db.execute(
+        select(R.id, R.task_id, R.rrule, R.dtstart, R.ends_on, R.exdates, TaskORM.title, TaskORM.description, TaskORM.priority)
+        .join(TaskORM, TaskORM.id == R.task_id)
+        .where(R.user_id == user_id, R.dtstart <= date_to, or_(R.ends_on.is_(None), R.ends_on >= date_from))
+    ).all()
+    if not rules:
+        return []
+    taken: Dict[int, Set[date]] = {}
+    for rid, on in materialized(db, [r.id for r in rules], date_from, date_to):
+        taken.setdefault(rid, set()).add(on)
+    out = []
+    for r in rules:
+        skip = exdates(r.exdates) | taken.get(r.id, set())
+        skip.add(r.dtstart)
+        dates = [on for on in occurrences(cached_rule(r.rrule), r.dtstart, date_from, date_to, r.ends_on) if on not in skip]
+        if dates:
+            out.append((r, dates))
+    return out
+
+
+def expand(db: Session, user_id: int, date_from: date, date_to: date) -> List[Dict]:
+    """Virtual occurrences due in [date_from, date_to], by (due_date, template_id).
+
+    Two queries whatever the range: the rules alive in the range joined to their templates, and
+    the slots already materialized. Each rule is expanded for the range only (app/domain/recurrence.py).
+    Returns dicts shaped like a task: id None, template_id, title, description, priority,
+    status "todo", due_date.
+    """
+    out: List[Dict] = []
+    for r, dates in series(db, user_id, date_from, date_to):
+        base = {
+            "id": None, "template_id": r.task_id, "title": r.title, "description": r.description,
+            "priority": r.priority, "status": "todo",
+        }
+        out += [{**base, "due_date": on} for on in dates]
+    out.sort(key=lambda o: (o["due_date"], o["template_id"]))
+    return out
+
+
+def due_load(db: Session, user_id: int, date_from: date, date_to: date) -> List[Dict]:
+    # planned work per due day: tasks (one grouped range scan) + virtual occurrences, which are open
+    rows = db.execute(
+        select(TaskORM.due_date, func.count(), func.sum(case((TaskORM.status == "done", 1), else_=0)))
+        .where(TaskORM.user_id == user_id, TaskORM.due_date >= date_from, TaskORM.due_date <= date_to)
+        .group_by(TaskORM.due_date)
+    ).all()
+    days = {d: {"date": d, "open": n - done, "done": done, "recurring": 0} for d, n, done in rows}
+    recurring = Counter(on for _, dates in series(db, user_id, date_from, date_to) for on in dates)
+    for on, n in recurring.items():
+        day = days.setdefault(on, {"date": on, "open": 0, "done": 0, "recurring": 0})
+        day["open"] += n
+        day["recurring"] += n
+    return [days[d] for d in sorted(days)]
@@ -0,0 +1,99 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.infra.db import upsert_insert
+from app.infra.models import ReminderOutboxORM, SchedulerLeaseORM, TaskORM
+from app.repo.analytics import TASK_COUNTERS, counter_summary
+
+
+# DB side of the reminder scheduler (app/infra/scheduler.py): lease, batched scans of the tasks
+# due on one day, outbox writes. Everything here is synchronous and commits its own work; the
+# scheduler calls it from a worker thread.
+
+
+def acquire_lease(db: Session, name: str, owner: str, ttl: timedelta, now: datetime) -> Optional[SchedulerLeaseORM]:
+    """Take or renew the lease `name` for `owner` until now + ttl.
+
+    One conditional UPDATE (held by us, or expired); the first worker ever inserts the row.
+    Returns the lease row (with fired_until) when we hold it, None when another worker does.
+    """
+    L = SchedulerLeaseORM
+    res = db.execute(
+        update(L).where(L.name == name, or_(L.owner == owner, L.expires_at < now)).values(owner=owner, expires_at=now + ttl)
+    )
+    if not res.rowcount:
+        if db.get(L, name) is not None:
+            db.rollback()
+            return None
+        try:
+            db.execute(insert(L).values(name=name, owner=owner, expires_at=now + ttl))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+    else:
+        db.commit()
+    return db.get(L, name)
+
+
+def release_lease(db: Session, name: str, owner: str) -> None:
+    # let the next worker take over now instead of after the ttl (shutdown)
+    L = SchedulerLeaseORM
+    db.execute(update(L).where(L.name == name, L.owner == owner).values(expires_at=datetime(1970, 1, 1, tzinfo=timezone.utc)))
+    db.commit()
+
+
+def save_progress(db: Session, name: str, owner: str, fired_until: datetime) -> bool:
+    # False: the lease has moved to another worker, which continues from its own progress
+    L = SchedulerLeaseORM
+    res = db.execute(update(L).where(L.name == name, L.owner == owner).values(fired_until=fired_until))
+    db.commit()
+    return bool(res.rowcount)
+
+
+def open_tasks_due(db: Session, due: date, after_id: int = 0, limit: int = 1000) -> List[Row]:
+    # one batch of open tasks due on `due`, keyset on id: a range of ix_tasks_due_date (its entries
+    # end with the rowid), so each batch costs its own rows whatever the size of the table
+    return db.execute(
+        select(TaskORM.id, TaskORM.user_id, TaskORM.title, TaskORM.due_date)
+        .where(TaskORM.due_date == due, TaskORM.id > after_id, TaskORM.status != "done")
+        .order_by(TaskORM.id)
+        .limit(limit)
+    ).all()
+
+
+def write_outbox(db: Session, reminders: List[Dict], now: datetime) -> None:
+    # reminders as built by the scheduler; duplicates of (task_id, kind, due_date) are ignored
+    rows = [
+        {"user_id": r["user_id"], "task_id": r["task_id"], "kind": r["kind"], "due_date": date.fromisoformat(r["due_date"]),
+         "payload": json.dumps(r, ensure_ascii=False, separators=(",", ":")), "created_at": now}
+        for r in reminders
+    ]
+    if not rows:
+        return
+    insert = upsert_insert(db)
+    if insert is not None:
+        db.execute(insert(ReminderOutboxORM).on_conflict_do_nothing(), rows)
+    else:
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.add(ReminderOutboxORM(**row))
+            except IntegrityError:
+                pass
+    db.commit()
+
+
+def roll_counters(db: Session, user_ids: Iterable[int], today: date) -> None:
+    # overdue sweep: move the users' summary counters to today now, so the first summary read of
+    # the day takes the read-only path instead of rolling them under the write lock
+    if not TASK_COUNTERS:
+        return
+    for user_id in user_ids:
+        counter_summary(db, user_id, today)
@@ -1,30 +1,166 @@
-from typing import Optional, Tuple, List
+import base64
+import json
+import os
+from typing import Dict, Iterable, Optional, Sequence, Tuple, List
 from datetime import date, datetime, timezone
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select, or_, asc, desc
-from app.infra.models import TaskORM
+from sqlalchemy import func, select, insert, update, delete, case, or_, and_, asc, desc, tuple_
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from app.infra.models import TaskORM, TaskRecurrenceORM
+from app.schemas.tasks import TaskCreate, TaskRead, error_message
+from app.infra.events import bus
+from app.infra.search import LikeSearch, get_search_backend
+from app.repo.analytics import apply_task_change, apply_task_changes, estimate_total
+from app.repo import recurrence
+from app.repo.archive import all_tasks
+from app.repo.changes import bump_version, record_deletes
+from app.repo.timeseries import apply_daily_changes
 
 
-def create_task(db: Session, user_id: int, data) -> TaskORM:
-    now = datetime.now(timezone.utc)
-    task = TaskORM(
+# import: rows per INSERT batch / commit, rejected rows listed in the report
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+# calendar: widest range per request, tasks returned per day (the rest is only counted)
+CALENDAR_MAX_DAYS = int(os.getenv("CALENDAR_MAX_DAYS", "62"))
+CALENDAR_PER_DAY = int(os.getenv("CALENDAR_PER_DAY", "10"))
+
+PRIORITY_WEIGHT = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+
+
+def _emit(user_id: int, kind: str, tasks=(), deleted=(), seq: Optional[int] = None) -> None:
+    # after commit: push to the user's open event streams (nothing to build when nobody listens)
+    if not bus.has_subscribers(user_id):
+        return
+    for task in tasks:
+        bus.publish(user_id, {
+            "type": kind, "seq": task.change_seq, "task": TaskRead.model_validate(task).model_dump(mode="json"),
+        })
+    for task_id in deleted:
+        bus.publish(user_id, {"type": "deleted", "seq": seq, "id": task_id})
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def encode_cursor(sort: Optional[str], task: TaskORM) -> str:
+    # opaque token: (sort, value of sort column, id) of the last row on the page
+    if sort == "due_date":
+        value = task.due_date.isoformat() if task.due_date else None
+    else:
+        sort, value = "created_at", task.created_at.isoformat()
+    raw = json.dumps([sort, value, task.id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: Optional[str]) -> Tuple[Optional[object], int]:
+    sort = "due_date" if sort == "due_date" else "created_at"
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cur_sort, value, last_id = json.loads(raw)
+        if cur_sort != sort or not isinstance(last_id, int):
+            raise InvalidCursor(token)
+        if value is not None:
+            value = date.fromisoformat(value) if sort == "due_date" else datetime.fromisoformat(value)
+        elif sort != "due_date":
+            raise InvalidCursor(token)
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor(token)
+    return value, last_id
+
+
+# columns of TaskRead, in output order (list page, export): plain rows, no ORM objects
+EXPORT_COLUMNS = (
+    TaskORM.id, TaskORM.title, TaskORM.description, TaskORM.due_date, TaskORM.priority,
+    TaskORM.status, TaskORM.created_at, TaskORM.updated_at, TaskORM.completed_at,
+)
+TASK_FIELDS = tuple(c.key for c in EXPORT_COLUMNS)
+# what writes hand back (RETURNING): TaskRead + change_seq for the event stream. Rows, not
+# entities: nothing for commit to expire, so no refresh SELECT afterwards
+RETURNING_COLUMNS = EXPORT_COLUMNS + (TaskORM.change_seq,)
+
+
+def _insert_task(db: Session, user_id: int, now: datetime, **values) -> Row:
+    # INSERT ... RETURNING + counters and daily stats, no commit
+    task = db.execute(insert(TaskORM).values(
         user_id=user_id,
+        status="todo",
+        created_at=now,          # <-- добавили
+        updated_at=now,          # <-- добавили
+        change_seq=bump_version(db, user_id),
+        **values,
+    ).returning(*RETURNING_COLUMNS)).one()
+    apply_task_change(db, user_id, None, (task.status, task.due_date))
+    apply_daily_changes(db, user_id, [(None, task.status, now)], now)
+    return task
+
+
+def create_task(db: Session, user_id: int, data) -> Row:
+    task = _insert_task(
+        db, user_id, datetime.now(timezone.utc),
         title=data.title,
         description=data.description,
         due_date=data.due_date,
         priority=data.priority or "medium",
-        status="todo",
-        created_at=now,          # <-- добавили
-        updated_at=now,          # <-- добавили
     )
-    db.add(task)
     db.commit()
-    db.refresh(task)
+    _emit(user_id, "created", [task])
     return task
 
 
-def get_task(db: Session, user_id: int, task_id: int) -> Optional[TaskORM]:
-    return db.get(TaskORM, task_id) if (t:=db.get(TaskORM, task_id)) and t.user_id==user_id else None
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    # ?fields=title,status -> ("title", "status"); None = all of TaskRead
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in TASK_FIELDS]
+    if unknown or not fields:
+        raise InvalidFields(", ".join(unknown))
+    return fields
+
+
+def get_task(db: Session, user_id: int, task_id: int) -> Optional[Row]:
+    # one query, owner in the WHERE clause, TaskRead columns only
+    return db.execute(select(*EXPORT_COLUMNS).where(TaskORM.id == task_id, TaskORM.user_id == user_id)).first()
+
+
+def _filtered(db: Session, stmt, user_id: int, *, status=None, priority=None, q=None,
+              due_from: Optional[date] = None, due_to: Optional[date] = None, T=TaskORM):
+    # shared by list_tasks and iter_tasks: same filters, same search backend.
+    # T: TaskORM, or all_tasks() with the archive; the search index only covers `tasks`, so
+    # searching the archive too is a LIKE scan
+    stmt = stmt.where(T.user_id == user_id)
+    if status:
+        stmt = stmt.where(T.status == status)
+    if priority:
+        stmt = stmt.where(T.priority == priority)
+    rank = None
+    if q:
+        stmt, rank = get_search_backend(db).apply(stmt, q) if T is TaskORM else LikeSearch().apply(stmt, q, T)
+    if due_from:
+        stmt = stmt.where(T.due_date >= due_from)
+    if due_to:
+        stmt = stmt.where(T.due_date <= due_to)
+    return stmt, rank
+
+
+def _order_clause(sort: Optional[str], rank, T=TaskORM):
+    # Sorting: default created_at desc; when 'due_date' use ascending (NULLs first);
+    # 'relevance' ranks search hits best-first (offset paging only).
+    # id is the tie-breaker so the order is total and a cursor can resume from it.
+    if sort == 'due_date':
+        return (asc(T.due_date).nulls_first(), asc(T.id))
+    if sort == 'relevance' and rank is not None:
+        return (asc(rank), desc(T.created_at), desc(T.id))
+    return (desc(T.created_at), desc(T.id))
 
 
 def list_tasks(
@@ -39,58 +175,368 @@ def list_tasks(
     sort: Optional[str] = None,
     page: int = 1,
     page_size: int = 20,
-) -> Tuple[List[TaskORM], int]:
-    stmt = select(TaskORM).where(TaskORM.user_id == user_id)
-    if status:
-        stmt = stmt.where(TaskORM.status == status)
-    if priority:
-        stmt = stmt.where(TaskORM.priority == priority)
-    if q:
-        qv = f"%{q.lower()}%"
-        stmt = stmt.where(
-            or_(
-                func.lower(TaskORM.title).like(qv),
-                func.lower(TaskORM.description).like(qv),
-            )
-        )
-    if due_from:
-        stmt = stmt.where(TaskORM.due_date >= due_from)
-    if due_to:
-        stmt = stmt.where(TaskORM.due_date <= due_to)
+    cursor: Optional[str] = None,
+    with_total: str = "exact",
+    fields: Optional[Sequence[str]] = None,
+    include_archived: bool = False,
+) -> Tuple[List[Row], Optional[int], bool]:
+    # rows of EXPORT_COLUMNS (attribute access like TaskORM, but no identity map / validation);
+    # fields narrows the SELECT to those columns plus id and the sort key the cursor needs
+    # (the board skips description, the one Text column);
+    # with_total: exact = COUNT(*) over the filters, estimate = from the per-user counters when the
+    # filters allow it (status only; exact otherwise), none = no count at all (total is None);
+    # include_archived reads tasks + tasks_archive (no index across the two: sorts the user's rows)
+    T = all_tasks() if include_archived else TaskORM
+    columns = [getattr(T, c.key) for c in EXPORT_COLUMNS]
+    if fields:
+        wanted = {*fields, "id", "due_date" if sort == "due_date" else "created_at"}
+        columns = [c for c in columns if c.key in wanted]
+    stmt, rank = _filtered(
+        db, select(*columns), user_id,
+        status=status, priority=priority, q=q, due_from=due_from, due_to=due_to, T=T,
+    )
 
-    total = db.execute(stmt.with_only_columns(func.count())).scalar_one()
+    total = None
+    if with_total == "estimate" and not (priority or q or due_from or due_to or include_archived):
+        total = estimate_total(db, user_id, status)
+    if with_total != "none" and total is None:
+        total = db.execute(stmt.with_only_columns(func.count())).scalar_one()
+    stmt = stmt.order_by(*_order_clause(sort, rank, T))
 
-    # Sorting: default created_at desc; when 'due_date' use ascending
-    if sort == 'due_date':
-        order_clause = asc(TaskORM.due_date)
+    if cursor and sort == 'relevance':
+        raise InvalidCursor(cursor)
+    if cursor:
+        # keyset: seek past the last row instead of scanning and dropping OFFSET rows
+        value, last_id = decode_cursor(cursor, sort)
+        if sort != 'due_date':
+            stmt = stmt.where(tuple_(T.created_at, T.id) < (value, last_id))
+        elif value is None:
+            stmt = stmt.where(
+                or_(
+                    and_(T.due_date.is_(None), T.id > last_id),
+                    T.due_date.is_not(None),
+                )
+            )
+        else:
+            stmt = stmt.where(tuple_(T.due_date, T.id) > (value, last_id))
     else:
-        order_clause = desc(TaskORM.created_at)
+        stmt = stmt.offset((page - 1) * page_size)
 
-    items = (
-        db.execute(
-            stmt.order_by(order_clause).offset((page - 1) * page_size).limit(page_size)
-        )
-        .scalars()
-        .all()
-    )
-    return items, total
+    # one row past the page tells whether there is a next page, no count needed
+    items = db.execute(stmt.limit(page_size + 1)).all()
+    return items[:page_size], total, len(items) > page_size
 
 
-def update_task(db: Session, user_id:int, task_id:int, data) -> Optional[TaskORM]:
-    task = db.get(TaskORM, task_id)
-    if not task or task.user_id != user_id: return None
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(task, field, value)
-        if field=="status" and value=="done":
-            task.completed_at = datetime.now(timezone.utc)
-    db.commit(); db.refresh(task)
+def iter_tasks(db: Session, user_id: int, *, sort: Optional[str] = None, batch_size: int = 1000,
+               include_archived: bool = False, **filters):
+    # plain rows (no ORM objects, no identity map) fetched batch_size at a time through a
+    # server-side cursor where the driver has one: memory stays flat whatever the row count
+    T = all_tasks() if include_archived else TaskORM
+    stmt, rank = _filtered(db, select(*(getattr(T, c.key) for c in EXPORT_COLUMNS)), user_id, T=T, **filters)
+    stmt = stmt.order_by(*_order_clause(sort, rank, T)).execution_options(yield_per=batch_size)
+    for partition in db.execute(stmt).partitions():
+        yield from partition
+
+
+def update_task(db: Session, user_id:int, task_id:int, data) -> Optional[Row]:
+    # one UPDATE ... RETURNING scoped by user_id. Only a status/due_date change reads the old
+    # values first (counters and daily stats need them): three columns, locked, no entity.
+    values = data.model_dump(exclude_unset=True)
+    scope = (TaskORM.id == task_id, TaskORM.user_id == user_id)
+    before = None
+    if "status" in values or "due_date" in values:
+        before = db.execute(
+            select(TaskORM.status, TaskORM.due_date, TaskORM.created_at).where(*scope).with_for_update()
+        ).first()
+        if before is None:
+            return None
+    now = datetime.now(timezone.utc)
+    if values.get("status") == "done" and before.status != "done":
+        values["completed_at"] = now
+    values.update(updated_at=now, change_seq=bump_version(db, user_id))
+    task = db.execute(update(TaskORM).where(*scope).values(**values).returning(*RETURNING_COLUMNS)).first()
+    if task is None:
+        db.rollback()
+        return None
+    if before is not None:
+        apply_task_change(db, user_id, (before.status, before.due_date), (task.status, task.due_date))
+        apply_daily_changes(db, user_id, [(before.status, task.status, before.created_at)], now)
+    db.commit()
+    _emit(user_id, "updated", [task])
     return task
 
 
 def delete_task(db: Session, user_id:int, task_id:int) -> bool:
-    task = db.get(TaskORM, task_id)
-    if not task or task.user_id != user_id: return False
-    db.delete(task); db.commit()
+    task = db.execute(
+        delete(TaskORM).where(TaskORM.id == task_id, TaskORM.user_id == user_id)
+        .returning(TaskORM.status, TaskORM.due_date, TaskORM.created_at, TaskORM.recurrence_id, TaskORM.occurrence_date)
+    ).first()
+    if task is None:
+        return False
+    _forget_recurrences(db, [(task_id, task.recurrence_id, task.occurrence_date)])
+    apply_task_change(db, user_id, (task.status, task.due_date), None)
+    apply_daily_changes(db, user_id, [(task.status, None, task.created_at)])
+    seq = bump_version(db, user_id)
+    record_deletes(db, user_id, [task_id], seq)
+    db.commit()
+    _emit(user_id, "deleted", deleted=[task_id], seq=seq)
     return True
 
 
+def _forget_recurrences(db: Session, deleted: List[Tuple[int, Optional[int], Optional[date]]]) -> None:
+    # deleted (id, recurrence_id, occurrence_date): templates take their rule along, deleted
+    # occurrences must not be generated again
+    recurrence.delete_rules_of(db, [task_id for task_id, _, _ in deleted])
+    recurrence.add_exdates(db, [(rid, on) for _, rid, on in deleted if rid is not None])
+
+
+def update_occurrence(db: Session, user_id: int, task_id: int, on: date, data) -> Optional[Row]:
+    """Apply a TaskUpdate to the occurrence of task_id's series due on `on`.
+
+    The first change materializes it: a `tasks` row copied from the template (title, description,
+    priority), due on `on`, written in the same transaction as the update. The template's own
+    date is the template. None: no such task/rule; NotAnOccurrence: the rule doesn't produce `on`.
+    """
+    rec = recurrence.get_rule(db, user_id, task_id)
+    if rec is None:
+        return None
+    if on == rec.dtstart:
+        return update_task(db, user_id, task_id, data)
+    target = db.scalar(select(TaskORM.id).where(TaskORM.recurrence_id == rec.id, TaskORM.occurrence_date == on))
+    if target is None:
+        if not recurrence.is_occurrence(rec, on) or recurrence.materialized(db, [rec.id], on, on):
+            raise recurrence.NotAnOccurrence(on)
+        template = db.execute(
+            select(TaskORM.title, TaskORM.description, TaskORM.priority).where(TaskORM.id == task_id)
+        ).one()
+        try:
+            target = _insert_task(
+                db, user_id, datetime.now(timezone.utc),
+                title=template.title, description=template.description, priority=template.priority,
+                due_date=on, recurrence_id=rec.id, occurrence_date=on,
+            ).id
+        except IntegrityError:
+            # materialized concurrently (ux_tasks_recurrence_occurrence): update that row
+            db.rollback()
+            return update_occurrence(db, user_id, task_id, on, data)
+    return update_task(db, user_id, target, data)
+
+
+def skip_occurrence(db: Session, user_id: int, task_id: int, on: date) -> bool:
+    # delete one occurrence: exdate, and the row if it was materialized. The template's own date
+    # is the template (DELETE /api/tasks/{id} removes it and the series)
+    rec = recurrence.get_rule(db, user_id, task_id)
+    if rec is None or on == rec.dtstart or not recurrence.is_occurrence(rec, on):
+        return False
+    target = db.scalar(select(TaskORM.id).where(TaskORM.recurrence_id == rec.id, TaskORM.occurrence_date == on))
+    if target is not None:
+        return delete_task(db, user_id, target)
+    recurrence.add_exdates(db, [(rec.id, on)])
+    bump_version(db, user_id)
+    db.commit()
+    return True
+
+
+def calendar_tasks(
+    db: Session, user_id: int, date_from: date, date_to: date, *,
+    per_day: int = CALENDAR_PER_DAY, include_done: bool = True,
+) -> List[Dict]:
+    """Tasks due in [date_from, date_to] bucketed by day, most urgent first.
+
+    One range scan on ix_tasks_user_due; window functions number and count the rows per day,
+    so only the first per_day of each day leave the database, the rest is just a count.
+    Returns [{"date", "items", "total", "more"}] for days that have tasks. Occurrences of
+    recurring tasks that are not rows yet are merged in (id None, template_id set).
+    """
+    weight = case(PRIORITY_WEIGHT, value=TaskORM.priority, else_=len(PRIORITY_WEIGHT))
+    stmt = select(
+        TaskORM.id, TaskORM.title, TaskORM.priority, TaskORM.status, TaskORM.due_date,
+        func.row_number().over(partition_by=TaskORM.due_date, order_by=(weight, TaskORM.id)).label("rn"),
+        func.count().over(partition_by=TaskORM.due_date).label("n"),
+    ).where(TaskORM.user_id == user_id, TaskORM.due_date >= date_from, TaskORM.due_date <= date_to)
+    if not include_done:
+        stmt = stmt.where(TaskORM.status != "done")
+    ranked = stmt.subquery()
+    rows = db.execute(
+        select(ranked).where(ranked.c.rn <= per_day).order_by(ranked.c.due_date, ranked.c.rn)
+    ).all()
+
+    days: List[Dict] = []
+    for row in rows:
+        if not days or days[-1]["date"] != row.due_date:
+            days.append({"date": row.due_date, "items": [], "total": row.n, "more": max(0, row.n - per_day)})
+        days[-1]["items"].append({"id": row.id, "title": row.title, "priority": row.priority, "status": row.status})
+    virtual = recurrence.series(db, user_id, date_from, date_to)
+    if not virtual:
+        return days
+    by_day = {day["date"]: day for day in days}
+    # per day: rows (already ranked) + (weight, template_id, rule) for every occurrence; only the
+    # first per_day of the merge become items
+    ranked = {day["date"]: [(PRIORITY_WEIGHT.get(t["priority"], 4), False, t["id"], t) for t in day["items"]] for day in days}
+    for r, dates in virtual:
+        weight = PRIORITY_WEIGHT.get(r.priority, 4)
+        for on in dates:
+            if on not in by_day:
+                by_day[on] = {"date": on, "items": [], "total": 0, "more": 0}
+                ranked[on] = []
+            by_day[on]["total"] += 1
+            ranked[on].append((weight, True, r.task_id, r))
+    for on, day in by_day.items():
+        # same order as the window function: most urgent first, rows before occurrences
+        top = sorted(ranked[on], key=lambda c: c[:3])[:per_day]
+        day["items"] = [
+            {"id": None, "template_id": key, "title": item.title, "priority": item.priority, "status": "todo"}
+            if virtual_item else item
+            for _, virtual_item, key, item in top
+        ]
+        day["more"] = day["total"] - len(day["items"])
+    return [by_day[d] for d in sorted(by_day)]
+
+
+def occurrence_list(db: Session, user_id: int, date_from: date, date_to: date, *, include_done: bool = True) -> List[Dict]:
+    # tasks due in [date_from, date_to] plus the virtual occurrences, by (due_date, id/template_id);
+    # template_id: the series a row or an occurrence belongs to
+    R = TaskRecurrenceORM
+    stmt = (
+        select(TaskORM.id, R.task_id.label("template_id"), TaskORM.title, TaskORM.description,
+               TaskORM.due_date, TaskORM.priority, TaskORM.status)
+        .outerjoin(R, R.id == TaskORM.recurrence_id)
+        .where(TaskORM.user_id == user_id, TaskORM.due_date >= date_from, TaskORM.due_date <= date_to)
+    )
+    if not include_done:
+        stmt = stmt.where(TaskORM.status != "done")
+    items = [{**row._mapping, "virtual": False} for row in db.execute(stmt).all()]
+    items += [{**occ, "virtual": True} for occ in recurrence.expand(db, user_id, date_from, date_to)]
+    items.sort(key=lambda t: (t["due_date"], t["id"] is None, t["id"] or t["template_id"]))
+    return items
+
+
+# --- bulk: one set-based statement + one commit per batch ---
+
+def bulk_create_tasks(db: Session, user_id: int, items: List) -> List[Row]:
+    if not items:
+        return []
+    now = datetime.now(timezone.utc)
+    seq = bump_version(db, user_id)
+    rows = [
+        dict(
+            user_id=user_id,
+            title=data.title,
+            description=data.description,
+            due_date=data.due_date,
+            priority=data.priority or "medium",
+            status="todo",
+            created_at=now,
+            updated_at=now,
+            change_seq=seq,
+        )
+        for data in items
+    ]
+    # INSERT ... RETURNING, rows come back in parameter order
+    tasks = db.execute(insert(TaskORM).returning(*RETURNING_COLUMNS, sort_by_parameter_order=True), rows).all()
+    apply_task_changes(db, user_id, [(None, (t.status, t.due_date)) for t in tasks])
+    apply_daily_changes(db, user_id, [(None, t.status, now) for t in tasks], now)
+    db.commit()
+    _emit(user_id, "created", tasks)
+    return tasks
+
+
+def bulk_update_status(db: Session, user_id: int, ids: Iterable[int], status: str) -> Dict[int, Row]:
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return {}
+    scope = (TaskORM.user_id == user_id, TaskORM.id.in_(ids))
+    before = db.execute(
+        select(TaskORM.id, TaskORM.status, TaskORM.due_date, TaskORM.created_at).where(*scope).with_for_update()
+    ).all()
+    if not before:
+        return {}
+    now = datetime.now(timezone.utc)
+    values = dict(status=status, updated_at=now, change_seq=bump_version(db, user_id))
+    if status == "done":
+        # only rows that actually move to done get a fresh completed_at
+        values["completed_at"] = case((TaskORM.status != "done", now), else_=TaskORM.completed_at)
+    tasks = db.execute(update(TaskORM).where(*scope).values(**values).returning(*RETURNING_COLUMNS)).all()
+    apply_task_changes(db, user_id, [((row.status, row.due_date), (status, row.due_date)) for row in before])
+    apply_daily_changes(db, user_id, [(row.status, status, row.created_at) for row in before], now)
+    db.commit()
+    _emit(user_id, "updated", tasks)
+    return {t.id: t for t in tasks}
+
+
+def bulk_delete_tasks(db: Session, user_id: int, ids: Iterable[int]) -> List[int]:
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return []
+    deleted = db.execute(
+        delete(TaskORM)
+        .where(TaskORM.user_id == user_id, TaskORM.id.in_(ids))
+        .returning(TaskORM.id, TaskORM.status, TaskORM.due_date, TaskORM.recurrence_id, TaskORM.occurrence_date)
+    ).all()
+    if deleted:
+        _forget_recurrences(db, [(row.id, row.recurrence_id, row.occurrence_date) for row in deleted])
+    apply_task_changes(db, user_id, [((row.status, row.due_date), None) for row in deleted])
+    apply_daily_changes(db, user_id, [(row.status, None, None) for row in deleted])
+    seq = None
+    if deleted:
+        seq = bump_version(db, user_id)
+        record_deletes(db, user_id, [row.id for row in deleted], seq)
+    db.commit()
+    _emit(user_id, "deleted", deleted=[row.id for row in deleted], seq=seq)
+    return [row.id for row in deleted]
+
+
+def import_tasks(db: Session, user_id: int, records: Iterable, *, batch_size: int = IMPORT_BATCH_SIZE,
+                 max_errors: int = IMPORT_MAX_ERRORS) -> Dict:
+    # records: (line, dict | parse error) pairs, e.g. app.infra.transfer.parse().
+    # Validated against TaskCreate, inserted with executemany, committed every batch_size rows:
+    # a failure midway keeps the batches already committed.
+    imported = rejected = 0
+    errors: List[Dict] = []
+    batch: List[Dict] = []
+
+    def flush() -> None:
+        nonlocal imported
+        if batch:
+            # Core insert on the table: one executemany (ORM bulk insert splits the batch by which
+            # columns are NULL)
+            seq = bump_version(db, user_id)
+            for row in batch:
+                row["change_seq"] = seq
+            db.execute(TaskORM.__table__.insert(), batch)
+            apply_task_changes(db, user_id, [(None, ("todo", row["due_date"])) for row in batch])
+            apply_daily_changes(db, user_id, [(None, "todo", now)] * len(batch), now)
+            db.commit()
+            imported += len(batch)
+            batch.clear()
+
+    now = datetime.now(timezone.utc)
+    for line, record in records:
+        error = record if isinstance(record, str) else None
+        if error is None:
+            try:
+                data = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                error = error_message(e)
+        if error is not None:
+            rejected += 1
+            if len(errors) < max_errors:
+                errors.append({"line": line, "error": error})
+            continue
+        batch.append(dict(
+            user_id=user_id,
+            title=data.title,
+            description=data.description,
+            due_date=data.due_date,
+            priority=data.priority or "medium",
+            status="todo",
+            created_at=now,
+            updated_at=now,
+        ))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    if imported and bus.has_subscribers(user_id):
+        # too many rows for one event each: clients re-read /api/tasks/changes
+        bus.publish(user_id, {"type": "resync"})
+    return {"imported": imported, "rejected": rejected, "errors": errors}
@@ -0,0 +1,28 @@
+# Async mirror of app/repo/tasks.py. Each call runs the sync implementation through
+# AsyncSession.run_sync: same queries, counters and search index, but the DB I/O goes
+# through the async driver and never blocks the event loop.
+from typing import List, Optional, Tuple
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repo import tasks
+
+
+async def create_task(db: AsyncSession, user_id: int, data) -> Row:
+    return await db.run_sync(tasks.create_task, user_id, data)
+
+
+async def get_task(db: AsyncSession, user_id: int, task_id: int) -> Optional[Row]:
+    return await db.run_sync(tasks.get_task, user_id, task_id)
+
+
+async def list_tasks(db: AsyncSession, user_id: int, **filters) -> Tuple[List[Row], Optional[int], bool]:
+    return await db.run_sync(tasks.list_tasks, user_id, **filters)
+
+
+async def update_task(db: AsyncSession, user_id: int, task_id: int, data) -> Optional[Row]:
+    return await db.run_sync(tasks.update_task, user_id, task_id, data)
+
+
+async def delete_task(db: AsyncSession, user_id: int, task_id: int) -> bool:
+    return await db.run_sync(tasks.delete_task, user_id, task_id)
+
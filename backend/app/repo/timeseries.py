@@ -0,0 +1,155 @@
+import math
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select
+from app.infra.db import upsert_add
+from app.infra.models import TaskDailyStatORM, TaskLeadTimeORM
+from app.repo.archive import all_tasks
+
+# Daily rollups behind /api/analytics/throughput|lead-time|burndown. Task writes add their deltas
+# to the (user, UTC day) rows in the same transaction; rebuild_daily_stats recomputes a user from
+# tasks (backfill after the migration, repair job). Reads only touch rollup rows.
+
+# lead time histogram: LEAD_BUCKETS_PER_OCTAVE buckets per doubling of the lead time in seconds,
+# so a reported percentile is within ~9% of the exact one
+LEAD_BUCKETS_PER_OCTAVE = 4
+# widest from..to range per request
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))
+
+# (status before, status after, created_at); None status = the task does not exist on that side
+TaskEvent = Tuple[Optional[str], Optional[str], Optional[datetime]]
+
+
+def lead_bucket(seconds: float) -> int:
+    return int(math.log2(max(seconds, 1.0)) * LEAD_BUCKETS_PER_OCTAVE)
+
+
+def bucket_hours(bucket: int) -> float:
+    # geometric middle of the bucket
+    return 2 ** ((bucket + 0.5) / LEAD_BUCKETS_PER_OCTAVE) / 3600
+
+
+def _utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def apply_daily_changes(db: Session, user_id: int, changes: Iterable[TaskEvent], now: Optional[datetime] = None) -> None:
+    # net deltas of a batch -> one upsert of today's row (+ one executemany for lead-time buckets)
+    now = now or datetime.now(timezone.utc)
+    created = completed = d_open = 0
+    lead: Counter = Counter()
+    for before, after, created_at in changes:
+        if before is None and after is not None:
+            created += 1
+        d_open += (after is not None and after != "done") - (before is not None and before != "done")
+        if after == "done" and before != "done":
+            completed += 1
+            if created_at is not None:
+                lead[lead_bucket((now - _utc(created_at)).total_seconds())] += 1
+    day = now.date()
+    if created or completed or d_open:
+        upsert_add(db, TaskDailyStatORM, ["user_id", "day"], [
+            {"user_id": user_id, "day": day, "created": created, "completed": completed, "open_delta": d_open},
+        ])
+    if lead:
+        upsert_add(db, TaskLeadTimeORM, ["user_id", "day", "bucket"], [
+            {"user_id": user_id, "day": day, "bucket": b, "n": n} for b, n in lead.items()
+        ])
+
+
+def rebuild_daily_stats(db: Session, user_id: int, batch_size: int = 10_000) -> int:
+    # recompute the user's rollups from tasks (one streamed pass); deleted tasks and reopen/redo
+    # history are lost, the totals still match the tasks as they are now (archived ones included).
+    # Returns tasks seen.
+    db.execute(delete(TaskDailyStatORM).where(TaskDailyStatORM.user_id == user_id))
+    db.execute(delete(TaskLeadTimeORM).where(TaskLeadTimeORM.user_id == user_id))
+    days: Dict[date, List[int]] = {}
+    lead: Counter = Counter()
+    seen = 0
+    T = all_tasks()
+    rows = db.execute(
+        select(T.status, T.created_at, T.completed_at)
+        .where(T.user_id == user_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for status, created_at, completed_at in rows:
+        seen += 1
+        created_at = _utc(created_at)
+        row = days.setdefault(created_at.date(), [0, 0, 0])
+        row[0] += 1
+        row[2] += 1
+        if status == "done" and completed_at is not None:
+            completed_at = _utc(completed_at)
+            row = days.setdefault(completed_at.date(), [0, 0, 0])
+            row[1] += 1
+            row[2] -= 1
+            lead[(completed_at.date(), lead_bucket((completed_at - created_at).total_seconds()))] += 1
+        elif status == "done":
+            row[2] -= 1  # done without a completion time: closed the day it was created
+    upsert_add(db, TaskDailyStatORM, ["user_id", "day"], [
+        {"user_id": user_id, "day": d, "created": c, "completed": k, "open_delta": o} for d, (c, k, o) in days.items()
+    ])
+    upsert_add(db, TaskLeadTimeORM, ["user_id", "day", "bucket"], [
+        {"user_id": user_id, "day": d, "bucket": b, "n": n} for (d, b), n in lead.items()
+    ])
+    return seen
+
+
+def _days(date_from: date, date_to: date) -> List[date]:
+    return [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+
+
+def throughput(db: Session, user_id: int, date_from: date, date_to: date) -> List[Dict]:
+    rows = db.execute(
+        select(TaskDailyStatORM.day, TaskDailyStatORM.created, TaskDailyStatORM.completed)
+        .where(TaskDailyStatORM.user_id == user_id, TaskDailyStatORM.day >= date_from, TaskDailyStatORM.day <= date_to)
+    ).all()
+    by_day = {r.day: r for r in rows}
+    return [
+        {"date": d, "created": by_day[d].created if d in by_day else 0, "completed": by_day[d].completed if d in by_day else 0}
+        for d in _days(date_from, date_to)
+    ]
+
+
+def burndown(db: Session, user_id: int, date_from: date, date_to: date) -> List[Dict]:
+    # open tasks at the end of each day: everything before the range summed once, then a running sum
+    base = db.scalar(
+        select(func.coalesce(func.sum(TaskDailyStatORM.open_delta), 0))
+        .where(TaskDailyStatORM.user_id == user_id, TaskDailyStatORM.day < date_from)
+    )
+    deltas = dict(db.execute(
+        select(TaskDailyStatORM.day, TaskDailyStatORM.open_delta)
+        .where(TaskDailyStatORM.user_id == user_id, TaskDailyStatORM.day >= date_from, TaskDailyStatORM.day <= date_to)
+    ).all())
+    out, open_ = [], int(base)
+    for d in _days(date_from, date_to):
+        open_ += deltas.get(d, 0)
+        out.append({"date": d, "open": open_})
+    return out
+
+
+def lead_time(db: Session, user_id: int, date_from: date, date_to: date, percentiles: Sequence[int] = (50, 90, 95)) -> Dict:
+    # percentiles (hours) of created -> done for tasks completed in the range, from the merged histograms
+    rows = db.execute(
+        select(TaskLeadTimeORM.bucket, func.sum(TaskLeadTimeORM.n))
+        .where(TaskLeadTimeORM.user_id == user_id, TaskLeadTimeORM.day >= date_from, TaskLeadTimeORM.day <= date_to)
+        .group_by(TaskLeadTimeORM.bucket)
+        .order_by(TaskLeadTimeORM.bucket)
+    ).all()
+    count = sum(int(n) for _, n in rows)
+    out: Dict = {"count": count}
+    for p in percentiles:
+        value = None
+        if count:
+            rank, seen = max(1, math.ceil(p / 100 * count)), 0
+            for bucket, n in rows:
+                seen += int(n)
+                if seen >= rank:
+                    value = round(bucket_hours(bucket), 2)
+                    break
+        out[f"p{p}"] = value
+    return out
@@ -1,10 +1,14 @@
+import os
 from datetime import date, datetime
-from typing import Optional, Literal, List
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Dict, Optional, Literal, List
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
 
 Priority = Literal["low","medium","high","urgent"]
 Status   = Literal["todo","in_progress","done"]
 
+# max operations per /api/tasks/bulk/* request (all applied in one transaction)
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "500"))
+
 
 class TaskCreate(BaseModel):
     title: str = Field(min_length=1, max_length=200)
@@ -13,6 +17,13 @@ class TaskCreate(BaseModel):
     priority: Optional[Priority] = "medium"
 
 
+def error_message(e: ValidationError) -> str:
+    # first error as "field: message", for per-item/per-row reports
+    err = e.errors()[0]
+    field = ".".join(str(p) for p in err["loc"]) or "item"
+    return f"{field}: {err['msg']}"
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = None
@@ -37,8 +48,114 @@ class TaskRead(BaseModel):
 
 class TaskList(BaseModel):
     items: List[TaskRead]
-    total: int
+    total: Optional[int]        # None with with_total=none
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class TaskSummary(BaseModel):
+    id: Optional[int]                   # None: occurrence of a recurring task, not a row yet
+    template_id: Optional[int] = None   # ... of this task's series
+    title: str
+    priority: Priority
+    status: Status
+
+
+class CalendarDay(BaseModel):
+    date: date
+    items: List[TaskSummary]    # first per_day, most urgent first
+    total: int
+    more: int                   # total - len(items)
+
+
+class TaskCalendar(BaseModel):
+    from_: date = Field(serialization_alias="from")
+    to: date
+    days: List[CalendarDay]     # only days with tasks
+
+
+Weekday = Literal["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+class RecurrenceIn(BaseModel):
+    # either rrule ("FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10", app/domain/recurrence.py) or the fields
+    rrule: Optional[str] = Field(default=None, max_length=200)
+    freq: Optional[Literal["daily", "weekly", "monthly"]] = None
+    interval: int = 1
+    byweekday: Optional[List[Weekday]] = None
+    bymonthday: Optional[int] = None
+    count: Optional[int] = None
+    until: Optional[date] = None
+
+
+class RecurrenceRead(BaseModel):
+    task_id: int
+    rrule: str
+    dtstart: date
+    ends_on: Optional[date]     # last occurrence, None = endless
+    exdates: List[date]
+
+
+class TaskOccurrence(BaseModel):
+    id: Optional[int]           # None: not a row yet (PATCH /api/tasks/{template_id}/occurrences/{due_date})
+    template_id: Optional[int]
+    title: str
+    description: Optional[str]
+    due_date: date
+    priority: Priority
+    status: Status
+    virtual: bool
+
+
+class TaskOccurrences(BaseModel):
+    from_: date = Field(serialization_alias="from")
+    to: date
+    items: List[TaskOccurrence]
+
+
+class TaskChanges(BaseModel):
+    items: List[TaskRead]       # created or updated since the token (current state)
+    deleted: List[int]          # ids deleted since the token
+    next_token: str             # pass as ?since= next time
+    has_more: bool
+
+
+class BulkCreate(BaseModel):
+    # items are validated one by one (TaskCreate) so a bad item doesn't reject the batch
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkStatus(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+    status: Status
+
+
+class BulkDelete(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    ok: bool
+    error: Optional[str] = None
+    task: Optional[TaskRead] = None
+
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
+
+
+class ImportRejected(BaseModel):
+    line: int
+    error: str
 
 
+class ImportReport(BaseModel):
+    imported: int
+    rejected: int
+    errors: List[ImportRejected]   # first IMPORT_MAX_ERRORS rejected rows
@@ -0,0 +1 @@
+"""Standalone performance benchmarks for the task API (run with ``python -m benchmarks.<name>``)."""
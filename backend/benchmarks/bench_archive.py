@@ -0,0 +1,107 @@
+"""Hot reads before and after archiving old done tasks (app/repo/archive.py).
+
+    python -m benchmarks.bench_archive --tasks 200000 --users 20
+
+Seeds users with a year of history (benchmarks.datagen distributions), then times the same reads
+on the full `tasks` table, runs archive_done_tasks (ARCHIVE_AFTER_DAYS=90) and times them again,
+plus the include_archived variant of the list. Also prints the size of the tasks table and its
+indexes (dbstat), which is what has to stay in the page cache.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.repo.analytics import rebuild_counters, summary_counts
+from app.repo.archive import archive_done_tasks
+from app.repo.tasks import calendar_tasks, list_tasks
+from benchmarks import datagen
+
+
+def seed(engine, users: int, tasks: int) -> None:
+    rnd = random.Random(5)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(UserORM), [
+            {"id": u, "email": datagen.email(u), "password_hash": "x", "created_at": now} for u in range(1, users + 1)
+        ])
+        batch = []
+        for i in range(tasks):
+            batch.append(datagen.task_row(rnd, 1 + i % users, now, now.date()))
+            if len(batch) == 20_000:
+                conn.execute(insert(TaskORM), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(TaskORM), batch)
+    with Session(engine) as db:
+        for u in range(1, users + 1):
+            rebuild_counters(db, u, now.date())
+        db.commit()
+
+
+def timed(fn, repeat: int) -> float:
+    values = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(values)
+
+
+def sizes(db: Session) -> str:
+    try:
+        rows = db.execute(text(
+            "SELECT name, sum(pgsize) FROM dbstat WHERE name = 'tasks' OR name LIKE 'ix_tasks_%' "
+            "AND name NOT LIKE 'ix_tasks_archive%' GROUP BY name"
+        )).all()
+    except Exception:
+        return "dbstat not available"
+    return f"tasks + indexes {sum(n for _, n in rows) / 2**20:.1f} MiB"
+
+
+def reads(db: Session, repeat: int) -> dict:
+    today = date.today()
+    return {
+        "board page": timed(lambda: list_tasks(db, 1, page_size=50, with_total="exact"), repeat),
+        "done page": timed(lambda: list_tasks(db, 1, status="done", page_size=50, with_total="exact"), repeat),
+        "calendar": timed(lambda: calendar_tasks(db, 1, today - timedelta(days=7), today + timedelta(days=34)), repeat),
+        "summary scan": timed(lambda: summary_counts(db, 1, today), repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'archive.sqlite3')}")
+    Base.metadata.create_all(engine)
+    seed(engine, args.users, args.tasks)
+    with Session(engine) as db:
+        print(f"before: {sizes(db)}")
+        before = reads(db, args.repeat)
+        t0 = time.perf_counter()
+        moved = archive_done_tasks(db)
+        print(f"archived {sum(moved.values())} of {args.tasks} tasks in {time.perf_counter() - t0:.1f}s")
+        db.execute(text("VACUUM"))  # give the freed pages back, so the sizes show the hot set
+        print(f"after:  {sizes(db)}")
+        reads(db, 5)  # VACUUM rewrote the file: warm the page cache again
+        after = reads(db, args.repeat)
+        archived = timed(lambda: list_tasks(db, 1, page_size=50, with_total="exact", include_archived=True), args.repeat)
+    for name in before:
+        print(f"{name:14} {before[name]:8.2f}ms -> {after[name]:8.2f}ms")
+    print(f"{'board page, include_archived':30} {archived:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
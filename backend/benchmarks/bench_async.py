@@ -0,0 +1,89 @@
+"""Throughput of the sync (threadpool) routes vs the async (ASYNC_DB=1) routes under concurrency.
+
+    python -m benchmarks.bench_async --requests 2000 --concurrency 1 50 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# always a throwaway file: an exported DATABASE_URL/DATABASE_READ_URL must not get the benchmark data
+os.environ["DATABASE_URL"] = os.environ["DATABASE_READ_URL"] = (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_async.sqlite3')}"
+)
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.infra.db import Base, engine  # noqa: E402
+from app.main import include_routers  # noqa: E402
+
+
+def build_app(async_mode: bool) -> FastAPI:
+    app = FastAPI()
+    include_routers(app, async_mode=async_mode)
+    return app
+
+
+def seed(tasks: int) -> dict:
+    Base.metadata.create_all(bind=engine)
+    client = TestClient(build_app(False))
+    client.post("/api/auth/register", json={"email": "bench@example.com", "password": "secret123"})
+    token = client.post("/api/auth/login", data={"username": "bench@example.com", "password": "secret123"}).json()["access"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(tasks):
+        client.post("/api/tasks/", json={"title": f"task {i}"}, headers=headers)
+    return headers
+
+
+async def load(app: FastAPI, path: str, headers: dict, requests: int, concurrency: int) -> tuple[float, list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                t0 = time.perf_counter()
+                r = await client.get(path, headers=headers)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                errors += r.status_code != 200
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+    return requests / elapsed, latencies, errors
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    args = parser.parse_args()
+
+    headers = seed(args.tasks)
+    apps = {mode: build_app(mode == "async") for mode in args.modes}
+    for path in ("/api/tasks/?page_size=20", "/api/analytics/summary"):
+        for concurrency in args.concurrency:
+            for name, app in apps.items():
+                await load(app, path, headers, 50, min(concurrency, 10))  # warm up
+                rps, ms, errors = await load(app, path, headers, args.requests, concurrency)
+                ms.sort()
+                # sync routes hold a pooled connection per threadpool worker (40 threads) and the
+                # session teardown of get_db needs a worker too: past the pool size (5 + 10 overflow)
+                # requests stall on the pool and fail with QueuePool timeouts after 30s
+                print(
+                    f"{path:26} {name:5} c={concurrency:<4} {rps:8.1f} req/s  "
+                    f"p50={statistics.median(ms):7.2f}ms  p99={ms[int(len(ms) * 0.99) - 1]:7.2f}ms  errors={errors}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
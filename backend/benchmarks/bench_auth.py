@@ -0,0 +1,65 @@
+"""Per-request latency of authenticated endpoints with and without the user cache.
+
+    python -m benchmarks.bench_auth --requests 2000
+
+Token verification and the claims cache are measured on their own in benchmarks.bench_jwt.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+# always a throwaway file: an exported DATABASE_URL/DATABASE_READ_URL must not get the benchmark data
+os.environ["DATABASE_URL"] = os.environ["DATABASE_READ_URL"] = (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_auth.sqlite3')}"
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.auth.cache import user_cache  # noqa: E402
+from app.infra.db import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def measure(client: TestClient, path: str, headers: dict, n: int) -> list[float]:
+    timings = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = client.get(path, headers=headers)
+        timings.append((time.perf_counter() - t0) * 1000)
+        assert r.status_code == 200, r.text
+    return timings
+
+
+def report(label: str, ms: list[float]) -> None:
+    ms = sorted(ms)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{label:36} p50={statistics.median(ms):6.3f}ms  p95={p95:6.3f}ms  mean={statistics.fmean(ms):6.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    client = TestClient(app)
+    client.post("/api/auth/register", json={"email": "bench@example.com", "password": "secret123"})
+    token = client.post("/api/auth/login", data={"username": "bench@example.com", "password": "secret123"}).json()["access"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(20):
+        client.post("/api/tasks/", json={"title": f"task {i}"}, headers=headers)
+
+    for path in ("/api/tasks/?page_size=20", "/api/analytics/summary"):
+        measure(client, path, headers, 100)  # warm up
+        ttl = user_cache.ttl
+        user_cache.ttl = 0
+        user_cache.clear()
+        report(f"{path} uncached", measure(client, path, headers, args.requests))
+        user_cache.ttl = ttl
+        report(f"{path} cached", measure(client, path, headers, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Calendar month view: /api/tasks/calendar (repo.calendar_tasks) vs the old page_size=100 list.
+
+    python -m benchmarks.bench_calendar --backlog 10000 100000 1000000
+
+One user, 600 tasks due in the viewed 6 weeks plus a backlog due elsewhere (the past three
+years). The calendar query reads only the window, so its time should stay flat as the backlog
+grows; the old client-side bucketing got 100 full rows and silently dropped the rest.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.repo.tasks import calendar_tasks, list_tasks
+
+WINDOW_FROM = date(2025, 3, 3)
+WINDOW_DAYS = 42
+IN_WINDOW = 600
+
+
+def seed(engine, backlog: int) -> None:
+    rnd = random.Random(3)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(UserORM).values(id=1, email="bench@example.com", password_hash="x", created_at=now))
+        batch = []
+        for i in range(backlog + IN_WINDOW):
+            if i < IN_WINDOW:
+                due = WINDOW_FROM + timedelta(days=rnd.randrange(WINDOW_DAYS))
+            else:
+                due = WINDOW_FROM - timedelta(days=1 + rnd.randrange(3 * 365))
+            batch.append({
+                "user_id": 1, "title": f"task {i}", "description": "x" * 200, "due_date": due,
+                "priority": rnd.choice(("low", "medium", "high", "urgent")),
+                "status": rnd.choice(("todo", "in_progress", "done")),
+                "created_at": now - timedelta(seconds=i), "updated_at": now,
+            })
+            if len(batch) == 10_000:
+                conn.execute(insert(TaskORM), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(TaskORM), batch)
+
+
+def timed(fn, repeat: int) -> float:
+    values = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backlog", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    window_to = WINDOW_FROM + timedelta(days=WINDOW_DAYS - 1)
+    for backlog in args.backlog:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, f'calendar_{backlog}.sqlite3')}")
+        Base.metadata.create_all(engine)
+        seed(engine, backlog)
+        with Session(engine) as db:
+            def calendar():
+                return calendar_tasks(db, 1, WINDOW_FROM, window_to, per_day=10, include_done=False)
+
+            def old_list():
+                db.expunge_all()
+                return list_tasks(db, 1, page_size=100, with_total="none")
+
+            days = calendar()
+            shown = sum(len(d["items"]) for d in days)
+            counted = sum(d["total"] for d in days)
+            print(
+                f"backlog={backlog:8}  calendar {timed(calendar, args.repeat):6.2f}ms "
+                f"({shown} shown, {counted} counted)  |  old list page {timed(old_list, args.repeat):6.2f}ms "
+                f"(100 rows, any dates)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Mixed read/write concurrency on SQLite: driver defaults vs the tuned profile (app/infra/db.py).
+
+    python -m benchmarks.bench_db_profile --tasks 100000 --readers 8 --writers 4 --seconds 10
+
+default: one pool, rollback journal, synchronous=FULL, deferred transactions.
+tuned:   WAL + pragmas, BEGIN IMMEDIATE write pool, separate query_only read pool.
+Readers run list_tasks (first page + count), writers create_task + update_task.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.infra.db import Base, configure_sqlite
+from app.repo.tasks import create_task, list_tasks, update_task
+from benchmarks.bench_search import seed
+
+USERS = 10
+
+
+def make_engines(path: str, profile: str):
+    url = f"sqlite:///{path}"
+    kwargs = dict(connect_args={"check_same_thread": False}, pool_size=20, max_overflow=0)
+    writer = create_engine(url, **kwargs)
+    if profile == "default":
+        return writer, writer
+    reader = create_engine(url, **kwargs)
+    configure_sqlite(writer)
+    configure_sqlite(reader, read_only=True)
+    return writer, reader
+
+
+def run(writer, reader, readers: int, writers: int, seconds: float) -> dict:
+    stop = time.perf_counter() + seconds
+    lat = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def read_loop(seed_: int):
+        rnd = random.Random(seed_)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                with Session(reader) as db:
+                    list_tasks(db, rnd.randint(1, USERS), page_size=20)
+                ok = True
+            except Exception:
+                ok = False
+            with lock:
+                lat["read"].append(time.perf_counter() - t0) if ok else errors.__setitem__("read", errors["read"] + 1)
+
+    def write_loop(seed_: int):
+        rnd = random.Random(seed_)
+        while time.perf_counter() < stop:
+            user_id = rnd.randint(1, USERS)
+            t0 = time.perf_counter()
+            try:
+                with Session(writer) as db:
+                    task = create_task(db, user_id, SimpleNamespace(
+                        title="bench write", description=None, due_date=None, priority="low",
+                    ))
+                    update_task(db, user_id, task.id, SimpleNamespace(model_dump=lambda **_: {"status": "done"}))
+                ok = True
+            except Exception:
+                ok = False
+            with lock:
+                lat["write"].append(time.perf_counter() - t0) if ok else errors.__setitem__("write", errors["write"] + 1)
+
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=write_loop, args=(100 + i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    out = {}
+    for kind, values in lat.items():
+        values.sort()
+        q = lambda p: values[min(len(values) - 1, int(p * len(values)))] * 1000 if values else float("nan")
+        out[kind] = dict(
+            ops=len(values) / seconds, p50=statistics.median(values) * 1000 if values else float("nan"),
+            p95=q(0.95), p99=q(0.99), errors=errors[kind],
+        )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    for profile in ("default", "tuned"):
+        path = os.path.join(tmp, f"{profile}.sqlite3")
+        writer, reader = make_engines(path, profile)
+        Base.metadata.create_all(writer)
+        seed(writer, args.tasks, n_users=USERS)
+        result = run(writer, reader, args.readers, args.writers, args.seconds)
+        for kind, r in result.items():
+            print(
+                f"{profile:8} {kind:5} {r['ops']:8.1f} ops/s  p50={r['p50']:7.1f}ms  p95={r['p95']:7.1f}ms  "
+                f"p99={r['p99']:7.1f}ms  errors={r['errors']}"
+            )
+        writer.dispose()
+        reader.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Fan-out benchmark for the in-process event bus (app/infra/events.py).
+
+    python -m benchmarks.bench_events --connections 1000 5000 10000 --users 100
+
+Each connection is a consumer coroutine doing what the SSE endpoint does (wait with a heartbeat
+timeout, format the frame), all idle on one event loop. Events are published from a worker
+thread, like a sync endpoint would. Reports memory per idle connection and the time until the
+last subscriber has the event: one user with all connections (worst case) and one user's share.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from app.infra.events import EventBus, sse_format
+
+HEARTBEAT = 15.0
+
+
+async def scenario(connections: int, users: int, rounds: int) -> dict:
+    bus = EventBus()
+    loop = asyncio.get_running_loop()
+    received = 0
+    target = 0
+    done = asyncio.Event()
+
+    async def consumer(sub):
+        nonlocal received
+        while not sub.closed:
+            event = await sub.get(timeout=HEARTBEAT)
+            if event is None:
+                continue
+            sse_format(event)
+            received += 1
+            if received >= target:
+                done.set()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    subs = [bus.subscribe(i % users) for i in range(connections)]
+    tasks = [asyncio.create_task(consumer(sub)) for sub in subs]
+    await asyncio.sleep(0)  # everyone parked in get()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    per_conn = sum(s.size_diff for s in after.compare_to(before, "filename")) / connections
+
+    async def fan_out(user_id: int, expected: int) -> float:
+        nonlocal received, target
+        received, target = 0, expected
+        done.clear()
+        t0 = time.perf_counter()
+        await loop.run_in_executor(None, bus.publish, user_id, {"type": "updated", "seq": 1, "task": {"id": 1}})
+        await done.wait()
+        return time.perf_counter() - t0
+
+    # all connections belong to one user
+    for sub in subs:
+        bus._remove(sub)
+        sub.user_id = 0
+    with bus._lock:
+        bus._subs[0] = set(subs)
+    all_lat = [await fan_out(0, connections) for _ in range(rounds)]
+
+    # spread over users: a publish only touches that user's connections
+    for sub in subs:
+        bus._remove(sub)
+    for i, sub in enumerate(subs):
+        sub.user_id = i % users
+        with bus._lock:
+            bus._subs.setdefault(sub.user_id, set()).add(sub)
+    share = len(bus._subs[1])
+    one_lat = [await fan_out(1, share) for _ in range(rounds)]
+
+    for sub in subs:
+        sub.close()
+    await asyncio.gather(*tasks)
+    return dict(per_conn=per_conn, all=all_lat, one=one_lat, share=share)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    for n in args.connections:
+        r = asyncio.run(scenario(n, args.users, args.rounds))
+        ms = lambda xs: f"p50={statistics.median(xs) * 1000:7.2f}ms max={max(xs) * 1000:7.2f}ms"
+        print(
+            f"{n:6} idle connections: {r['per_conn'] / 1024:5.1f} KiB each | "
+            f"fan-out to all {ms(r['all'])} | to one user ({r['share']}) {ms(r['one'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Export benchmark: streamed rows/s and peak Python memory of iter_tasks + NDJSON/CSV encoding.
+
+    python -m benchmarks.bench_export --tasks 200000
+
+Peak memory should not grow with the number of exported rows.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.infra import transfer
+from app.infra.db import Base
+from app.repo.tasks import EXPORT_COLUMNS, iter_tasks
+from benchmarks.bench_search import seed
+
+
+def export(engine, fmt: str, **filters):
+    columns = [c.key for c in EXPORT_COLUMNS]
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    n_rows = n_bytes = 0
+
+    def counted(rows):
+        nonlocal n_rows
+        for row in rows:
+            n_rows += 1
+            yield row
+
+    with Session(engine) as db:
+        for chunk in transfer.encode(fmt, columns, counted(iter_tasks(db, 1, **filters))):
+            n_bytes += len(chunk)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, n_rows, n_bytes, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_export.sqlite3")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    seed(engine, args.tasks)
+
+    for fmt in ("ndjson", "csv"):
+        for label, filters in (("all", {}), ("search", {"q": "deploy"})):
+            elapsed, n_rows, n_bytes, peak = export(engine, fmt, **filters)
+            print(
+                f"{fmt:6} {label:6} {n_rows:8} rows {elapsed:6.2f}s  {n_rows / elapsed:9.0f} rows/s  "
+                f"{n_bytes / 2**20:7.1f} MiB out  peak {peak / 2**20:5.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
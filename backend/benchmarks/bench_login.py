@@ -0,0 +1,93 @@
+"""Login storm: many concurrent logins while a client keeps using the task list.
+
+Reports login throughput and 503s, the latency seen by the unrelated client,
+and the hashing pool metrics (hash time, queue wait).
+
+    python -m benchmarks.bench_login --logins 300 --concurrency 100 [--async-routes]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# always a throwaway file: an exported DATABASE_URL/DATABASE_READ_URL must not get the benchmark data
+os.environ["DATABASE_URL"] = os.environ["DATABASE_READ_URL"] = (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_login.sqlite3')}"
+)
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.auth import hashing  # noqa: E402
+from app.infra.db import Base, engine  # noqa: E402
+from app.main import include_routers  # noqa: E402
+
+
+def pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * q) - 1)] if values else 0.0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--async-routes", action="store_true")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    include_routers(app, async_mode=args.async_routes)
+    seed = TestClient(app)
+    seed.post("/api/auth/register", json={"email": "storm@example.com", "password": "secret123"})
+    token = seed.post("/api/auth/login", data={"username": "storm@example.com", "password": "secret123"}).json()["access"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        statuses: list[int] = []
+        login_ms: list[float] = []
+        probe_ms: list[float] = []
+        remaining = iter(range(args.logins))
+        done = asyncio.Event()
+
+        async def stormer():
+            for _ in remaining:
+                t0 = time.perf_counter()
+                r = await client.post("/api/auth/login", data={"username": "storm@example.com", "password": "secret123"})
+                login_ms.append((time.perf_counter() - t0) * 1000)
+                statuses.append(r.status_code)
+
+        async def prober():
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await client.get("/api/tasks/?page_size=20", headers=headers)
+                probe_ms.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe = asyncio.create_task(prober())
+        t0 = time.perf_counter()
+        await asyncio.gather(*(stormer() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - t0
+        done.set()
+        await probe
+
+    ok = statuses.count(200)
+    print(
+        f"routes={'async' if args.async_routes else 'sync'} pool={hashing.HASH_POOL_SIZE} "
+        f"queue_limit={hashing.HASH_QUEUE_LIMIT} logins={args.logins} c={args.concurrency}"
+    )
+    print(f"logins: {ok / elapsed:.1f} ok/s  ok={ok}  503={statuses.count(503)}  p50={statistics.median(login_ms):.1f}ms  p99={pct(login_ms, 0.99):.1f}ms")
+    print(f"task list during storm: n={len(probe_ms)}  p50={statistics.median(probe_ms):.1f}ms  p99={pct(probe_ms, 0.99):.1f}ms")
+    print(
+        f"hash: n={hashing.hash_latency.count}  mean={hashing.hash_latency.sum / hashing.hash_latency.count * 1000:.1f}ms  "
+        f"queue wait p50<={hashing.hash_queue_wait.quantile(0.5) * 1000:.0f}ms  p95<={hashing.hash_queue_wait.quantile(0.95) * 1000:.0f}ms  "
+        f"rejected={hashing.hash_rejected.value:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
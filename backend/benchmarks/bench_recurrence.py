@@ -0,0 +1,122 @@
+"""Range expansion of recurring tasks (app/repo/recurrence.py) for users with hundreds of rules.
+
+    python -m benchmarks.bench_recurrence --rules 100 300 1000
+
+Per rule count: one user whose rules (daily/weekly/monthly, some with COUNT/UNTIL) started up to
+three years ago, ~5% of the occurrences in the window already materialized. Times expand() for a
+6-week calendar window and a one-year window, calendar_tasks() and due_load() on top of it, and
+the same expansion walked from each rule's dtstart instead of jumping to the window (what it
+would cost without the arithmetic jump).
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.domain.recurrence import Rule, last_occurrence, occurrences, parse_rrule, to_rrule
+from app.infra.db import Base
+from app.infra.models import TaskORM, TaskRecurrenceORM, UserORM
+from app.repo.recurrence import due_load, expand
+from app.repo.tasks import calendar_tasks
+
+
+def random_rule(rnd: random.Random) -> Rule:
+    freq = rnd.choices(("daily", "weekly", "monthly"), (3, 5, 2))[0]
+    end = rnd.choices(("none", "count", "until"), (6, 2, 2))[0]
+    kwargs = {}
+    if freq == "daily":
+        kwargs["interval"] = rnd.choice((1, 1, 2, 3))
+    elif freq == "weekly":
+        kwargs.update(interval=rnd.choice((1, 1, 2)), byweekday=tuple(sorted(rnd.sample(range(5), rnd.randint(1, 3)))))
+    else:
+        kwargs["bymonthday"] = rnd.choice((1, 15, 28, -1))
+    if end == "count":
+        kwargs["count"] = rnd.randint(10, 1000)
+    elif end == "until":
+        kwargs["until"] = date.today() + timedelta(days=rnd.randint(-200, 400))
+    return Rule(freq, **kwargs)
+
+
+def seed(engine, user_id: int, rules: int, rnd: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    with Session(engine) as db:
+        db.execute(insert(UserORM), [{"id": user_id, "email": f"rules{user_id}@bench.local", "password_hash": "x"}])
+        for i in range(rules):
+            dtstart = today - timedelta(days=rnd.randint(0, 3 * 365))
+            task_id = db.execute(insert(TaskORM).values(
+                user_id=user_id, title=f"recurring {i}", due_date=dtstart, priority=rnd.choice(("low", "medium", "high")),
+                status="todo", created_at=now, updated_at=now,
+            ).returning(TaskORM.id)).scalar_one()
+            rule = random_rule(rnd)
+            rid = db.execute(insert(TaskRecurrenceORM).values(
+                user_id=user_id, task_id=task_id, rrule=to_rrule(rule), dtstart=dtstart,
+                ends_on=last_occurrence(rule, dtstart), created_at=now,
+            ).returning(TaskRecurrenceORM.id)).scalar_one()
+            window = list(occurrences(rule, dtstart, today - timedelta(days=7), today + timedelta(days=60)))
+            done = [d for d in window if d != dtstart and rnd.random() < 0.05]
+            if done:
+                db.execute(insert(TaskORM), [
+                    dict(user_id=user_id, title=f"recurring {i}", due_date=d, priority="medium", status="done",
+                         created_at=now, updated_at=now, completed_at=now, recurrence_id=rid, occurrence_date=d)
+                    for d in done
+                ])
+        db.commit()
+
+
+def timed(fn, repeat: int):
+    values, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        values.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(values), result
+
+
+def walk_from_dtstart(db: Session, user_id: int, date_from: date, date_to: date) -> int:
+    # baseline: every rule iterated from its first occurrence up to the window
+    rows = db.execute(
+        TaskRecurrenceORM.__table__.select().where(TaskRecurrenceORM.user_id == user_id)
+    ).all()
+    n = 0
+    for r in rows:
+        for d in occurrences(parse_rrule(r.rrule), r.dtstart, r.dtstart, date_to, r.ends_on):
+            n += d >= date_from
+    return n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'recurrence.sqlite3')}")
+    Base.metadata.create_all(engine)
+    rnd = random.Random(3)
+    today = date.today()
+    month = (today - timedelta(days=7), today + timedelta(days=34))
+    year = (today, today + timedelta(days=365))
+    print(f"{'rules':>6} {'6 weeks':>16} {'1 year':>18} {'calendar':>10} {'due/year':>10} {'walk 6w':>10}")
+    for user_id, rules in enumerate(args.rules, start=1):
+        seed(engine, user_id, rules, rnd)
+        with Session(engine) as db:
+            t_month, occ_month = timed(lambda: expand(db, user_id, *month), args.repeat)
+            t_year, occ_year = timed(lambda: expand(db, user_id, *year), max(3, args.repeat // 4))
+            t_cal, _ = timed(lambda: calendar_tasks(db, user_id, *month), args.repeat)
+            t_due, _ = timed(lambda: due_load(db, user_id, *year), max(3, args.repeat // 4))
+            t_walk, _ = timed(lambda: walk_from_dtstart(db, user_id, *month), max(3, args.repeat // 4))
+        print(
+            f"{rules:>6} {t_month:7.2f}ms {len(occ_month):>6}  {t_year:8.2f}ms {len(occ_year):>6}  "
+            f"{t_cal:7.2f}ms {t_due:7.2f}ms {t_walk:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
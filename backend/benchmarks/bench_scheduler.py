@@ -0,0 +1,129 @@
+"""Reminder scheduler ticks (app/infra/scheduler.py) against large task tables.
+
+    python -m benchmarks.bench_scheduler --tasks 100000 1000000
+
+Per table size: tasks from benchmarks.datagen (due dates spread a few weeks around today). Times
+the tick that fires one day's due_soon group (batched reads of ix_tasks_due_date, a sink that only
+counts) and an idle tick between fire times, with the number of SQL statements each ran; for
+comparison, one scan of the table for the same day's open tasks, what a poller without the index
+and the heap would pay on every tick.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.infra.scheduler import Scheduler
+from benchmarks import datagen
+
+
+class CountingSink:
+    name = "count"
+
+    def __init__(self):
+        self.n = 0
+
+    async def emit(self, items):
+        self.n += len(items)
+
+
+def seed(engine, users: int, tasks: int) -> None:
+    rnd = random.Random(11)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(UserORM), [
+            {"id": u, "email": datagen.email(u), "password_hash": "x", "created_at": now} for u in range(1, users + 1)
+        ])
+        batch = []
+        for i in range(tasks):
+            batch.append(datagen.task_row(rnd, 1 + i % users, now, now.date()))
+            if len(batch) == 20_000:
+                conn.execute(insert(TaskORM), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(TaskORM), batch)
+
+
+def at(day: date, hour: int, second: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, 0, second, tzinfo=timezone.utc)
+
+
+def run(engine, day: date, repeat: int, batch_size: int) -> dict:
+    Session = sessionmaker(bind=engine)
+    queries = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*args):
+        queries[0] += 1
+
+    fire, idle, fire_q, idle_q, fired = [], [], 0, 0, 0
+    for _ in range(repeat):
+        sink = CountingSink()
+        job = Scheduler([sink], kinds={"due_soon": timedelta(hours=-15)}, lease_name=f"bench-{uuid4().hex[:8]}",
+                        batch_size=batch_size, session_factory=Session, read_session_factory=Session,
+                        clock=lambda: at(day - timedelta(days=1), 9))
+        asyncio.run(job.run_once(at(day - timedelta(days=1), 8)))    # takes the lease, nothing due
+
+        async def ticks():
+            nonlocal fire_q, idle_q
+            queries[0] = 0
+            t0 = time.perf_counter()
+            await job.run_once(at(day - timedelta(days=1), 9))
+            fire.append((time.perf_counter() - t0) * 1000)
+            fire_q = queries[0]
+            queries[0] = 0
+            t0 = time.perf_counter()
+            for s in range(1, 6):
+                await job.run_once(at(day - timedelta(days=1), 9, s))
+            idle.append((time.perf_counter() - t0) / 5 * 1e6)
+            idle_q = queries[0] / 5
+
+        asyncio.run(ticks())
+        fired = sink.n
+    event.remove(engine, "before_cursor_execute", _count)
+
+    with engine.connect() as conn:
+        t0 = time.perf_counter()
+        for _ in range(3):
+            conn.execute(text(
+                "SELECT count(*) FROM tasks NOT INDEXED WHERE due_date = :d AND status != 'done'"
+            ), {"d": day.isoformat()}).scalar()
+        scan = (time.perf_counter() - t0) / 3 * 1000
+    return {"fired": fired, "fire": statistics.median(fire), "fire_q": fire_q,
+            "idle": statistics.median(idle), "idle_q": idle_q, "scan": scan}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    day = date.today() + timedelta(days=7)   # the densest due day of the generated data
+    print(f"{'tasks':>9} {'reminders':>10} {'fire tick':>16} {'per reminder':>13} {'idle tick':>16} {'table scan':>11}")
+    for tasks in args.tasks:
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scheduler.sqlite3')}")
+        Base.metadata.create_all(engine)
+        seed(engine, args.users, tasks)
+        r = run(engine, day, args.repeat, args.batch_size)
+        print(
+            f"{tasks:>9} {r['fired']:>10} {r['fire']:8.2f}ms {r['fire_q']:>3}q "
+            f"{r['fire'] * 1000 / max(r['fired'], 1):10.2f}us {r['idle']:8.1f}us {r['idle_q']:>4.1f}q {r['scan']:9.2f}ms"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Search benchmark: LIKE '%q%' scan vs the FTS5 index for the `q` filter.
+
+    python -m benchmarks.bench_search --tasks 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, desc, insert, select
+from sqlalchemy.orm import Session
+
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.infra.search import Fts5Search, LikeSearch
+
+COMMON = (
+    "report invoice meeting review deploy release budget call email plan design draft "
+    "backlog sprint retro hiring onboarding migrate database cleanup refactor docs"
+).split()
+# long tail vocabulary so that most words are selective, like real task text
+RARE = [
+    f"{a}{b}{c}{d}{e}"
+    for a in "bdfgklmnprstv" for b in "aeiou" for c in "bdfgklmnprstv" for d in "aeiou" for e in ("x", "n", "lix", "ram")
+]
+
+
+def seed(engine, n_tasks: int, n_users: int = 10) -> None:
+    rnd = random.Random(42)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(UserORM), [
+            {"id": u, "email": f"bench{u}@example.com", "password_hash": "x", "created_at": now}
+            for u in range(1, n_users + 1)
+        ])
+        batch = []
+        for i in range(n_tasks):
+            batch.append({
+                "user_id": 1 if i % 2 == 0 else rnd.randint(2, n_users),  # half of all tasks belong to user 1
+                "title": " ".join(rnd.sample(COMMON, 2) + rnd.sample(RARE, 1)),
+                "description": " ".join(rnd.choices(COMMON, k=4) + rnd.choices(RARE, k=8)),
+                "priority": "medium",
+                "status": "todo",
+                "created_at": now - timedelta(seconds=i),
+                "updated_at": now,
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(TaskORM), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(TaskORM), batch)
+
+
+def run(db: Session, backend, q: str, relevance: bool, repeat: int) -> list[float]:
+    stmt, rank = backend.apply(select(TaskORM).where(TaskORM.user_id == 1), q)
+    order = (rank, desc(TaskORM.created_at)) if relevance and rank is not None else (desc(TaskORM.created_at),)
+    stmt = stmt.order_by(*order).limit(20)
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        db.execute(stmt).scalars().all()
+        timings.append((time.perf_counter() - t0) * 1000)
+        db.expunge_all()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_search.sqlite3")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    t0 = time.perf_counter()
+    seed(engine, args.tasks)
+    print(f"seeded {args.tasks} tasks in {time.perf_counter() - t0:.1f}s ({path})")
+
+    with Session(engine) as db:
+        # frequent word, rare word, two rare words, no match at all
+        for q in ("deploy", "kelix", "kelix barox", "zzyzx"):
+            for backend in (LikeSearch(), Fts5Search()):
+                for relevance in (False, True):
+                    ms = run(db, backend, q, relevance, args.repeat)
+                    print(
+                        f"{backend.name:5} q={q!r:15} sort={'relevance' if relevance else 'created_at':10} "
+                        f"p50={statistics.median(ms):8.2f}ms  max={max(ms):8.2f}ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
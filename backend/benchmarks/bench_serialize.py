@@ -0,0 +1,98 @@
+"""Serialization cost of one task list page (page_size=100): before vs after the fast path.
+
+    python -m benchmarks.bench_serialize --page-size 100 --repeat 500
+
+before: ORM entities -> TaskList(items=...) -> FastAPI serialize_response (response_model
+        validation + json encoding, the real routing code) -> JSONResponse body
+after:  column rows -> dicts -> FastJSONResponse body (orjson, or pydantic-core without it)
+Fetch is timed separately (select(TaskORM) vs select(*EXPORT_COLUMNS)) on an in-memory DB.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.api import responses
+from app.api.responses import FastJSONResponse, rows
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.main import app
+from app.repo.tasks import EXPORT_COLUMNS
+from app.schemas.tasks import TaskList
+
+
+def seed(engine, n: int) -> None:
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(UserORM).values(id=1, email="bench@example.com", password_hash="x", created_at=now))
+        conn.execute(insert(TaskORM), [{
+            "user_id": 1, "title": f"Task number {i} with a title", "description": "lorem ipsum " * 20,
+            "due_date": date(2025, 1, 1) + timedelta(days=i % 90), "priority": ("low", "medium", "high", "urgent")[i % 4],
+            "status": ("todo", "in_progress", "done")[i % 3], "created_at": now - timedelta(minutes=i), "updated_at": now,
+            "completed_at": now if i % 3 == 2 else None,
+        } for i in range(n)])
+
+
+def timed(fn, repeat: int) -> float:
+    values = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    seed(engine, args.page_size)
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/api/tasks/" and "GET" in r.methods)
+    loop = asyncio.new_event_loop()
+    meta = dict(total=args.page_size, page=1, page_size=args.page_size, next_cursor=None, has_more=False)
+
+    with Session(engine) as db:
+        def fetch_orm():
+            db.expunge_all()
+            return db.execute(select(TaskORM).limit(args.page_size)).scalars().all()
+
+        def fetch_rows():
+            return db.execute(select(*EXPORT_COLUMNS).limit(args.page_size)).all()
+
+        entities, plain = fetch_orm(), fetch_rows()
+
+        def before():
+            content = TaskList(items=entities, **meta)
+            body = loop.run_until_complete(serialize_response(field=route.response_field, response_content=content))
+            return JSONResponse(body).body
+
+        def after():
+            return FastJSONResponse({"items": rows(plain), **meta}).body
+
+        assert len(before()) > 0 and len(after()) > 0
+        results = [
+            ("fetch ORM entities", timed(fetch_orm, args.repeat)),
+            ("fetch column rows", timed(fetch_rows, args.repeat)),
+            ("serialize before", timed(before, args.repeat)),
+            ("serialize after (orjson)", timed(after, args.repeat)),
+        ]
+        orjson, responses.orjson = responses.orjson, None
+        results.append(("serialize after (pydantic-core)", timed(after, args.repeat)))
+        responses.orjson = orjson
+
+    for name, us in results:
+        print(f"{name:32} {us:9.1f} us  ({us / args.page_size:6.2f} us/task)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Time-series analytics at 1M tasks for one user: daily rollups vs scanning tasks.
+
+    python -m benchmarks.bench_timeseries --tasks 1000000 --days 30 90 365
+
+Seeds three years of history (created_at, completed_at for ~70% done), fills the rollups with
+rebuild_daily_stats (the backfill job, timed too), then reports p50/p95 of throughput, lead-time
+and burndown for a range ending today, next to the same throughput answered by a GROUP BY scan.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.repo.timeseries import burndown, lead_time, rebuild_daily_stats, throughput
+
+HISTORY_DAYS = 3 * 365
+
+
+def seed(engine, n_tasks: int) -> None:
+    rnd = random.Random(11)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(UserORM).values(id=1, email="bench@example.com", password_hash="x", created_at=now))
+        batch = []
+        for i in range(n_tasks):
+            created = now - timedelta(seconds=rnd.randrange(HISTORY_DAYS * 86400))
+            done = rnd.random() < 0.7
+            completed = min(now, created + timedelta(seconds=int(rnd.lognormvariate(11, 1.5)))) if done else None
+            batch.append({
+                "user_id": 1, "title": f"task {i}", "priority": "medium",
+                "status": "done" if done else "todo", "created_at": created, "updated_at": created,
+                "completed_at": completed,
+            })
+            if len(batch) == 20_000:
+                conn.execute(insert(TaskORM), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(TaskORM), batch)
+
+
+def scan_throughput(db: Session, user_id: int, date_from, date_to):
+    # what the endpoint would cost without rollups (created only; completed is a second scan)
+    day = func.date(TaskORM.created_at)
+    return db.execute(
+        select(day, func.count()).where(
+            TaskORM.user_id == user_id,
+            TaskORM.created_at >= datetime.combine(date_from, datetime.min.time()),
+            TaskORM.created_at < datetime.combine(date_to + timedelta(days=1), datetime.min.time()),
+        ).group_by(day)
+    ).all()
+
+
+def percentiles(fn, repeat: int):
+    values = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - t0) * 1000)
+    values.sort()
+    return statistics.median(values), values[min(len(values) - 1, int(0.95 * len(values)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90, 365])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'timeseries.sqlite3')}")
+    Base.metadata.create_all(engine)
+    t0 = time.perf_counter()
+    seed(engine, args.tasks)
+    print(f"seeded {args.tasks} tasks in {time.perf_counter() - t0:.1f}s")
+
+    with Session(engine) as db:
+        t0 = time.perf_counter()
+        rebuild_daily_stats(db, 1)
+        db.commit()
+        print(f"rebuild_daily_stats: {time.perf_counter() - t0:.1f}s")
+
+        today = datetime.now(timezone.utc).date()
+        for days in args.days:
+            date_from = today - timedelta(days=days - 1)
+            line = [f"{days:4} days:"]
+            for name, fn in (("throughput", throughput), ("lead-time", lead_time), ("burndown", burndown),
+                             ("scan (created)", scan_throughput)):
+                p50, p95 = percentiles(lambda: fn(db, 1, date_from, today), args.repeat if fn is not scan_throughput else 5)
+                line.append(f"{name} p50={p50:7.2f}ms p95={p95:7.2f}ms")
+            print("  ".join(line))
+
+
+if __name__ == "__main__":
+    main()
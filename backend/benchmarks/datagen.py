@@ -0,0 +1,117 @@
+"""Synthetic data: N users x M tasks with realistic status, priority and due-date distributions.
+
+    python -m benchmarks.datagen --db /tmp/bench.sqlite3 --users 50 --tasks 2000 [--seed 7]
+
+Every user gets the password "secret123" (one pbkdf2 hash, reused) and the email
+user<i>@bench.local. Tasks are bulk inserted; the FTS index follows through its triggers, and the
+counters and daily rollups are rebuilt per user afterwards, so reads see what a live database
+would have. The same seed gives the same data.
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.auth.security import hash_password
+from app.infra import search  # noqa: F401  (registers the FTS5 table and triggers with create_all)
+from app.infra.db import Base
+from app.infra.models import TaskORM, UserORM
+from app.repo.analytics import rebuild_counters
+from app.repo.timeseries import rebuild_daily_stats
+
+PASSWORD = "secret123"
+
+STATUSES = (("todo", 0.45), ("in_progress", 0.20), ("done", 0.35))
+PRIORITIES = (("low", 0.25), ("medium", 0.45), ("high", 0.22), ("urgent", 0.08))
+NO_DUE_DATE = 0.25
+HISTORY_DAYS = 365
+
+VERBS = ("fix", "review", "write", "update", "deploy", "test", "plan", "refactor", "document", "migrate", "call", "prepare")
+NOUNS = (
+    "invoice", "report", "release", "login page", "database", "backup", "budget", "roadmap", "onboarding",
+    "newsletter", "dashboard", "search", "calendar", "payment flow", "api docs", "analytics", "sprint demo",
+)
+WORDS = ("customer", "urgent", "weekly", "draft", "q3", "team", "client", "mobile", "staging", "security", "design")
+
+
+def email(i: int) -> str:
+    return f"user{i}@bench.local"
+
+
+def _pick(rnd: random.Random, weighted) -> str:
+    values, weights = zip(*weighted)
+    return rnd.choices(values, weights)[0]
+
+
+def task_row(rnd: random.Random, user_id: int, now: datetime, today: date) -> dict:
+    created = now - timedelta(seconds=int(HISTORY_DAYS * 86400 * rnd.random() ** 2))  # recent tasks are more common
+    status = _pick(rnd, STATUSES)
+    due = None
+    if rnd.random() >= NO_DUE_DATE:
+        # around today: a few weeks either way, open tasks lean overdue now and then
+        due = today + timedelta(days=int(rnd.gauss(7, 21)))
+    completed = None
+    if status == "done":
+        completed = min(now, created + timedelta(seconds=int(rnd.lognormvariate(11, 1.4))))
+    title = f"{rnd.choice(VERBS).capitalize()} {rnd.choice(NOUNS)}"
+    description = None
+    if rnd.random() < 0.6:
+        description = " ".join(rnd.choice(WORDS + NOUNS) for _ in range(rnd.randint(4, 30)))
+    return {
+        "user_id": user_id, "title": title, "description": description, "due_date": due,
+        "priority": _pick(rnd, PRIORITIES), "status": status,
+        "created_at": created, "updated_at": completed or created, "completed_at": completed,
+    }
+
+
+def generate(engine, users: int, tasks_per_user: int, seed: int = 7, batch_size: int = 10_000) -> List[int]:
+    # returns the user ids; the schema must exist
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    password_hash = hash_password(PASSWORD)
+    with engine.begin() as conn:
+        ids = [
+            conn.execute(
+                insert(UserORM).values(email=email(i), password_hash=password_hash, created_at=now).returning(UserORM.id)
+            ).scalar_one()
+            for i in range(users)
+        ]
+        batch = []
+        for user_id in ids:
+            for _ in range(tasks_per_user):
+                batch.append(task_row(rnd, user_id, now, today))
+                if len(batch) == batch_size:
+                    conn.execute(insert(TaskORM), batch)
+                    batch.clear()
+        if batch:
+            conn.execute(insert(TaskORM), batch)
+    with Session(engine) as db:
+        for user_id in ids:
+            rebuild_counters(db, user_id, today)
+            rebuild_daily_stats(db, user_id)
+        db.commit()
+    return ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", required=True, help="SQLite file to create (must not hold other data)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=2000, help="tasks per user")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    Base.metadata.create_all(engine)
+    t0 = time.perf_counter()
+    generate(engine, args.users, args.tasks, args.seed)
+    print(f"{args.users} users x {args.tasks} tasks in {time.perf_counter() - t0:.1f}s -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Benchmark suite: seeded SQLite database, in-process ASGI load, JSON report.
+
+    python -m benchmarks.suite --users 50 --tasks 2000 --requests 1000 --concurrency 20 --out before.json
+    python -m benchmarks.suite ... --baseline before.json    # same run, p50/p95/rps relative to before.json
+
+Everything runs locally: the database is a fresh SQLite file (benchmarks.datagen, fixed seed),
+requests go through httpx.ASGITransport into app.main.app with its middleware, no sockets.
+Scenarios (--scenarios to pick):
+  board       GET /api/tasks/ like the Board page (page of 50, random status/priority filter, created_at or due_date sort)
+  search      GET /api/tasks/?q=<word> (FTS5)
+  calendar    GET /api/tasks/calendar for a 6-week month view
+  bulk_status POST /api/tasks/bulk/status, 50 of the user's tasks to a random status
+  login_storm POST /api/auth/login (pbkdf2 in the hashing pool; 503s are counted, not errors)
+Each scenario reports req/s, p50/p95/p99 in ms and the status codes. The report includes the
+commit, Python and SQLite versions and the parameters, so runs on different commits compare.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+# always a throwaway file: an exported DATABASE_URL/DATABASE_READ_URL must not get the seed data
+os.environ["DATABASE_URL"] = os.environ["DATABASE_READ_URL"] = (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_suite.sqlite3')}"
+)
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.auth.security import create_access_token  # noqa: E402
+from app.infra import instrumentation  # noqa: E402
+from app.infra.db import Base, engine  # noqa: E402
+from app.infra.models import TaskORM  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks import datagen  # noqa: E402
+
+SCENARIOS = ("board", "search", "calendar", "bulk_status", "login_storm")
+SEARCH_WORDS = ("invoice", "release", "budget", "dashboard", "customer", "security", "roadmap", "report")
+BULK_SIZE = 50
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))]
+
+
+class Context:
+    def __init__(self, user_ids, rnd: random.Random):
+        self.users = [(i, user_id) for i, user_id in enumerate(user_ids)]
+        self.tokens = {
+            user_id: {"Authorization": f"Bearer {create_access_token({'sub': datagen.email(i)})}"}
+            for i, user_id in self.users
+        }
+        self.task_ids = {}
+        with engine.connect() as conn:
+            for _, user_id in self.users:
+                self.task_ids[user_id] = conn.execute(select(TaskORM.id).where(TaskORM.user_id == user_id)).scalars().all()
+        self.rnd = rnd
+
+    def user(self):
+        return self.rnd.choice(self.users)
+
+
+def board(ctx: Context):
+    _, user_id = ctx.user()
+    params = {"page_size": 50, "sort": ctx.rnd.choice(("created_at", "due_date"))}
+    if ctx.rnd.random() < 0.5:
+        params["status"] = ctx.rnd.choice(("todo", "in_progress", "done"))
+    if ctx.rnd.random() < 0.3:
+        params["priority"] = ctx.rnd.choice(("low", "medium", "high", "urgent"))
+    return "GET", "/api/tasks/", {"params": params, "headers": ctx.tokens[user_id]}
+
+
+def search(ctx: Context):
+    _, user_id = ctx.user()
+    params = {"q": ctx.rnd.choice(SEARCH_WORDS), "page_size": 20}
+    return "GET", "/api/tasks/", {"params": params, "headers": ctx.tokens[user_id]}
+
+
+def calendar(ctx: Context):
+    _, user_id = ctx.user()
+    today = date.today()
+    start = today.replace(day=1) + timedelta(days=31 * ctx.rnd.randint(-2, 1))
+    start = start.replace(day=1) - timedelta(days=start.replace(day=1).weekday())
+    params = {"from": start.isoformat(), "to": (start + timedelta(days=41)).isoformat(), "per_day": 10}
+    return "GET", "/api/tasks/calendar", {"params": params, "headers": ctx.tokens[user_id]}
+
+
+def bulk_status(ctx: Context):
+    _, user_id = ctx.user()
+    ids = ctx.rnd.sample(ctx.task_ids[user_id], min(BULK_SIZE, len(ctx.task_ids[user_id])))
+    body = {"ids": ids, "status": ctx.rnd.choice(("todo", "in_progress", "done"))}
+    return "POST", "/api/tasks/bulk/status", {"json": body, "headers": ctx.tokens[user_id]}
+
+
+def login_storm(ctx: Context):
+    i, _ = ctx.user()
+    return "POST", "/api/auth/login", {"data": {"username": datagen.email(i), "password": datagen.PASSWORD}}
+
+
+BUILDERS = {"board": board, "search": search, "calendar": calendar, "bulk_status": bulk_status, "login_storm": login_storm}
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, name: str, requests: int, concurrency: int) -> dict:
+    build = BUILDERS[name]
+    latencies, statuses = [], Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            method, path, kwargs = build(ctx)
+            t0 = time.perf_counter()
+            r = await client.request(method, path, **kwargs)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses[r.status_code] += 1
+
+    for _ in range(min(20, requests)):  # warm up caches and connections
+        method, path, kwargs = build(ctx)
+        await client.request(method, path, **kwargs)
+    slow = instrumentation.slow_queries.value
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    ok = [code for code in statuses if code < 400 or (name == "login_storm" and code == 503)]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "errors": sum(n for code, n in statuses.items() if code not in ok),
+        # statements over SLOW_QUERY_MS; on write scenarios mostly BEGIN IMMEDIATE waiting for the lock
+        "slow_queries": int(instrumentation.slow_queries.value - slow),
+    }
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(report: dict, baseline: dict) -> None:
+    for name, result in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        ratios = "  ".join(
+            f"{key}={result[key] / before[key]:.2f}x" for key in ("rps", "p50_ms", "p95_ms", "p99_ms") if before.get(key)
+        )
+        print(f"{name:12} vs {baseline.get('commit', '?')}: {ratios}", file=sys.stderr)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=2000, help="tasks per user")
+    parser.add_argument("--requests", type=int, default=1000, help="per scenario")
+    parser.add_argument("--login-requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier report to compare against (printed to stderr)")
+    args = parser.parse_args()
+    logging.getLogger("app.sql").setLevel(logging.ERROR)  # counted in the report instead
+
+    Base.metadata.create_all(bind=engine)
+    t0 = time.perf_counter()
+    user_ids = datagen.generate(engine, args.users, args.tasks, args.seed)
+    seeded = time.perf_counter() - t0
+    ctx = Context(user_ids, random.Random(args.seed))
+
+    report = {
+        "commit": _commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "params": {
+            "users": args.users, "tasks_per_user": args.tasks, "requests": args.requests,
+            "login_requests": args.login_requests, "concurrency": args.concurrency, "seed": args.seed,
+        },
+        "seed_seconds": round(seeded, 2),
+        "scenarios": {},
+    }
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in args.scenarios:
+            requests = args.login_requests if name == "login_storm" else args.requests
+            report["scenarios"][name] = await run_scenario(client, ctx, name, requests, args.concurrency)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
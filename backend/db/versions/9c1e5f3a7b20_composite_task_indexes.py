@@ -0,0 +1,32 @@
+"""composite per-user task indexes
+
+Revision ID: 9c1e5f3a7b20
+Revises: 48770ad585bc
+Create Date: 2025-10-18 10:02:41.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e5f3a7b20'
+down_revision: Union[str, Sequence[str], None] = '48770ad585bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_tasks_user_due', 'tasks', ['user_id', 'due_date', 'id'], unique=False)
+    op.create_index('ix_tasks_user_status_due', 'tasks', ['user_id', 'status', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_status_due', table_name='tasks')
+    op.drop_index('ix_tasks_user_due', table_name='tasks')
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
@@ -0,0 +1,34 @@
+"""per-user task change version (ETag / conditional GET)
+
+Revision ID: a5c3e91b7d42
+Revises: e8b2c94f0d17
+Create Date: 2025-10-19 10:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c3e91b7d42'
+down_revision: Union[str, Sequence[str], None] = 'e8b2c94f0d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # no backfill: a missing row reads as version 0
+    op.create_table('task_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_versions')
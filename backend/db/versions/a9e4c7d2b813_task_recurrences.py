@@ -0,0 +1,54 @@
+"""recurring tasks: task_recurrences + tasks.recurrence_id/occurrence_date
+
+Revision ID: a9e4c7d2b813
+Revises: f1b6d2a9c437
+Create Date: 2025-10-29 10:12:44.183905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4c7d2b813'
+down_revision: Union[str, Sequence[str], None] = 'f1b6d2a9c437'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_recurrences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('rrule', sa.String(length=200), nullable=False),
+    sa.Column('dtstart', sa.Date(), nullable=False),
+    sa.Column('ends_on', sa.Date(), nullable=True),
+    sa.Column('exdates', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('task_id')
+    )
+    op.create_index(op.f('ix_task_recurrences_user_id'), 'task_recurrences', ['user_id'], unique=False)
+    for table in ('tasks', 'tasks_archive'):
+        op.add_column(table, sa.Column('recurrence_id', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('occurrence_date', sa.Date(), nullable=True))
+    op.create_index('ux_tasks_recurrence_occurrence', 'tasks', ['recurrence_id', 'occurrence_date'], unique=True)
+    op.create_index('ix_tasks_archive_recurrence', 'tasks_archive', ['recurrence_id', 'occurrence_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_archive_recurrence', table_name='tasks_archive')
+    op.drop_index('ux_tasks_recurrence_occurrence', table_name='tasks')
+    for table in ('tasks', 'tasks_archive'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('occurrence_date')
+            batch_op.drop_column('recurrence_id')
+    op.drop_index(op.f('ix_task_recurrences_user_id'), table_name='task_recurrences')
+    op.drop_table('task_recurrences')
@@ -0,0 +1,46 @@
+"""task change feed: tasks.change_seq + delete tombstones
+
+Revision ID: b7d1f40c2e65
+Revises: a5c3e91b7d42
+Create Date: 2025-10-19 13:47:09.560127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1f40c2e65'
+down_revision: Union[str, Sequence[str], None] = 'a5c3e91b7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing rows get 0: all of them show up in a first sync (no since)
+    op.add_column('tasks', sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_tasks_user_change_seq', 'tasks', ['user_id', 'change_seq', 'id'], unique=False)
+    op.create_table('task_tombstones',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_tombstones_user_change_seq', 'task_tombstones', ['user_id', 'change_seq', 'task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_tombstones_user_change_seq', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('ix_tasks_user_change_seq', table_name='tasks')
+    if op.get_bind().dialect.name == "sqlite":
+        # native DROP COLUMN (3.35+): a batch rebuild of tasks would lose the FTS triggers
+        op.execute("ALTER TABLE tasks DROP COLUMN change_seq")
+    else:
+        op.drop_column('tasks', 'change_seq')
@@ -0,0 +1,68 @@
+"""tasks.id AUTOINCREMENT (SQLite): ids of archived/deleted tasks are not handed out again
+
+Revision ID: c6e1a8f3d205
+Revises: b2d8f5a1c694
+Create Date: 2025-11-06 14:02:51.318440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1a8f3d205'
+down_revision: Union[str, Sequence[str], None] = 'b2d8f5a1c694'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# FTS5 index over tasks as of this revision (frozen copy, see e8b2c94f0d17)
+FTS5_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+
+def _rebuild(autoincrement: bool) -> None:
+    with op.batch_alter_table('tasks', recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    # reflection loses the DESC of this one
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    # dropping the old table dropped the FTS triggers
+    for stmt in FTS5_DDL:
+        op.execute(stmt)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres: ids come from a sequence and are never reused, nothing to do
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild(True)
+    # start above every id ever used: archived tasks and tombstones of deleted ones
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'tasks')"
+    )
+    op.execute(
+        "UPDATE sqlite_sequence SET seq = max(seq, "
+        "(SELECT coalesce(max(id), 0) FROM tasks_archive), (SELECT coalesce(max(task_id), 0) FROM task_tombstones)) "
+        "WHERE name = 'tasks'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild(False)
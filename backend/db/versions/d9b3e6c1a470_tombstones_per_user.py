@@ -0,0 +1,52 @@
+"""task_tombstones keyed by (user_id, task_id)
+
+Revision ID: d9b3e6c1a470
+Revises: c6e1a8f3d205
+Create Date: 2025-11-06 16:48:09.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b3e6c1a470'
+down_revision: Union[str, Sequence[str], None] = 'c6e1a8f3d205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild(*pk: str) -> None:
+    op.create_table('task_tombstones_new',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint(*pk)
+    )
+    op.execute(
+        "INSERT INTO task_tombstones_new (task_id, user_id, change_seq, deleted_at) "
+        "SELECT task_id, user_id, change_seq, deleted_at FROM task_tombstones"
+    )
+    op.drop_index('ix_task_tombstones_user_change_seq', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.rename_table('task_tombstones_new', 'task_tombstones')
+    op.create_index('ix_task_tombstones_user_change_seq', 'task_tombstones', ['user_id', 'change_seq', 'task_id'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rebuild('user_id', 'task_id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # one tombstone per id again: keep the latest delete
+    op.execute(
+        "DELETE FROM task_tombstones WHERE EXISTS (SELECT 1 FROM task_tombstones t2 "
+        "WHERE t2.task_id = task_tombstones.task_id AND t2.deleted_at > task_tombstones.deleted_at)"
+    )
+    _rebuild('task_id')
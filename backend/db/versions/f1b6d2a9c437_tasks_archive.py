@@ -0,0 +1,49 @@
+"""archive tier: tasks_archive + task_counters.archived
+
+Revision ID: f1b6d2a9c437
+Revises: c3f9a2d7e851
+Create Date: 2025-10-24 09:41:17.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d2a9c437'
+down_revision: Union[str, Sequence[str], None] = 'c3f9a2d7e851'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # filled by `python -m app.cli archive-tasks`
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_user_created', 'tasks_archive', ['user_id', 'created_at', 'id'], unique=False)
+    op.add_column('task_counters', sa.Column('archived', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('task_counters') as batch_op:
+        batch_op.drop_column('archived')
+    op.drop_index('ix_tasks_archive_user_created', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
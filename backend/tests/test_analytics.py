@@ -44,3 +44,118 @@ def test_analytics_summary_counts():
     assert data == {"active": 2, "done": 1, "overdue": 1}
 
 
+def test_summary_counters_roll_over_midnight_without_recount():
+    from uuid import uuid4
+    from app.infra.db import SessionLocal
+    from app.repo.analytics import counter_summary, summary_counts
+
+    token = register_and_login(email=f"counters_{uuid4().hex[:6]}@example.com")
+    user_id = client.get("/api/auth/me", headers=auth_headers(token)).json()["id"]
+    today = date.today()
+
+    for i, due in enumerate([today, today + timedelta(days=1), None]):
+        client.post("/api/tasks/", json={"title": f"c{i}", "due_date": due and due.isoformat()}, headers=auth_headers(token))
+
+    with SessionLocal() as db:
+        for days in (0, 1, 2):
+            day = today + timedelta(days=days)
+            assert counter_summary(db, user_id, day) == summary_counts(db, user_id, day)
+        assert counter_summary(db, user_id, today + timedelta(days=2)) == {"active": 1, "done": 0, "overdue": 2}
+
+    # writes and reads at "real" today move as_of back; counters must still agree
+    first = client.get("/api/tasks/", params={"sort": "due_date"}, headers=auth_headers(token)).json()["items"]
+    client.patch(f"/api/tasks/{first[-1]['id']}", json={"status": "done"}, headers=auth_headers(token))
+    assert client.get("/api/analytics/summary", headers=auth_headers(token)).json() == {"active": 2, "done": 1, "overdue": 0}
+
+    with SessionLocal() as db:
+        day = today + timedelta(days=5)
+        assert counter_summary(db, user_id, day) == summary_counts(db, user_id, day) == {"active": 1, "done": 1, "overdue": 1}
+
+
+
+
+def test_counters_follow_batched_changes_over_many_due_dates():
+    from uuid import uuid4
+    from app.infra.db import SessionLocal
+    from app.repo.analytics import CASE_MAX_DATES, counter_summary, summary_counts
+
+    token = register_and_login(email=f"batch_{uuid4().hex[:6]}@example.com")
+    headers = auth_headers(token)
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    today = date.today()
+    client.get("/api/analytics/summary", headers=headers)
+
+    def check():
+        with SessionLocal() as db:
+            for days in (-3, 0, 7, 40):
+                day = today + timedelta(days=days)
+                assert counter_summary(db, user_id, day) == summary_counts(db, user_id, day), day
+            counter_summary(db, user_id, today)
+
+    # few dates (CASE in the UPDATE) and many dates (overdue split in Python)
+    for n_dates in (3, CASE_MAX_DATES * 2):
+        items = [
+            {"title": f"b{i}", "due_date": (today + timedelta(days=i % n_dates - n_dates // 2)).isoformat()}
+            for i in range(n_dates * 2)
+        ]
+        ids = [r["id"] for r in client.post("/api/tasks/bulk/create", json={"items": items}, headers=headers).json()["results"]]
+        check()
+        client.post("/api/tasks/bulk/status", json={"ids": ids[::3], "status": "done"}, headers=headers)
+        check()
+        client.post("/api/tasks/bulk/delete", json={"ids": ids[1::2]}, headers=headers)
+        check()
+
+
+def test_time_series_from_daily_rollups():
+    from datetime import datetime, timezone
+    from uuid import uuid4
+    from app.infra.db import SessionLocal
+    from app.infra.models import TaskORM
+    from app.repo.timeseries import apply_daily_changes, lead_time, rebuild_daily_stats, throughput
+
+    headers = auth_headers(register_and_login(email=f"ts_{uuid4().hex[:6]}@example.com"))
+    today = datetime.now(timezone.utc).date()
+    params = {"from": (today - timedelta(days=2)).isoformat(), "to": today.isoformat()}
+
+    ids = [r["id"] for r in client.post(
+        "/api/tasks/bulk/create", json={"items": [{"title": f"t{i}"} for i in range(5)]}, headers=headers,
+    ).json()["results"]]
+    client.post("/api/tasks/bulk/status", json={"ids": ids[:2], "status": "done"}, headers=headers)
+    client.patch(f"/api/tasks/{ids[2]}", json={"status": "done"}, headers=headers)
+    client.patch(f"/api/tasks/{ids[2]}", json={"status": "todo"}, headers=headers)  # reopened
+    client.delete(f"/api/tasks/{ids[3]}", headers=headers)
+
+    r = client.get("/api/analytics/throughput", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    days = r.json()["days"]
+    assert [d["date"] for d in days] == [(today - timedelta(days=i)).isoformat() for i in (2, 1, 0)]
+    assert days[-1] == {"date": today.isoformat(), "created": 5, "completed": 3} and days[0]["created"] == 0
+
+    burndown = client.get("/api/analytics/burndown", params=params, headers=headers).json()["days"]
+    assert [d["open"] for d in burndown] == [0, 0, 2]  # t2 (reopened) and t4
+
+    lead = client.get("/api/analytics/lead-time", params=params, headers=headers).json()
+    assert lead["count"] == 3 and lead["p50"] is not None and lead["p95"] < 0.01
+
+    assert client.get("/api/analytics/burndown", params={"from": params["to"], "to": params["from"]}, headers=headers).status_code == 400
+
+    with SessionLocal() as db:
+        user_id = db.get(TaskORM, ids[0]).user_id
+        # the repair job rebuilds the same picture from the tasks as they are now (the delete and
+        # the reopen are history it cannot see)
+        rebuild_daily_stats(db, user_id)
+        db.commit()
+        assert throughput(db, user_id, today, today) == [{"date": today, "created": 4, "completed": 2}]
+        assert client.get("/api/analytics/burndown", params=params, headers=headers).json()["days"][-1]["open"] == 2
+
+        # percentiles from the log-scale histogram: within a bucket (~19%) of the exact value
+        now = datetime.now(timezone.utc)
+        day = now.date() + timedelta(days=30)
+        now = datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)
+        hours = [1] * 50 + [10] * 40 + [100] * 10
+        apply_daily_changes(db, user_id, [("todo", "done", now - timedelta(hours=h)) for h in hours], now)
+        stats = lead_time(db, user_id, day, day)
+        assert stats["count"] == 100
+        for p, exact in ((50, 1), (90, 10), (95, 100)):
+            assert abs(stats[f"p{p}"] - exact) / exact < 0.1, stats
+        db.rollback()
@@ -0,0 +1,114 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.infra.db import Base, SessionLocal, engine
+from app.infra.models import TaskArchiveORM, TaskORM, UserORM
+from app.main import app
+from app.repo.analytics import counter_summary, rebuild_counters
+from app.repo.archive import archive_done_tasks
+from app.repo.timeseries import rebuild_daily_stats, throughput
+
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+
+def test_archive_moves_old_done_tasks_and_include_archived_sees_them():
+    email = f"archive_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    ids = {}
+    for title in ("old invoice", "recent invoice", "open invoice", "newest"):
+        ids[title] = client.post("/api/tasks/", json={"title": title}, headers=headers).json()["id"]
+    for title in ("old invoice", "recent invoice"):
+        client.patch(f"/api/tasks/{ids[title]}", json={"status": "done"}, headers=headers)
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        db.execute(update(TaskORM).where(TaskORM.id == ids["old invoice"]).values(completed_at=now - timedelta(days=200)))
+        db.commit()
+    assert client.get("/api/analytics/summary", headers=headers).json() == {"active": 2, "done": 2, "overdue": 0}
+    feed = client.get("/api/tasks/changes", headers=headers).json()["next_token"]
+    etag = client.get("/api/tasks/", headers=headers).headers["ETag"]
+
+    with SessionLocal() as db:
+        user_id = db.scalar(select(UserORM.id).where(UserORM.email == email))
+        before = throughput(db, user_id, now.date() - timedelta(days=1), now.date())
+        assert archive_done_tasks(db, older_than_days=90, batch_size=1, user_id=user_id) == {user_id: 1}
+        assert archive_done_tasks(db, older_than_days=90, user_id=user_id) == {}
+        assert db.get(TaskORM, ids["old invoice"]) is None
+        assert db.get(TaskArchiveORM, ids["old invoice"]).title == "old invoice"
+
+    def titles(**params):
+        r = client.get("/api/tasks/", params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        return [t["title"] for t in r.json()["items"]], r.json()["total"]
+
+    # hot list, ETag and change feed: the archived task is gone
+    assert client.get("/api/tasks/", headers={**headers, "If-None-Match": etag}).status_code == 200
+    assert titles() == (["newest", "open invoice", "recent invoice"], 3)
+    assert client.get("/api/tasks/changes", params={"since": feed}, headers=headers).json()["deleted"] == [ids["old invoice"]]
+    assert client.get(f"/api/tasks/{ids['old invoice']}", headers=headers).status_code == 404
+
+    # include_archived: same filters, sorts, search and cursor paging over both tables
+    assert titles(include_archived=True) == (["newest", "open invoice", "recent invoice", "old invoice"], 4)
+    assert titles(include_archived=True, status="done", with_total="estimate") == (["recent invoice", "old invoice"], 2)
+    assert titles(include_archived=True, q="old")[0] == ["old invoice"]
+    seen, cursor = [], None
+    while True:
+        params = {"include_archived": True, "page_size": 3, "sort": "due_date", **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/tasks/", params=params, headers=headers).json()
+        seen += [t["id"] for t in page["items"]]
+        if not (cursor := page["next_cursor"]):
+            break
+    assert sorted(seen) == sorted(ids.values())
+
+    export = client.get("/api/tasks/export", params={"include_archived": True, "status": "done"}, headers=headers)
+    assert sorted(json.loads(line)["title"] for line in export.text.splitlines()) == ["old invoice", "recent invoice"]
+
+    # summary: archived tasks leave `done` unless asked for, the counters agree with a rebuild
+    assert client.get("/api/analytics/summary", headers=headers).json() == {"active": 2, "done": 1, "overdue": 0}
+    assert client.get("/api/analytics/summary", params={"include_archived": True}, headers=headers).json() == {
+        "active": 2, "done": 2, "overdue": 0, "archived": 1,
+    }
+    with SessionLocal() as db:
+        today = date.today()
+        assert counter_summary(db, user_id, today) == {"active": 2, "done": 1, "overdue": 0}
+        rebuild_counters(db, user_id, today)
+        db.commit()
+        assert client.get("/api/analytics/summary", params={"include_archived": True}, headers=headers).json()["archived"] == 1
+        # the daily rollups keep the archived task's history, a rebuild reads the archive too
+        assert throughput(db, user_id, now.date() - timedelta(days=1), now.date()) == before
+        rebuild_daily_stats(db, user_id)
+        db.commit()
+        assert sum(d["created"] for d in throughput(db, user_id, now.date() - timedelta(days=1), now.date())) == 4
+
+
+def test_ids_of_archived_tasks_are_not_handed_out_again():
+    email = f"archive_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    ids = [client.post("/api/tasks/", json={"title": f"task {i}"}, headers=headers).json()["id"] for i in range(4)]
+    for task_id in ids[1:3]:
+        client.patch(f"/api/tasks/{task_id}", json={"status": "done"}, headers=headers)
+    with SessionLocal() as db:
+        db.execute(update(TaskORM).where(TaskORM.id.in_(ids[1:3])).values(completed_at=datetime.now(timezone.utc) - timedelta(days=200)))
+        db.commit()
+        user_id = db.scalar(select(UserORM.id).where(UserORM.email == email))
+        assert archive_done_tasks(db, older_than_days=90, user_id=user_id) == {user_id: 2}
+
+    # the highest id goes too: the next task still gets a new one
+    assert client.delete(f"/api/tasks/{ids[3]}", headers=headers).status_code == 204
+    fresh = client.post("/api/tasks/", json={"title": "fresh"}, headers=headers).json()["id"]
+    assert fresh > ids[3]
+    listed = [t["id"] for t in client.get("/api/tasks/", params={"include_archived": True}, headers=headers).json()["items"]]
+    assert sorted(listed) == sorted([ids[0], ids[1], ids[2], fresh])
+
+    client.patch(f"/api/tasks/{fresh}", json={"status": "done"}, headers=headers)
+    with SessionLocal() as db:
+        db.execute(update(TaskORM).where(TaskORM.id == fresh).values(completed_at=datetime.now(timezone.utc) - timedelta(days=200)))
+        db.commit()
+        assert archive_done_tasks(db, older_than_days=90, user_id=user_id) == {user_id: 1}
@@ -0,0 +1,56 @@
+from uuid import uuid4
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.auth.cache import user_cache
+from app.infra.db import engine
+from app.main import include_routers
+
+
+async_app = FastAPI()
+include_routers(async_app, async_mode=True)
+client = TestClient(async_app)
+
+
+def test_async_routes_serve_the_same_api():
+    assert next(r for r in async_app.routes if getattr(r, "path", None) == "/api/tasks/").endpoint.__module__ == "app.api.tasks_async"
+
+    email = f"async_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    assert r.status_code == 201, r.text
+    r = client.post("/api/auth/login", data={"username": email, "password": "secret123"})
+    assert r.status_code == 200, r.text
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    assert client.get("/api/auth/me", headers=headers).json()["email"] == email
+
+    r = client.post("/api/tasks/", json={"title": "async task", "priority": "high"}, headers=headers)
+    assert r.status_code == 201, r.text
+    task_id = r.json()["id"]
+
+    data = client.get("/api/tasks/", params={"q": "async"}, headers=headers).json()
+    assert [it["id"] for it in data["items"]] == [task_id]
+
+    r = client.patch(f"/api/tasks/{task_id}", json={"status": "done"}, headers=headers)
+    assert r.json()["completed_at"] is not None
+    assert client.get("/api/analytics/summary", headers=headers).json() == {"active": 0, "done": 1, "overdue": 0}
+
+    assert client.delete(f"/api/tasks/{task_id}", headers=headers).status_code == 204
+    assert client.get(f"/api/tasks/{task_id}", headers=headers).status_code == 404
+
+
+def test_async_reads_do_not_wait_for_the_write_lock():
+    email = f"async_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    task_id = client.post("/api/tasks/", json={"title": "read under lock"}, headers=headers).json()["id"]
+    client.get("/api/analytics/summary", headers=headers)  # builds the counters (a write)
+    user_cache.clear()
+
+    # a writer holds BEGIN IMMEDIATE: GETs, the user lookup and login go through the read pool
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET full_name = 'writer' WHERE email = :e"), {"e": email})
+        assert [it["id"] for it in client.get("/api/tasks/", headers=headers).json()["items"]] == [task_id]
+        assert client.get(f"/api/tasks/{task_id}", headers=headers).status_code == 200
+        assert client.get("/api/analytics/summary", headers=headers).json()["active"] == 1
+        assert client.get("/api/auth/me", headers=headers).json()["full_name"] is None
+        assert client.post("/api/auth/login", data={"username": email, "password": "secret123"}).status_code == 200
@@ -42,3 +42,118 @@ def test_register_duplicate_email_returns_email_taken():
     r2 = client.post("/api/auth/register", json={"email": email, "password": password})
     assert r2.status_code == 400, r2.text
     assert r2.json().get("detail") == "email_taken"
+
+
+def test_identity_cache_skips_user_lookup_and_drops_deleted_user():
+    from sqlalchemy import event
+    from app.auth.cache import user_cache
+    from app.infra.db import SessionLocal, read_engine
+    from app.infra.models import UserORM
+
+    email = f"cached_{uuid4().hex[:6]}@example.com"
+    access = client.post("/api/auth/register", json={"email": email, "password": "secret123"}).json()["access"]
+    headers = {"Authorization": f"Bearer {access}"}
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+    assert user_cache.get(email) is not None
+
+    user_queries = []
+
+    def count_user_queries(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            user_queries.append(statement)
+
+    engines = {engine, read_engine}
+    for e in engines:
+        event.listen(e, "before_cursor_execute", count_user_queries)
+    try:
+        assert client.get("/api/tasks/", headers=headers).status_code == 200
+        assert client.get("/api/analytics/summary", headers=headers).status_code == 200
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", count_user_queries)
+    assert user_queries == []
+
+    with SessionLocal() as db:
+        db.delete(db.query(UserORM).filter(UserORM.email == email).one())
+        db.commit()
+    assert user_cache.get(email) is None
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+
+
+def test_password_hashing_runs_in_bounded_pool(monkeypatch):
+    from app.auth import hashing
+
+    email = f"pool_{uuid4().hex[:6]}@example.com"
+    before = hashing.hash_latency.count
+    assert client.post("/api/auth/register", json={"email": email, "password": "secret123"}).status_code == 201
+    assert client.post("/api/auth/login", data={"username": email, "password": "secret123"}).status_code == 200
+    assert hashing.hash_latency.count == before + 2
+    assert hashing.hash_queue_wait.count >= 2
+
+    # saturated pool: fail fast instead of queueing
+    monkeypatch.setattr(hashing, "HASH_QUEUE_LIMIT", 0)
+    rejected = hashing.hash_rejected.value
+    r = client.post("/api/auth/login", data={"username": email, "password": "secret123"})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert hashing.hash_rejected.value == rejected + 1
+
+
+def test_verified_claims_cached_until_exp(monkeypatch):
+    import time
+    from types import SimpleNamespace
+    from jose import jwt
+    from app.auth import cache, security
+
+    calls = []
+    decode = security._decode
+    monkeypatch.setattr(security, "_decode", lambda token: calls.append(token) or decode(token))
+    security.token_cache.clear()
+
+    email = f"claims_{uuid4().hex[:6]}@example.com"
+    access = client.post("/api/auth/register", json={"email": email, "password": "secret123"}).json()["access"]
+    headers = {"Authorization": f"Bearer {access}"}
+    for _ in range(3):
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert calls == [access]
+
+    # the entry lives only until the token's exp: past it (the cache's clock moved on), the token
+    # is verified again, and rejected by the decoder once really expired (test_native_decode_matches_jose)
+    short = jwt.encode({"sub": email, "exp": int(time.time()) + 60}, security.JWT_SECRET, algorithm=security.ALGORITHM)
+    for _ in range(2):
+        assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {short}"}).status_code == 200
+    assert calls == [access, short]
+    later = time.monotonic() + 61
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: later))
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {short}"}).status_code == 200
+    assert calls == [access, short, short]
+
+
+def test_native_decode_matches_jose():
+    import time
+    from jose import jwt
+    from app.auth import security
+
+    secret, now = security.JWT_SECRET, int(time.time())
+    valid = jwt.encode({"sub": "a@example.com", "exp": now + 60}, secret, algorithm="HS256")
+    header, payload, signature = valid.split(".")
+    forged = jwt.encode({"sub": "b@example.com", "exp": now + 60}, secret, algorithm="HS256").split(".")[1]
+    cases = {
+        "valid": valid,
+        "tampered": f"{header}.{forged}.{signature}",
+        "other secret": jwt.encode({"sub": "a@example.com"}, "not-the-secret", algorithm="HS256"),
+        "expired": jwt.encode({"sub": "a@example.com", "exp": now - 5}, secret, algorithm="HS256"),
+        "not yet valid": jwt.encode({"sub": "a@example.com", "nbf": now + 60}, secret, algorithm="HS256"),
+        "HS512": jwt.encode({"sub": "a@example.com"}, secret, algorithm="HS512"),
+        "alg none": "eyJhbGciOiJub25lIiwidHlwIjoiSldUIn0." + payload + ".",
+        "garbage": "not.a.token",
+    }
+    for name, token in cases.items():
+        outcomes = []
+        for decode in (security._decode_jose, security._decode_native):
+            try:
+                outcomes.append(decode(token))
+            except security.TokenError:
+                outcomes.append("rejected")
+        assert outcomes[0] == outcomes[1], name
+        assert (outcomes[0] != "rejected") == (name == "valid"), name
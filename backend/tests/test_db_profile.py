@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.infra.db import SQLITE_PRAGMAS, configure_sqlite
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.sqlite3'}"
+    writer = create_engine(url, connect_args={"check_same_thread": False})
+    reader = create_engine(url, connect_args={"check_same_thread": False})
+    configure_sqlite(writer)
+    configure_sqlite(reader, read_only=True)
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE counter (id INTEGER PRIMARY KEY, n INTEGER NOT NULL)"))
+        conn.execute(text("INSERT INTO counter VALUES (1, 0)"))
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def test_pragmas_are_set_per_connection(engines):
+    writer, reader = engines
+    with writer.connect() as conn:
+        pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == SQLITE_PRAGMAS["busy_timeout"]
+        assert pragma("cache_size") == SQLITE_PRAGMAS["cache_size"]
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("query_only") == 0
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("UPDATE counter SET n = n + 1"))
+
+
+def test_readers_see_committed_state_while_writers_hold_the_lock(engines):
+    writer, reader = engines
+    with writer.begin() as w:
+        w.execute(text("UPDATE counter SET n = 1"))
+        # WAL: the reader does not wait for the open write transaction
+        with reader.connect() as r:
+            assert r.execute(text("SELECT n FROM counter")).scalar() == 0
+    with reader.connect() as r:
+        assert r.execute(text("SELECT n FROM counter")).scalar() == 1
+
+
+def test_concurrent_read_then_write_transactions_do_not_fail(engines):
+    writer, _ = engines
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                # read first, write later in the same transaction: with a deferred BEGIN this can
+                # fail with "database is locked" on the lock upgrade; BEGIN IMMEDIATE queues instead
+                with writer.begin() as conn:
+                    n = conn.execute(text("SELECT n FROM counter WHERE id = 1")).scalar()
+                    conn.execute(text("UPDATE counter SET n = :n WHERE id = 1"), {"n": n + 1})
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with writer.connect() as conn:
+        assert conn.execute(text("SELECT n FROM counter")).scalar() == 8 * 20
@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.infra import events
+from app.infra.db import Base, engine
+from app.infra.events import EventBus
+from app.main import app
+
+Base.metadata.create_all(bind=engine)
+
+client = TestClient(app)
+
+
+def _drain(sub):
+    out = []
+    while len(sub):
+        out.append(sub._queue.popleft())
+    return out
+
+
+def test_bus_delivers_only_to_the_users_subscribers():
+    async def run():
+        bus = EventBus()
+        a, b = bus.subscribe(1), bus.subscribe(2)
+        assert bus.publish(1, {"type": "created", "seq": 1}) == 1
+        assert await a.get(timeout=1) == {"type": "created", "seq": 1}
+        assert await b.get(timeout=0.01) is None
+        a.close(); b.close()
+        assert not bus.has_subscribers(1) and bus.publish(1, {"type": "created"}) == 0
+
+    asyncio.run(run())
+
+
+def test_bus_policies_when_a_subscriber_falls_behind():
+    async def run():
+        bus = EventBus()
+        resync = bus.subscribe(1, maxsize=3, policy="resync")
+        oldest = bus.subscribe(1, maxsize=3, policy="drop_oldest")
+        disconnect = bus.subscribe(1, maxsize=3, policy="disconnect")
+        for seq in range(1, 6):
+            bus.publish(1, {"type": "updated", "seq": seq})
+
+        # backlog replaced by a single resync marker; later events are skipped until it is read
+        assert [e["type"] for e in _drain(resync)] == ["resync"]
+        assert [e["seq"] for e in _drain(oldest)] == [3, 4, 5]
+        assert disconnect.closed and await disconnect.get(timeout=1) is None
+        resync.close(); oldest.close()
+
+    asyncio.run(run())
+
+
+def test_bus_publish_from_another_thread():
+    async def run():
+        bus = EventBus()
+        sub = bus.subscribe(1)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, bus.publish, 1, {"type": "deleted", "seq": 7, "id": 3})
+        assert await sub.get(timeout=1) == {"type": "deleted", "seq": 7, "id": 3}
+        sub.close()
+
+    asyncio.run(run())
+
+
+def _login(email: str) -> str:
+    client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    r = client.post("/api/auth/login", data={"username": email, "password": "secret123"})
+    return r.json()["access"]
+
+
+async def _sse(path: str, writes) -> list:
+    # drive the ASGI app by hand: TestClient would wait for the (endless) body to finish
+    sent: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+    first = True
+
+    async def receive():
+        nonlocal first
+        if first:
+            first = False
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    app_task = asyncio.create_task(app(scope, receive, sent.put))
+    start = await asyncio.wait_for(sent.get(), 5)
+    assert start["status"] == 200
+    assert dict(start["headers"])[b"content-type"].startswith(b"text/event-stream")
+
+    loop = asyncio.get_running_loop()
+    found, buf = [], ""
+    for write, expected in writes:
+        # writes go through the sync endpoints on another thread, like a threadpool request would
+        await loop.run_in_executor(None, write)
+        while True:
+            msg = await asyncio.wait_for(sent.get(), 5)
+            buf += msg.get("body", b"").decode()
+            frames = buf.split("\n\n")
+            buf = frames.pop()
+            events_ = [f for f in frames if f.startswith("event: ")]
+            found += events_
+            if any(f.startswith(f"event: {expected}") for f in events_):
+                break
+    disconnected.set()
+    await asyncio.wait_for(app_task, 5)
+    return [(f.split("\n")[0][len("event: "):], json.loads(f.split("\n")[-1][len("data: "):])) for f in found]
+
+
+def test_sse_stream_pushes_task_events(monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_HEARTBEAT", 0.05)
+    token = _login("events@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/tasks/events").status_code == 401
+    assert client.get("/api/tasks/events", params={"token": "garbage"}).status_code == 401
+
+    task = {}
+    create = lambda: task.update(client.post("/api/tasks/", json={"title": "pushed"}, headers=headers).json())
+    done = lambda: client.patch(f"/api/tasks/{task['id']}", json={"status": "done"}, headers=headers)
+    delete = lambda: client.delete(f"/api/tasks/{task['id']}", headers=headers)
+
+    # EventSource style: the token in the query string
+    got = asyncio.run(_sse(f"/api/tasks/events?token={token}", [
+        (create, "created"), (done, "updated"), (delete, "deleted"),
+    ]))
+    assert [kind for kind, _ in got] == ["created", "updated", "deleted"]
+    assert got[0][1]["task"]["title"] == "pushed"
+    assert got[1][1]["task"]["status"] == "done"
+    assert got[2][1]["id"] == task["id"] and got[2][1]["seq"] > got[1][1]["seq"]
+    assert not events.bus._subs  # the stream closed its subscription
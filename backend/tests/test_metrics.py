@@ -0,0 +1,80 @@
+import logging
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infra import instrumentation
+from app.infra.db import Base, engine
+from app.main import app
+
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+
+def auth_headers() -> dict:
+    email = f"metrics_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    assert r.status_code == 201, r.text
+    return {"Authorization": f"Bearer {r.json()['access']}"}
+
+
+def test_metrics_endpoint_reports_routes_and_queries():
+    headers = auth_headers()
+    task_id = client.post("/api/tasks/", json={"title": "measured"}, headers=headers).json()["id"]
+    queries = instrumentation.request_queries.labels("GET", "/api/tasks/{task_id}")
+    count, total = queries.count, queries.sum
+    assert client.get(f"/api/tasks/{task_id}", headers=headers).status_code == 200
+    assert queries.count == count + 1
+    assert queries.sum == total + 2  # change version for the ETag + the row
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/tasks/{task_id}",le="+Inf"}' in body
+    assert 'http_responses_total{method="POST",route="/api/tasks/",status="201"}' in body
+    assert "db_query_seconds_count" in body
+    assert "password_hash_seconds_count" in body
+    # one series per route template, not per id
+    assert f"/api/tasks/{task_id}" not in body
+
+
+def test_endpoints_stay_within_query_budgets(monkeypatch):
+    headers = auth_headers()
+    # budgets are for the steady state: user cache and counter row already there
+    client.get("/api/auth/me", headers=headers)
+    client.get("/api/analytics/summary", headers=headers)
+    monkeypatch.setattr(instrumentation, "QUERY_BUDGET_MODE", "raise")
+    task_id = client.post("/api/tasks/", json={"title": "budget", "due_date": "2025-03-03"}, headers=headers).json()["id"]
+    calls = [
+        ("GET", "/api/auth/me", {}),
+        ("GET", "/api/tasks/", {}),
+        ("GET", f"/api/tasks/{task_id}", {}),
+        ("GET", "/api/tasks/calendar?from=2025-03-01&to=2025-03-31", {}),
+        ("GET", "/api/tasks/changes", {}),
+        ("PATCH", f"/api/tasks/{task_id}", {"json": {"title": "renamed"}}),
+        ("PATCH", f"/api/tasks/{task_id}", {"json": {"status": "done", "due_date": "2025-03-04"}}),
+        ("GET", "/api/analytics/summary", {}),
+        ("GET", "/api/analytics/burndown?from=2025-03-01&to=2025-03-31", {}),
+        ("DELETE", f"/api/tasks/{task_id}", {}),
+    ]
+    for method, path, kwargs in calls:
+        r = client.request(method, path, headers=headers, **kwargs)
+        assert r.status_code < 400, (method, path, r.text)
+
+    monkeypatch.setitem(instrumentation.QUERY_BUDGETS, "GET /api/tasks/", 1)
+    with pytest.raises(instrumentation.QueryBudgetExceeded, match="GET /api/tasks/: 3 SQL statements, budget 1"):
+        client.get("/api/tasks/", headers=headers)
+
+
+def test_slow_queries_are_logged(monkeypatch, caplog):
+    headers = auth_headers()
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 1e-6)
+    slow = instrumentation.slow_queries.value
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        assert client.get("/api/tasks/", headers=headers).status_code == 200
+    assert instrumentation.slow_queries.value > slow
+    assert any("slow query" in r.message and "FROM tasks" in r.message for r in caplog.records)
@@ -0,0 +1,117 @@
+import itertools
+import re
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.infra.db import Base
+from app.infra.models import TaskORM
+from app.repo.tasks import encode_cursor, list_tasks
+
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(bind=engine)
+
+statements = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if "FROM tasks" in statement and not statement.startswith("EXPLAIN"):
+        statements.append((statement, parameters))
+
+
+def query_plan(db: Session, statement: str, parameters) -> str:
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    return " | ".join(row[3] for row in rows)
+
+
+COMBOS = list(
+    itertools.product(
+        [None, "todo"],                 # status
+        [None, "high"],                 # priority
+        [None, "report"],               # q
+        [None, (date(2025, 1, 1), date(2025, 1, 31))],  # due range
+        ["created_at", "due_date"],     # sort
+        [False, True],                  # cursor
+    )
+)
+
+
+@pytest.mark.parametrize("status,priority,q,due,sort,use_cursor", COMBOS)
+def test_list_tasks_queries_are_index_backed(status, priority, q, due, sort, use_cursor):
+    cursor = None
+    if use_cursor:
+        cursor = encode_cursor(sort, TaskORM(id=5, created_at=datetime(2025, 1, 1), due_date=date(2025, 1, 1)))
+    due_from, due_to = due or (None, None)
+
+    statements.clear()
+    with Session(engine) as db:
+        list_tasks(db, 1, status=status, priority=priority, q=q, due_from=due_from, due_to=due_to, sort=sort, cursor=cursor)
+        plans = [query_plan(db, st, params) for st, params in list(statements)]
+
+    assert len(plans) == 2  # count + page
+    for plan in plans:
+        assert "USING" in plan and "INDEX" in plan, plan
+        assert not re.search(r"SCAN tasks\b", plan), plan
+        # A due_date window sorted by created_at is served by the (user_id, due_date) range and
+        # a sort of the (small) window; walking the created_at index would filter the whole history.
+        # Likewise search hits come from tasks_fts and only the matches get sorted.
+        if not (due and sort == "created_at" and not use_cursor) and not q:
+            assert "TEMP B-TREE" not in plan, plan
+        if q:
+            assert "tasks_fts VIRTUAL TABLE" in plan, plan
+
+
+@pytest.mark.parametrize("since", [None, (3, 7)])
+def test_change_feed_queries_are_index_scans(since):
+    from app.repo.changes import encode_token, list_changes
+
+    statements.clear()
+    captured = []
+
+    def capture_all(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "change_seq" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture_all)
+    try:
+        with Session(engine) as db:
+            list_changes(db, 1, encode_token(*since) if since else None, limit=50)
+            plans = [query_plan(db, st, params) for st, params in captured]
+    finally:
+        event.remove(engine, "before_cursor_execute", capture_all)
+
+    assert len(plans) == 2  # tasks + tombstones
+    for plan in plans:
+        assert "ix_tasks_user_change_seq" in plan or "ix_task_tombstones_user_change_seq" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.parametrize("include_done", [True, False])
+def test_calendar_is_one_range_scan(include_done):
+    from app.repo.tasks import calendar_tasks
+
+    statements.clear()
+    with Session(engine) as db:
+        calendar_tasks(db, 1, date(2025, 3, 1), date(2025, 4, 6), per_day=3, include_done=include_done)
+        plans = [query_plan(db, st, params) for st, params in list(statements)]
+
+    assert len(plans) == 1
+    assert "ix_tasks_user_due (user_id=? AND due_date>? AND due_date<?)" in plans[0], plans[0]
+    assert not re.search(r"SCAN tasks\b", plans[0]), plans[0]
+
+
+def test_reminder_batches_are_a_due_date_range():
+    from app.repo.reminders import open_tasks_due
+
+    statements.clear()
+    with Session(engine) as db:
+        open_tasks_due(db, date(2025, 3, 1), after_id=500, limit=1000)
+        plans = [query_plan(db, st, params) for st, params in list(statements)]
+
+    assert len(plans) == 1
+    assert "ix_tasks_due_date (due_date=? AND rowid>?)" in plans[0], plans[0]
+    assert "TEMP B-TREE" not in plans[0], plans[0]
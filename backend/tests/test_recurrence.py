@@ -0,0 +1,182 @@
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.recurrence import InvalidRule, Rule, check_start, last_occurrence, occurrences, parse_rrule, to_rrule
+from app.infra.db import Base, engine
+from app.main import app
+
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+
+def test_rrule_subset_expansion():
+    rule = parse_rrule("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=WE,MO;COUNT=5")
+    assert to_rrule(rule) == "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=5"
+    start = date(2026, 1, 6)  # a Tuesday: counts as the first occurrence anyway
+    assert list(occurrences(rule, start, date(2026, 1, 1), date(2026, 12, 31))) == [
+        date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 19), date(2026, 1, 21), date(2026, 2, 2),
+    ]
+    assert last_occurrence(rule, start) == date(2026, 2, 2)
+
+    # months without the day are skipped, -1 is the last day
+    assert list(occurrences(parse_rrule("FREQ=MONTHLY"), date(2026, 1, 31), date(2026, 1, 1), date(2026, 6, 1))) == [
+        date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31),
+    ]
+    assert list(occurrences(Rule("monthly", bymonthday=-1), date(2026, 1, 31), date(2026, 2, 1), date(2026, 4, 30))) == [
+        date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30),
+    ]
+
+    # expansion jumps to the range: same dates as walking the series from dtstart
+    dtstart = date(2020, 3, 15)
+    for rule in (Rule("daily", 3), Rule("daily", byweekday=(0, 4)), Rule("weekly", 3, (1, 5)),
+                 Rule("monthly", 5), Rule("daily", until=date(2031, 1, 1))):
+        everything = list(occurrences(rule, dtstart, dtstart, date(2032, 1, 1)))
+        window = (date(2030, 6, 3), date(2030, 9, 17))
+        assert list(occurrences(rule, dtstart, *window)) == [d for d in everything if window[0] <= d <= window[1]]
+
+
+@pytest.mark.parametrize("text", [
+    "FREQ=YEARLY", "FREQ=DAILY;BYSETPOS=1", "FREQ=WEEKLY;BYDAY=1MO", "FREQ=DAILY;COUNT=3;UNTIL=20260101",
+    "FREQ=WEEKLY;BYMONTHDAY=3", "FREQ=DAILY;INTERVAL=0", "FREQ=MONTHLY;BYMONTHDAY=32",
+])
+def test_invalid_rules(text):
+    with pytest.raises(InvalidRule):
+        parse_rrule(text)
+
+
+@pytest.mark.parametrize("text, due", [
+    ("FREQ=DAILY;INTERVAL=7;BYDAY=TU", date(2026, 1, 5)),               # every 7 days from a Monday
+    ("FREQ=DAILY;INTERVAL=7;BYDAY=TU;COUNT=3", date(2026, 1, 5)),
+    ("FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=31", date(2026, 2, 10)),      # Februaries only
+])
+def test_rules_that_never_match_are_refused(text, due):
+    rule = parse_rrule(text)
+    with pytest.raises(InvalidRule):
+        check_start(rule, due)
+    # a rule stored before the check still expands in bounded time
+    assert list(occurrences(Rule(rule.freq, rule.interval, rule.byweekday, rule.bymonthday), due, due, date(9999, 12, 31))) == [due]
+
+    email = f"recur_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    task = client.post("/api/tasks/", json={"title": "never", "due_date": due.isoformat()}, headers=headers).json()
+    r = client.put(f"/api/tasks/{task['id']}/recurrence", json={"rrule": text}, headers=headers)
+    assert r.status_code == 400 and r.json()["detail"].startswith("invalid_rule"), r.text
+    r = client.get("/api/tasks/calendar", params={"from": "2026-01-01", "to": "2026-02-28"}, headers=headers)
+    assert r.status_code == 200, r.text
+
+    # sparse but valid: February 29 every 12 months, Tuesdays every 7 days from a Tuesday
+    check_start(Rule("monthly", 12, bymonthday=29), date(2097, 2, 10))
+    check_start(Rule("daily", 7, (1,)), date(2026, 1, 6))
+    check_start(Rule("weekly", byweekday=(0, 1, 2)), date(2026, 1, 11))
+
+
+def test_recurring_task_occurrences_are_virtual_until_touched():
+    email = f"recur_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    monday = date(2026, 1, 5)
+    template = client.post("/api/tasks/", json={"title": "standup", "due_date": monday.isoformat(), "priority": "high"},
+                           headers=headers).json()
+    plain = client.post("/api/tasks/", json={"title": "no date"}, headers=headers).json()
+
+    assert client.put(f"/api/tasks/{plain['id']}/recurrence", json={"freq": "daily"}, headers=headers).json() == {
+        "detail": "due_date_required"
+    }
+    r = client.put(f"/api/tasks/{template['id']}/recurrence", json={"rrule": "FREQ=DAILY;BYMINUTE=5"}, headers=headers)
+    assert r.status_code == 400 and r.json()["detail"].startswith("invalid_rule")
+    r = client.put(f"/api/tasks/{template['id']}/recurrence",
+                   json={"freq": "weekly", "byweekday": ["MO", "WE"], "count": 5}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"task_id": template["id"], "rrule": "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=5",
+                        "dtstart": "2026-01-05", "ends_on": "2026-01-19", "exdates": []}
+
+    def calendar():
+        r = client.get("/api/tasks/calendar", params={"from": "2026-01-01", "to": "2026-01-31"}, headers=headers)
+        assert r.status_code == 200, r.text
+        return {d["date"]: [(t["id"], t["template_id"], t["status"]) for t in d["items"]] for d in r.json()["days"]}
+
+    tid = template["id"]
+    assert calendar() == {
+        "2026-01-05": [(tid, None, "todo")], "2026-01-07": [(None, tid, "todo")], "2026-01-12": [(None, tid, "todo")],
+        "2026-01-14": [(None, tid, "todo")], "2026-01-19": [(None, tid, "todo")],
+    }
+
+    # touching an occurrence makes it a task; touching it again updates the same row
+    r = client.patch(f"/api/tasks/{tid}/occurrences/2026-01-07", json={"status": "done"}, headers=headers)
+    assert r.status_code == 200, r.text
+    occ = r.json()
+    assert (occ["title"], occ["due_date"], occ["status"], occ["priority"]) == ("standup", "2026-01-07", "done", "high")
+    r = client.patch(f"/api/tasks/{tid}/occurrences/2026-01-07", json={"title": "standup (short)"}, headers=headers)
+    assert r.json()["id"] == occ["id"]
+    assert client.patch(f"/api/tasks/{tid}/occurrences/2026-01-06", json={"status": "done"}, headers=headers).status_code == 404
+    assert client.patch(f"/api/tasks/{tid}/occurrences/2026-01-21", json={"status": "done"}, headers=headers).status_code == 404
+    # the template's own date is the template
+    assert client.patch(f"/api/tasks/{tid}/occurrences/2026-01-05", json={"status": "in_progress"}, headers=headers).json()["id"] == tid
+
+    # skip one virtual occurrence, delete the materialized one: neither comes back
+    assert client.delete(f"/api/tasks/{tid}/occurrences/2026-01-12", headers=headers).status_code == 204
+    moved = client.patch(f"/api/tasks/{tid}/occurrences/2026-01-14", json={"due_date": "2026-01-16"}, headers=headers).json()
+    assert client.delete(f"/api/tasks/{occ['id']}", headers=headers).status_code == 204
+    assert calendar() == {
+        "2026-01-05": [(tid, None, "in_progress")], "2026-01-16": [(moved["id"], None, "todo")],
+        "2026-01-19": [(None, tid, "todo")],
+    }
+    assert client.get(f"/api/tasks/{tid}/recurrence", headers=headers).json()["exdates"] == ["2026-01-07", "2026-01-12"]
+
+    r = client.get("/api/tasks/occurrences", params={"from": "2026-01-01", "to": "2026-01-31"}, headers=headers)
+    assert [(t["due_date"], t["template_id"], t["virtual"]) for t in r.json()["items"]] == [
+        ("2026-01-05", None, False), ("2026-01-16", tid, False), ("2026-01-19", tid, True),
+    ]
+    r = client.get("/api/analytics/due", params={"from": "2026-01-01", "to": "2026-01-31"}, headers=headers)
+    assert r.json()["days"][-1] == {"date": "2026-01-19", "open": 1, "done": 0, "recurring": 1}
+    # virtual occurrences are not tasks: the counters only see rows
+    counts = client.get("/api/analytics/summary", headers=headers).json()
+    assert counts["active"] + counts["overdue"] == 3
+
+    # the rule goes with its template; materialized occurrences stay as tasks
+    assert client.delete(f"/api/tasks/{tid}", headers=headers).status_code == 204
+    assert client.get(f"/api/tasks/{tid}/recurrence", headers=headers).status_code == 404
+    assert calendar() == {"2026-01-16": [(moved["id"], None, "todo")]}
+
+
+def test_calendar_keeps_per_day_cap_with_occurrences():
+    email = f"recur_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    day = date(2026, 3, 2)
+    for i, priority in enumerate(("low", "urgent", "medium")):
+        t = client.post("/api/tasks/", json={"title": f"daily {i}", "due_date": (day - timedelta(days=1)).isoformat(),
+                                             "priority": priority}, headers=headers).json()
+        client.put(f"/api/tasks/{t['id']}/recurrence", json={"rrule": "FREQ=DAILY"}, headers=headers)
+    client.post("/api/tasks/", json={"title": "one-off", "due_date": day.isoformat(), "priority": "urgent"}, headers=headers)
+    r = client.get("/api/tasks/calendar", params={"from": day.isoformat(), "to": day.isoformat(), "per_day": 2},
+                   headers=headers)
+    (only,) = r.json()["days"]
+    assert (only["total"], only["more"]) == (4, 2)
+    assert [(t["title"], t["id"] is None) for t in only["items"]] == [("one-off", False), ("daily 1", True)]
+
+
+def test_deleted_rule_lets_go_of_its_occurrences():
+    email = f"recur_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    monday = date(2026, 2, 2)
+    first = client.post("/api/tasks/", json={"title": "old series", "due_date": monday.isoformat()}, headers=headers).json()["id"]
+    client.put(f"/api/tasks/{first}/recurrence", json={"rrule": "FREQ=DAILY"}, headers=headers)
+    kept = client.patch(f"/api/tasks/{first}/occurrences/2026-02-03", json={"status": "done"}, headers=headers).json()["id"]
+    assert client.delete(f"/api/tasks/{first}/recurrence", headers=headers).status_code == 204
+
+    # a new rule (its id may be the deleted one's) sees its own date, and touching it makes a new row
+    second = client.post("/api/tasks/", json={"title": "new series", "due_date": monday.isoformat()}, headers=headers).json()["id"]
+    assert client.put(f"/api/tasks/{second}/recurrence", json={"rrule": "FREQ=DAILY"}, headers=headers).status_code == 200
+    r = client.get("/api/tasks/occurrences", params={"from": "2026-02-03", "to": "2026-02-03"}, headers=headers)
+    assert sorted((t["id"], t["template_id"]) for t in r.json()["items"] if t["id"] is not None) == [(kept, None)]
+    assert [t["template_id"] for t in r.json()["items"] if t["virtual"]] == [second]
+    r = client.patch(f"/api/tasks/{second}/occurrences/2026-02-03", json={"title": "new one"}, headers=headers)
+    assert r.status_code == 200 and r.json()["id"] not in (kept, second)
+    assert client.get(f"/api/tasks/{kept}", headers=headers).json()["title"] == "old series"
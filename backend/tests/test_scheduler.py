@@ -0,0 +1,179 @@
+import asyncio
+import json
+import random
+import threading
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.infra.db import Base, SessionLocal, engine
+from app.infra.models import ReminderOutboxORM, UserORM
+from app.infra.scheduler import OutboxSink, Scheduler, WebhookSink, make_sinks
+from app.main import app
+
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+
+
+class ListSink:
+    name = "list"
+
+    def __init__(self, user_id=None, fail=0):
+        self.user_id = user_id
+        self.fail = fail
+        self.items = []
+
+    async def emit(self, items):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("sink down")
+        self.items += [r for r in items if self.user_id is None or r["user_id"] == self.user_id]
+
+    def take(self):
+        out = sorted((r["kind"], r["title"], r["due_date"]) for r in self.items)
+        self.items.clear()
+        return out
+
+
+def at(day: date, hour: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+
+
+def user_with_tasks(tasks):
+    # tasks: (title, due_date, done); due dates far in the future, away from other tests' tasks
+    email = f"remind_{uuid4().hex[:6]}@example.com"
+    r = client.post("/api/auth/register", json={"email": email, "password": "secret123"})
+    headers = {"Authorization": f"Bearer {r.json()['access']}"}
+    for title, due, done in tasks:
+        task = client.post("/api/tasks/", json={"title": title, "due_date": due.isoformat()}, headers=headers).json()
+        if done:
+            client.patch(f"/api/tasks/{task['id']}", json={"status": "done"}, headers=headers)
+    with SessionLocal() as db:
+        return db.scalar(select(UserORM.id).where(UserORM.email == email))
+
+
+def far_day() -> date:
+    return date(2200, 1, 1) + timedelta(days=random.randrange(300 * 365))
+
+
+def scheduler(sinks, clock, **kwargs):
+    kwargs.setdefault("lease_name", f"test-{uuid4().hex[:8]}")
+    return Scheduler(sinks, clock=lambda: clock[0], read_session_factory=SessionLocal, **kwargs)
+
+
+def tick(job, clock, now):
+    clock[0] = now
+    return asyncio.run(job.run_once(now))
+
+
+def test_reminders_fire_once_per_kind_in_batches():
+    d = far_day()
+    user_id = user_with_tasks([
+        ("pay rent", d, False), ("call bank", d, False), ("already done", d, True), ("next day", d + timedelta(days=1), False),
+    ])
+    sink, clock = ListSink(user_id), [None]
+    job = scheduler([sink], clock, batch_size=1)
+
+    # start two days before: nothing due yet, sleeps until the next fire time (capped by the lease)
+    assert 0 < tick(job, clock, at(d - timedelta(days=2), 12)) <= 10
+    assert sink.take() == []
+
+    # due_soon fires at 09:00 UTC the day before; done tasks are not reminded
+    tick(job, clock, at(d - timedelta(days=1), 10))
+    assert sink.take() == [("due_soon", "call bank", d.isoformat()), ("due_soon", "pay rent", d.isoformat())]
+    tick(job, clock, at(d - timedelta(days=1), 11))
+    assert sink.take() == []
+
+    # midnight after the due date: overdue for d, and due_soon for d + 1 came up at 09:00
+    tick(job, clock, at(d + timedelta(days=1)))
+    assert sink.take() == [
+        ("due_soon", "next day", (d + timedelta(days=1)).isoformat()),
+        ("overdue", "call bank", d.isoformat()), ("overdue", "pay rent", d.isoformat()),
+    ]
+
+
+def test_lease_keeps_one_worker_and_the_next_one_resumes():
+    d = far_day()
+    user_id = user_with_tasks([("report", d, False)])
+    a_sink, b_sink, clock = ListSink(user_id), ListSink(user_id), [None]
+    lease = f"test-{uuid4().hex[:8]}"
+    a = scheduler([a_sink], clock, owner="a", lease_name=lease, lease_seconds=30)
+    b = scheduler([b_sink], clock, owner="b", lease_name=lease, lease_seconds=30)
+
+    start = at(d - timedelta(days=1), 8)
+    tick(a, clock, start)
+    assert tick(b, clock, start + timedelta(seconds=1)) == 15  # not the leader: retries in lease / 2
+    tick(a, clock, at(d - timedelta(days=1), 10))
+    tick(b, clock, at(d - timedelta(days=1), 10))
+    assert a_sink.take() == [("due_soon", "report", d.isoformat())]
+    assert b_sink.take() == []
+
+    # a stops renewing; once its lease has expired b takes over from a's progress
+    later = at(d - timedelta(days=1), 10) + timedelta(seconds=31)
+    tick(b, clock, later)
+    assert b_sink.take() == []
+    tick(b, clock, at(d + timedelta(days=1), 1))
+    assert b_sink.take() == [("overdue", "report", d.isoformat())]
+
+    # a is back but no longer the leader; it fires nothing until b lets go
+    tick(a, clock, at(d + timedelta(days=1), 1))
+    assert a_sink.take() == []
+    asyncio.run(asyncio.to_thread(b._release))
+    tick(a, clock, at(d + timedelta(days=1), 2))
+    assert a_sink.take() == []
+
+
+def test_failed_sink_retries_the_group_and_outbox_keeps_one_row(monkeypatch):
+    from app.repo import reminders
+    swept = []
+    monkeypatch.setattr(reminders, "roll_counters", lambda db, user_ids, today: swept.append((set(user_ids), today)))
+    d = far_day()
+    user_id = user_with_tasks([("renew passport", d, False), ("book flights", d, False)])
+    flaky, clock = ListSink(user_id, fail=1), [None]
+    job = scheduler([OutboxSink(), flaky], clock, kinds={"overdue": timedelta(hours=24)})
+
+    tick(job, clock, at(d, 12))
+    tick(job, clock, at(d + timedelta(days=1), 1))  # outbox written, then the second sink fails
+    assert flaky.take() == []
+    tick(job, clock, at(d + timedelta(days=1), 2))  # retried: at least once
+    assert flaky.take() == [("overdue", "book flights", d.isoformat()), ("overdue", "renew passport", d.isoformat())]
+    # the overdue sweep rolls the counters to the clock's UTC day
+    assert (user_id, d + timedelta(days=1)) in {(u, day) for users, day in swept for u in users}
+
+    with SessionLocal() as db:
+        rows = db.scalars(select(ReminderOutboxORM).where(ReminderOutboxORM.user_id == user_id)).all()
+    assert sorted(json.loads(r.payload)["title"] for r in rows) == ["book flights", "renew passport"]
+    assert all(r.kind == "overdue" and r.due_date == d and r.delivered_at is None for r in rows)
+
+
+def test_webhook_sink_posts_batches():
+    received = []
+
+    class Receiver(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Receiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        sink = WebhookSink(f"http://127.0.0.1:{server.server_port}/reminders")
+        asyncio.run(sink.emit([{"kind": "overdue", "task_id": 1, "user_id": 1, "title": "Задача", "due_date": "2025-01-01"}]))
+    finally:
+        server.shutdown()
+    assert received == [{"reminders": [{"kind": "overdue", "task_id": 1, "user_id": 1, "title": "Задача", "due_date": "2025-01-01"}]}]
+
+    assert [s.name for s in make_sinks("log, outbox")] == ["log", "outbox"]
+    try:
+        make_sinks("log,sms")
+        assert False, "unknown sink accepted"
+    except ValueError:
+        pass
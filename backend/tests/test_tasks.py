@@ -60,3 +60,420 @@ def test_tasks_crud_flow():
     assert r.status_code == 404
 
 
+def test_cursor_pagination_walks_all_tasks_without_gaps():
+    from uuid import uuid4
+    token = register_and_login(email=f"cursor_{uuid4().hex[:6]}@example.com")
+    headers = auth_headers(token)
+
+    today = date.today()
+    created = []
+    for i in range(7):
+        due = None if i % 3 == 0 else date.fromordinal(today.toordinal() + i % 2).isoformat()
+        r = client.post("/api/tasks/", json={"title": f"t{i}", "due_date": due}, headers=headers)
+        created.append(r.json()["id"])
+
+    for sort in ("created_at", "due_date"):
+        offset_ids = [
+            it["id"]
+            for it in client.get("/api/tasks/", params={"sort": sort, "page_size": 100}, headers=headers).json()["items"]
+        ]
+        seen, cursor = [], None
+        while True:
+            params = {"sort": sort, "page_size": 3}
+            if cursor:
+                params["cursor"] = cursor
+            r = client.get("/api/tasks/", params=params, headers=headers)
+            assert r.status_code == 200, r.text
+            data = r.json()
+            seen += [it["id"] for it in data["items"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        assert seen == offset_ids
+        assert sorted(seen) == sorted(created)
+
+    r = client.get("/api/tasks/", params={"cursor": "garbage"}, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "invalid_cursor"
+
+
+def test_search_uses_index_and_follows_writes():
+    from uuid import uuid4
+    token = register_and_login(email=f"search_{uuid4().hex[:6]}@example.com")
+    headers = auth_headers(token)
+
+    def search(q, **params):
+        r = client.get("/api/tasks/", params={"q": q, **params}, headers=headers)
+        assert r.status_code == 200, r.text
+        return [it["title"] for it in r.json()["items"]]
+
+    client.post("/api/tasks/", json={"title": "Quarterly report", "description": "numbers"}, headers=headers)
+    client.post("/api/tasks/", json={"title": "Groceries", "description": "report card, report back"}, headers=headers)
+    r = client.post("/api/tasks/", json={"title": "Call plumber"}, headers=headers)
+    plumber_id = r.json()["id"]
+
+    assert sorted(search("repo")) == ["Groceries", "Quarterly report"]
+    assert search("report")[0] == "Groceries"  # ranked: two hits beat one
+    assert search("quarterly numbers") == ["Quarterly report"]
+
+    client.patch(f"/api/tasks/{plumber_id}", json={"title": "Call electrician"}, headers=headers)
+    assert search("plumber") == []
+    assert search("electrician") == ["Call electrician"]
+
+    client.delete(f"/api/tasks/{plumber_id}", headers=headers)
+    assert search("electrician") == []
+
+
+
+
+def test_bulk_create_status_delete():
+    from datetime import timedelta
+    from uuid import uuid4
+    token = register_and_login(email=f"bulk_{uuid4().hex[:6]}@example.com")
+    headers = auth_headers(token)
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    client.get("/api/analytics/summary", headers=headers)  # counters exist before the batch
+
+    r = client.post("/api/tasks/bulk/create", json={"items": [
+        {"title": "a", "due_date": yesterday},
+        {"title": ""},
+        {"title": "b", "priority": "high"},
+        {"title": "c", "due_date": yesterday},
+    ]}, headers=headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["succeeded"], body["failed"]) == (3, 1)
+    assert [x["ok"] for x in body["results"]] == [True, False, True, True]
+    assert body["results"][1]["error"].startswith("title")
+    a, b, c = (x["id"] for x in body["results"] if x["ok"])
+    assert client.get("/api/analytics/summary", headers=headers).json() == {"active": 1, "done": 0, "overdue": 2}
+
+    r = client.post("/api/tasks/bulk/status", json={"ids": [a, b, 10**9, b], "status": "done"}, headers=headers)
+    body = r.json()
+    assert [x["ok"] for x in body["results"]] == [True, True, False, False]
+    assert [x["error"] for x in body["results"][2:]] == ["not_found", "duplicate"]
+    first_done = body["results"][0]["task"]["completed_at"]
+    assert first_done and all(x["task"]["status"] == "done" for x in body["results"][:2])
+    assert client.get(f"/api/tasks/{c}", headers=headers).json()["completed_at"] is None
+    # already done: completed_at is kept
+    r = client.post("/api/tasks/bulk/status", json={"ids": [a], "status": "done"}, headers=headers)
+    assert r.json()["results"][0]["task"]["completed_at"] == first_done
+    assert client.get("/api/analytics/summary", headers=headers).json() == {"active": 0, "done": 2, "overdue": 1}
+
+    # another user's ids are not found
+    other = auth_headers(register_and_login(email=f"bulk_{uuid4().hex[:6]}@example.com"))
+    r = client.post("/api/tasks/bulk/delete", json={"ids": [a]}, headers=other)
+    assert r.json()["failed"] == 1
+
+    # a repeated id is deleted once and reported once
+    r = client.post("/api/tasks/bulk/delete", json={"ids": [a, c, a]}, headers=headers)
+    assert (r.json()["succeeded"], r.json()["failed"]) == (2, 1)
+    assert [(x["ok"], x["error"]) for x in r.json()["results"]] == [(True, None), (True, None), (False, "duplicate")]
+    assert client.get("/api/tasks/", headers=headers).json()["total"] == 1
+    assert client.get("/api/analytics/summary", headers=headers).json() == {"active": 0, "done": 1, "overdue": 0}
+
+
+def test_export_streams_ndjson_and_csv_with_filters():
+    import csv, io, json
+    from uuid import uuid4
+    headers = auth_headers(register_and_login(email=f"export_{uuid4().hex[:6]}@example.com"))
+    for start in range(0, 1203, 500):
+        client.post("/api/tasks/bulk/create", json={"items": [
+            {"title": f"task {i}", "priority": "high" if i % 2 else "low", "description": 'a, "quoted"\nline'}
+            for i in range(start, min(start + 500, 1203))
+        ]}, headers=headers)
+
+    r = client.get("/api/tasks/export", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert len(rows) == 1203
+    assert rows[0]["title"] == "task 1202" and rows[0]["description"] == 'a, "quoted"\nline'
+    assert set(rows[0]) == {"id", "title", "description", "due_date", "priority", "status",
+                            "created_at", "updated_at", "completed_at"}
+
+    r = client.get("/api/tasks/export", params={"format": "csv", "priority": "high"}, headers=headers)
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 601 and {row["priority"] for row in rows} == {"high"}
+    assert rows[0]["description"] == 'a, "quoted"\nline' and rows[0]["due_date"] == ""
+
+    assert client.get("/api/tasks/export", params={"format": "xml"}, headers=headers).status_code == 422
+    assert client.get("/api/tasks/export").status_code == 401
+
+
+def test_import_ndjson_and_csv_reports_rejected_rows(tmp_path, monkeypatch):
+    import json
+    from uuid import uuid4
+    email = f"import_{uuid4().hex[:6]}@example.com"
+    headers = auth_headers(register_and_login(email=email))
+    ndjson = "\n".join([
+        json.dumps({"title": "from ndjson", "due_date": "2030-01-02", "priority": "high"}),
+        "",
+        "{not json",
+        json.dumps({"title": "", "priority": "low"}),
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"title": "second", "priority": "nope"}),
+        json.dumps({"title": "third"}),
+    ])
+    r = client.post("/api/tasks/import", files={"file": ("tasks.ndjson", ndjson.encode())}, headers=headers)
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert (report["imported"], report["rejected"]) == (2, 4)
+    assert [e["line"] for e in report["errors"]] == [3, 4, 5, 6]
+    assert report["errors"][0]["error"].startswith("invalid json")
+    assert report["errors"][3]["error"].startswith("priority")
+
+    # an export re-imports as-is (extra columns are ignored)
+    exported = client.get("/api/tasks/export", params={"format": "csv"}, headers=headers).content
+    r = client.post("/api/tasks/import", files={"file": ("dump.csv", exported)}, headers=headers)
+    assert r.json() == {"imported": 2, "rejected": 0, "errors": []}
+    tasks = client.get("/api/tasks/", params={"sort": "due_date"}, headers=headers).json()
+    assert tasks["total"] == 4
+    assert [t["title"] for t in tasks["items"]] == ["third", "third", "from ndjson", "from ndjson"]
+
+    # CLI, small batches: every batch is committed on its own
+    from app import cli
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,priority\n" + "".join(f"cli {i},low\n" for i in range(25)) + ",low\n")
+    assert cli.main(["import-tasks", str(path), "--email", email, "--batch-size", "10"]) == 0
+    assert client.get("/api/tasks/", headers=headers).json()["total"] == 29
+    assert client.get("/api/analytics/summary", headers=headers).json()["active"] == 29
+    assert cli.main(["import-tasks", str(path), "--email", "nobody@example.com"]) == 1
+
+
+def test_with_total_none_skips_count_and_reports_has_more():
+    from uuid import uuid4
+    from sqlalchemy import event
+    from app.infra.db import read_engine
+    headers = auth_headers(register_and_login(email=f"total_{uuid4().hex[:6]}@example.com"))
+    client.post("/api/tasks/bulk/create", json={"items": [{"title": f"t{i}"} for i in range(5)]}, headers=headers)
+    ids = [t["id"] for t in client.get("/api/tasks/", headers=headers).json()["items"]]
+    client.post("/api/tasks/bulk/status", json={"ids": ids[:2], "status": "done"}, headers=headers)
+
+    counts = []
+
+    def count_queries(conn, cursor, statement, parameters, context, executemany):
+        if "count(" in statement.lower():
+            counts.append(statement)
+
+    event.listen(read_engine, "before_cursor_execute", count_queries)
+    try:
+        r = client.get("/api/tasks/", params={"with_total": "none", "page_size": 2}, headers=headers).json()
+        assert r["total"] is None and r["has_more"] is True and r["next_cursor"]
+        r = client.get("/api/tasks/", params={"with_total": "none", "page_size": 2, "cursor": r["next_cursor"]}, headers=headers).json()
+        r = client.get("/api/tasks/", params={"with_total": "none", "page_size": 2, "cursor": r["next_cursor"]}, headers=headers).json()
+        assert len(r["items"]) == 1 and r["has_more"] is False and r["next_cursor"] is None
+    finally:
+        event.remove(read_engine, "before_cursor_execute", count_queries)
+    assert counts == []
+
+    client.get("/api/analytics/summary", headers=headers)  # counters built
+    for params, expected in (({}, 5), ({"status": "done"}, 2), ({"status": "todo"}, 3), ({"q": "t1"}, 1)):
+        exact = client.get("/api/tasks/", params={**params, "with_total": "exact"}, headers=headers).json()
+        estimate = client.get("/api/tasks/", params={**params, "with_total": "estimate"}, headers=headers).json()
+        assert exact["total"] == estimate["total"] == expected
+    r = client.get("/api/tasks/", params={"page_size": 5}, headers=headers).json()
+    assert r["total"] == 5 and r["has_more"] is False and r["next_cursor"] is None
+    assert client.get("/api/tasks/", params={"with_total": "maybe"}, headers=headers).status_code == 422
+
+
+def test_conditional_get_returns_304_without_querying_tasks():
+    from uuid import uuid4
+    from sqlalchemy import event
+    from app.infra.db import engine, read_engine
+    headers = auth_headers(register_and_login(email=f"etag_{uuid4().hex[:6]}@example.com"))
+    task_id = client.post("/api/tasks/", json={"title": "polled"}, headers=headers).json()["id"]
+
+    urls = ["/api/tasks/?page_size=10", f"/api/tasks/{task_id}", "/api/analytics/summary"]
+    etags = {}
+    for url in urls:
+        r = client.get(url, headers=headers)
+        assert r.status_code == 200 and r.headers["etag"].startswith('W/"')
+        etags[url] = r.headers["etag"]
+    assert len(set(etags.values())) == 3
+    assert client.get("/api/tasks/?page_size=11", headers=headers).headers["etag"] != etags[urls[0]]
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for e in {engine, read_engine}:
+        event.listen(e, "before_cursor_execute", capture)
+    try:
+        for url in urls:
+            r = client.get(url, headers={**headers, "If-None-Match": etags[url]})
+            assert r.status_code == 304 and r.content == b"" and r.headers["etag"] == etags[url]
+    finally:
+        for e in {engine, read_engine}:
+            event.remove(e, "before_cursor_execute", capture)
+    assert statements and not any("FROM tasks" in s or "task_counters" in s for s in statements)
+
+    # any write moves every tag
+    client.patch(f"/api/tasks/{task_id}", json={"status": "done"}, headers=headers)
+    for url in urls:
+        r = client.get(url, headers={**headers, "If-None-Match": etags[url]})
+        assert r.status_code == 200 and r.headers["etag"] != etags[url]
+    assert client.get("/api/analytics/summary", headers=headers).json()["done"] == 1
+
+
+def test_change_feed_returns_deltas_and_tombstones():
+    from uuid import uuid4
+    headers = auth_headers(register_and_login(email=f"feed_{uuid4().hex[:6]}@example.com"))
+
+    def changes(since=None, **params):
+        r = client.get("/api/tasks/changes", params={"since": since, **params} if since else params, headers=headers)
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    a = client.post("/api/tasks/", json={"title": "a"}, headers=headers).json()["id"]
+    b = client.post("/api/tasks/", json={"title": "b"}, headers=headers).json()["id"]
+    first = changes()
+    assert [t["title"] for t in first["items"]] == ["a", "b"] and first["deleted"] == []
+    token = first["next_token"]
+    assert changes(token) == {"items": [], "deleted": [], "next_token": token, "has_more": False}
+
+    client.patch(f"/api/tasks/{a}", json={"status": "done"}, headers=headers)
+    client.delete(f"/api/tasks/{b}", headers=headers)
+    bulk = client.post("/api/tasks/bulk/create", json={"items": [{"title": f"c{i}"} for i in range(3)]}, headers=headers).json()
+    delta = changes(token)
+    assert [t["title"] for t in delta["items"]] == ["a", "c0", "c1", "c2"]
+    assert delta["items"][0]["status"] == "done"
+    assert delta["deleted"] == [b]
+
+    # paging through the feed in small steps sees every change exactly once, in order
+    seen, token2 = [], token
+    while True:
+        page = changes(token2, limit=2)
+        seen += [t["id"] for t in page["items"]] + [-i for i in page["deleted"]]
+        token2 = page["next_token"]
+        if not page["has_more"]:
+            break
+    assert seen == [a, -b] + [r["id"] for r in bulk["results"]]
+    assert changes(token2)["items"] == []
+
+    # another user's writes are not in my feed
+    other_email = f"feed_{uuid4().hex[:6]}@example.com"
+    other = auth_headers(register_and_login(email=other_email))
+    client.post("/api/tasks/", json={"title": "theirs"}, headers=other)
+    assert changes(token2)["items"] == []
+    assert client.get("/api/tasks/changes", params={"since": "garbage"}, headers=headers).status_code == 400
+
+    # another user's tombstone for the same id (ids reused before AUTOINCREMENT) leaves mine alone
+    from sqlalchemy import select
+    from app.infra.db import SessionLocal
+    from app.infra.models import UserORM
+    from app.repo.changes import bump_version, record_deletes
+    with SessionLocal() as db:
+        theirs = db.scalar(select(UserORM.id).where(UserORM.email == other_email))
+        record_deletes(db, theirs, [b], bump_version(db, theirs))
+        db.commit()
+    assert changes(token)["deleted"] == [b]
+
+
+def test_calendar_buckets_by_day_with_caps():
+    from uuid import uuid4
+    headers = auth_headers(register_and_login(email=f"cal_{uuid4().hex[:6]}@example.com"))
+    items = [{"title": f"d1 {p}", "due_date": "2025-03-01", "priority": p} for p in ("low", "urgent", "medium", "high")]
+    items += [{"title": "d2", "due_date": "2025-03-02"}, {"title": "april", "due_date": "2025-04-01"}, {"title": "no date"}]
+    ids = [r["id"] for r in client.post("/api/tasks/bulk/create", json={"items": items}, headers=headers).json()["results"]]
+    client.patch(f"/api/tasks/{ids[4]}", json={"status": "done"}, headers=headers)
+
+    params = {"from": "2025-03-01", "to": "2025-03-31", "per_day": 2}
+    r = client.get("/api/tasks/calendar", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert (data["from"], data["to"]) == ("2025-03-01", "2025-03-31")
+    d1, d2 = data["days"]
+    assert d1["date"] == "2025-03-01" and (d1["total"], d1["more"]) == (4, 2)
+    assert [t["title"] for t in d1["items"]] == ["d1 urgent", "d1 high"]
+    assert set(d1["items"][0]) == {"id", "template_id", "title", "priority", "status"}
+    assert d2 == {"date": "2025-03-02", "items": [{"id": ids[4], "template_id": None, "title": "d2", "priority": "medium", "status": "done"}], "total": 1, "more": 0}
+
+    r = client.get("/api/tasks/calendar", params={**params, "include_done": False}, headers=headers)
+    assert [d["date"] for d in r.json()["days"]] == ["2025-03-01"]
+    assert client.get("/api/tasks/calendar", params=params, headers={**headers, "If-None-Match": r.headers["ETag"]}).status_code == 200
+    etag = client.get("/api/tasks/calendar", params=params, headers=headers).headers["ETag"]
+    assert client.get("/api/tasks/calendar", params=params, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    assert client.get("/api/tasks/calendar", params={"from": "2025-03-31", "to": "2025-03-01"}, headers=headers).status_code == 400
+    assert client.get("/api/tasks/calendar", params={"from": "2025-01-01", "to": "2025-12-31"}, headers=headers).status_code == 400
+
+
+def test_list_fast_path_matches_the_pydantic_output(monkeypatch):
+    from uuid import uuid4
+    from app.api import responses
+    headers = auth_headers(register_and_login(email=f"fast_{uuid4().hex[:6]}@example.com"))
+    a = client.post("/api/tasks/", json={"title": "ünïcode ✓", "description": "d", "due_date": "2025-05-01", "priority": "urgent"}, headers=headers).json()
+    b = client.post("/api/tasks/", json={"title": "plain"}, headers=headers).json()
+    client.patch(f"/api/tasks/{a['id']}", json={"status": "done"}, headers=headers)
+
+    r = client.get("/api/tasks/", headers=headers)
+    assert r.headers["content-type"] == "application/json" and r.headers["ETag"]
+    listed = r.json()
+    # the detail endpoint still goes through TaskRead: same values, same formatting
+    assert listed["items"] == [client.get(f"/api/tasks/{t}", headers=headers).json() for t in (b["id"], a["id"])]
+    assert {k: v for k, v in listed.items() if k != "items"} == {
+        "total": 2, "page": 1, "page_size": 20, "next_cursor": None, "has_more": False,
+    }
+
+    monkeypatch.setattr(responses, "orjson", None)  # without orjson: pydantic-core
+    assert client.get("/api/tasks/", headers=headers).json() == listed
+
+
+def test_fields_projection_and_single_statement_reads_and_writes():
+    import re
+    from uuid import uuid4
+    from sqlalchemy import event
+    from app.infra.db import engine, read_engine
+    headers = auth_headers(register_and_login(email=f"proj_{uuid4().hex[:6]}@example.com"))
+    for i in range(5):
+        client.post("/api/tasks/", json={"title": f"p{i}", "description": "long text " * 50, "due_date": f"2025-06-0{i + 1}"}, headers=headers)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if re.search(r"\btasks\b", statement):  # the tasks table, not task_versions & co
+            statements.append(statement)
+
+    def tasks_sql(fn):
+        statements.clear()
+        for e in {engine, read_engine}:
+            event.listen(e, "before_cursor_execute", capture)
+        try:
+            r = fn()
+        finally:
+            for e in {engine, read_engine}:
+                event.remove(e, "before_cursor_execute", capture)
+        return r, list(statements)
+
+    # projection: only the asked-for columns (+ id) in the SELECT and in the output, cursor still works
+    r, sql = tasks_sql(lambda: client.get("/api/tasks/", params={"fields": "title,status", "sort": "due_date", "page_size": 3, "with_total": "none"}, headers=headers))
+    page = r.json()
+    assert [set(t) for t in page["items"]] == [{"id", "title", "status"}] * 3
+    assert [t["title"] for t in page["items"]] == ["p0", "p1", "p2"]
+    assert all("description" not in s for s in sql)
+    r = client.get("/api/tasks/", params={"fields": "title,status", "sort": "due_date", "cursor": page["next_cursor"]}, headers=headers)
+    assert [t["title"] for t in r.json()["items"]] == ["p3", "p4"]
+    r = client.get("/api/tasks/", params={"fields": "title,password_hash"}, headers=headers)
+    assert r.status_code == 400 and r.json()["detail"] == "invalid_fields: password_hash"
+
+    task_id = page["items"][0]["id"]
+    r, sql = tasks_sql(lambda: client.get(f"/api/tasks/{task_id}", headers=headers))
+    assert r.json()["title"] == "p0" and len(sql) == 1
+
+    # plain edit: one UPDATE ... RETURNING, no read
+    r, sql = tasks_sql(lambda: client.patch(f"/api/tasks/{task_id}", json={"title": "renamed"}, headers=headers))
+    assert r.json()["title"] == "renamed" and r.json()["description"].startswith("long text")
+    assert len(sql) == 1 and sql[0].startswith("UPDATE tasks") and "RETURNING" in sql[0]
+    # status change: the old status is read (three columns) for the counters, then one UPDATE
+    r, sql = tasks_sql(lambda: client.patch(f"/api/tasks/{task_id}", json={"status": "done"}, headers=headers))
+    assert r.json()["completed_at"] is not None
+    assert [s.split()[0] for s in sql] == ["SELECT", "UPDATE"] and "description" not in sql[0]
+
+    other = auth_headers(register_and_login(email=f"proj_{uuid4().hex[:6]}@example.com"))
+    assert client.patch(f"/api/tasks/{task_id}", json={"title": "x"}, headers=other).status_code == 404
+    assert client.get(f"/api/tasks/{task_id}", headers=other).status_code == 404
+    assert client.delete(f"/api/tasks/{task_id}", headers=other).status_code == 404
+    assert client.get(f"/api/tasks/{task_id}", headers=headers).json()["title"] == "renamed"
@@ -14,9 +14,11 @@ type Task = {
 
 type TaskList = {
   items: Task[]
-  total: number
+  total: number | null
   page: number
   page_size: number
+  next_cursor?: string | null
+  has_more?: boolean
 }
 
 export default function BoardPage() {
@@ -41,7 +43,7 @@ export default function BoardPage() {
     setLoading(true)
     setError(null)
     try {
-      const params: any = { page: 1, page_size: 50 }
+      const params: any = { page: 1, page_size: 50, with_total: 'none' }
       ;(['status','priority','q','due_from','due_to','sort'] as const).forEach((k) => {
         const v = searchParams.get(k)
         if (v) (params as any)[k] = v
@@ -301,6 +303,7 @@ export default function BoardPage() {
               >
                 <option value="created_at">created_at</option>
                 <option value="due_date">due_date</option>
+                <option value="relevance">relevance</option>
               </select>
               <button
                 type="button"
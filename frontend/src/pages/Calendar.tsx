@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from 'react'
+import { useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 import api from '../lib/api'
 import {
@@ -14,22 +14,29 @@ import {
 } from 'date-fns'
 
 type Task = {
-  id: number
+  id: number | null         // null: occurrence of a recurring task that is not a task yet
+  template_id: number | null
   title: string
-  description?: string | null
-  due_date?: string | null
   priority: 'low'|'medium'|'high'|'urgent'
   status: 'todo'|'in_progress'|'done'
 }
 
-type TaskList = {
-  items: Task[]
+type CalendarDay = {
+  date: string
+  items: Task[]   // most urgent first, at most PER_DAY
   total: number
-  page: number
-  page_size: number
+  more: number
 }
 
-type ByDate = Record<string, Task[]>
+type TaskCalendar = {
+  from: string
+  to: string
+  days: CalendarDay[]
+}
+
+type ByDate = Record<string, CalendarDay>
+
+const PER_DAY = 10
 
 const priorityBadge = (p: Task['priority']) => {
   switch (p) {
@@ -43,18 +50,36 @@ const priorityBadge = (p: Task['priority']) => {
 export default function CalendarPage() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
-  const [tasks, setTasks] = useState<Task[]>([])
+  const [byDate, setByDate] = useState<ByDate>({})
   const [viewDate, setViewDate] = useState<Date>(new Date())
   const [openDay, setOpenDay] = useState<string | null>(null) // 'YYYY-MM-DD'
   const navigate = useNavigate()
 
+  const monthStart = startOfMonth(viewDate)
+  const monthEnd = endOfMonth(viewDate)
+  const calStart = startOfWeek(monthStart, { weekStartsOn: 1 })
+  let calEnd = endOfWeek(monthEnd, { weekStartsOn: 1 })
+  let days = eachDayOfInterval({ start: calStart, end: calEnd })
+  if (days.length < 42) {
+    // ensure 6 rows × 7 columns
+    const extra = eachDayOfInterval({ start: new Date(calEnd.getTime() + 24*60*60*1000), end: new Date(calEnd.getTime() + 7*24*60*60*1000) })
+    days = [...days, ...extra]
+  }
+  const rangeFrom = days[0].toISOString().slice(0,10)
+  const rangeTo = days[days.length - 1].toISOString().slice(0,10)
+
   useEffect(() => {
+    // only the visible 6 weeks, bucketed and capped per day by the server
     const fetchTasks = async () => {
       setLoading(true)
       setError(null)
       try {
-        const { data } = await api.get<TaskList>('/api/tasks/', { params: { page: 1, page_size: 100 } })
-        setTasks(data.items)
+        const { data } = await api.get<TaskCalendar>('/api/tasks/calendar', {
+          params: { from: rangeFrom, to: rangeTo, per_day: PER_DAY, include_done: false },
+        })
+        const map: ByDate = {}
+        for (const d of data.days) map[d.date] = d
+        setByDate(map)
       } catch (err: any) {
         setError(err?.response?.data?.detail || 'Failed to load tasks')
       } finally {
@@ -62,7 +87,7 @@ export default function CalendarPage() {
       }
     }
     fetchTasks()
-  }, [])
+  }, [rangeFrom, rangeTo])
 
   // Keyboard shortcuts: ← prev, → next, T today
   useEffect(() => {
@@ -75,41 +100,32 @@ export default function CalendarPage() {
     return () => window.removeEventListener('keydown', onKey)
   }, [])
 
-  const byDate: ByDate = useMemo(() => {
-    const map: ByDate = {}
-    for (const t of tasks) {
-      const d = (t.due_date || '').slice(0, 10)
-      if (!d) continue
-      if (!map[d]) map[d] = []
-      map[d].push(t)
-    }
-    // sort tasks per day by priority urgency
-    const weight: Record<Task['priority'], number> = { urgent: 0, high: 1, medium: 2, low: 3 }
-    Object.keys(map).forEach(k => map[k].sort((a,b)=>weight[a.priority]-weight[b.priority]))
-    return map
-  }, [tasks])
+  const todayStr = new Date().toISOString().slice(0,10)
 
-  const monthStart = startOfMonth(viewDate)
-  const monthEnd = endOfMonth(viewDate)
-  const calStart = startOfWeek(monthStart, { weekStartsOn: 1 })
-  let calEnd = endOfWeek(monthEnd, { weekStartsOn: 1 })
-  let days = eachDayOfInterval({ start: calStart, end: calEnd })
-  if (days.length < 42) {
-    // ensure 6 rows × 7 columns
-    const extra = eachDayOfInterval({ start: new Date(calEnd.getTime() + 24*60*60*1000), end: new Date(calEnd.getTime() + 7*24*60*60*1000) })
-    days = [...days, ...extra]
-  }
+  const patchItem = (match: (t: Task, dateKey: string) => boolean, changes: Partial<Task>) =>
+    setByDate(prev => {
+      const next: ByDate = {}
+      for (const [k, d] of Object.entries(prev)) next[k] = { ...d, items: d.items.map(t => match(t, k) ? { ...t, ...changes } : t) }
+      return next
+    })
 
-  const todayStr = new Date().toISOString().slice(0,10)
+  const itemKey = (t: Task, dateKey: string) => t.id ?? `${t.template_id}@${dateKey}`
 
-  const markDone = async (id: number) => {
-    // optimistic update
-    setTasks(prev => prev.map(t => t.id === id ? { ...t, status: 'done' } : t))
+  const markDone = async (task: Task, dateKey: string) => {
+    // optimistic update; an occurrence without id becomes a task on the server and gets one
+    const key = itemKey(task, dateKey)
+    const match = (t: Task, k: string) => itemKey(t, k) === key
+    patchItem(match, { status: 'done' })
     try {
-      await api.patch(`/api/tasks/${id}`, { status: 'done' })
+      if (task.id !== null) {
+        await api.patch(`/api/tasks/${task.id}`, { status: 'done' })
+      } else {
+        const { data } = await api.patch<Task>(`/api/tasks/${task.template_id}/occurrences/${dateKey}`, { status: 'done' })
+        patchItem(match, { id: data.id, template_id: task.template_id })
+      }
     } catch (err) {
       // revert on error
-      setTasks(prev => prev.map(t => t.id === id ? { ...t, status: 'todo' } : t))
+      patchItem(match, { status: 'todo' })
     }
   }
 
@@ -154,9 +170,9 @@ export default function CalendarPage() {
           days.map((d) => {
             const key = d.toISOString().slice(0,10)
             const isOther = !isSameMonth(d, viewDate)
-            const itemsAll = byDate[key] || []
-            const items = itemsAll.filter(t => t.status !== 'done')
-            const more = Math.max(0, items.length - 3)
+            const day = byDate[key]
+            const items = (day?.items || []).filter(t => t.status !== 'done')
+            const more = Math.max(0, items.length - 3) + (day?.more || 0)
             const hasOverdue = key < todayStr && items.length > 0
             const isToday = key === todayStr
             return (
@@ -177,7 +193,7 @@ export default function CalendarPage() {
                 <div className="text-sm md:text-base font-medium">{d.getDate()}</div>
                 <div className="mt-1 space-y-1">
                   {items.slice(0,3).map(t => (
-                    <span key={t.id} title={t.description || undefined} className={`inline-flex items-center rounded-full px-2 py-0.5 text-xs truncate max-w-full ${priorityBadge(t.priority)}`}>
+                    <span key={itemKey(t, key)} title={t.title} className={`inline-flex items-center rounded-full px-2 py-0.5 text-xs truncate max-w-full ${priorityBadge(t.priority)}`}>
                       {t.title.length > 18 ? t.title.slice(0,18) + '…' : t.title}
                     </span>
                   ))}
@@ -201,31 +217,28 @@ export default function CalendarPage() {
               <button onClick={() => setOpenDay(null)} className="px-3 py-1.5 rounded-xl border border-slate-300 dark:border-slate-600 hover:bg-slate-100 dark:hover:bg-slate-800">Close</button>
             </div>
             <div className="space-y-3">
-              {(byDate[openDay]?.filter(t => t.status !== 'done') || []).map(t => (
-                <div key={t.id} className="rounded-xl border border-slate-200 dark:border-slate-700 p-3">
+              {(byDate[openDay]?.items.filter(t => t.status !== 'done') || []).map(t => (
+                <div key={itemKey(t, openDay)} className="rounded-xl border border-slate-200 dark:border-slate-700 p-3">
                   <div className="flex items-center justify-between gap-3">
                     <div className="font-medium truncate">{t.title}</div>
                     <span className={`inline-flex items-center rounded-full px-2 py-0.5 text-xs ${priorityBadge(t.priority)}`}>{t.priority}</span>
                   </div>
-                  {t.description && (
-                    <div
-                      className="mt-1 text-sm text-slate-600 dark:text-slate-300"
-                      title={t.description || undefined}
-                    >
-                      {t.description.length > 100 ? t.description.slice(0, 100) + '…' : t.description}
-                    </div>
-                  )}
                   <div className="mt-1 text-xs text-slate-500 dark:text-slate-400">status: <span className="inline-block rounded-full px-2 py-0.5 border border-slate-200 dark:border-slate-700">{t.status}</span></div>
-                  <div className="mt-1 text-xs text-slate-500 dark:text-slate-400">due: {t.due_date || '—'}</div>
+                  <div className="mt-1 text-xs text-slate-500 dark:text-slate-400">due: {openDay}</div>
                   <div className="mt-3 flex items-center gap-2">
                     <button onClick={() => openBoardForDate(openDay)} className="px-3 py-1.5 rounded-xl bg-indigo-600 hover:bg-indigo-700 text-white transition">Open on Board</button>
                     {t.status !== 'done' && (
-                      <button onClick={() => markDone(t.id)} className="px-3 py-1.5 rounded-xl bg-emerald-600 hover:bg-emerald-700 text-white transition">Mark done</button>
+                      <button onClick={() => markDone(t, openDay)} className="px-3 py-1.5 rounded-xl bg-emerald-600 hover:bg-emerald-700 text-white transition">Mark done</button>
                     )}
                   </div>
                 </div>
               ))}
-              {(byDate[openDay]?.filter(t => t.status !== 'done') || []).length === 0 && (
+              {(byDate[openDay]?.more || 0) > 0 && (
+                <button onClick={() => openBoardForDate(openDay)} className="text-sm text-indigo-600 dark:text-indigo-400 hover:underline">
+                  +{byDate[openDay].more} more on the Board
+                </button>
+              )}
+              {(byDate[openDay]?.items.filter(t => t.status !== 'done') || []).length === 0 && (
                 <div className="text-sm text-slate-500 dark:text-slate-400">No tasks for this day.</div>
               )}
             </div>